@@ -52,6 +52,9 @@ fi
 # -------------------------------------------
 # 静的ファイルの収集
 # -------------------------------------------
+echo "Generating code highlighting stylesheet..."
+python manage.py generate_highlight_css
+
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
@@ -62,8 +65,27 @@ echo "Verifying static permissions..."
 chown -R appuser:appgroup /app/static || true
 chmod -R 755 /app/static || true
 
+# -------------------------------------------
+# 公開ページの静的エクスポート（nginx が try_files で配信）
+# 無効時は古いエクスポートを削除し、nginx が Django にフォールバックするようにする
+# -------------------------------------------
+mkdir -p /app/export
+if [ "$STATIC_EXPORT_ENABLED" = "True" ]; then
+    echo "Exporting public pages..."
+    python manage.py export_static_site
+else
+    find /app/export -mindepth 1 -delete || true
+fi
+chown -R appuser:appgroup /app/export || true
+
 # -------------------------------------------
 # Gunicorn の起動（appuserとして実行）
 # -------------------------------------------
-echo "Starting Gunicorn as appuser..."
-exec gunicorn --config gunicorn.conf.py techblog_cms.wsgi:application
+# 本番は gunicorn.production.conf.py（preload, gthread, ワーカー再起動）を使用
+if [ "$DJANGO_ENV" = "production" ]; then
+    GUNICORN_CONFIG=gunicorn.production.conf.py
+else
+    GUNICORN_CONFIG=gunicorn.conf.py
+fi
+echo "Starting Gunicorn as appuser ($GUNICORN_CONFIG)..."
+exec gunicorn --config "$GUNICORN_CONFIG"
@@ -1,3 +1,5 @@
+# Development configuration; production uses gunicorn.production.conf.py
+# (selected by docker/entrypoint.sh when DJANGO_ENV=production)
 import multiprocessing
 import os
 
@@ -0,0 +1,173 @@
+"""
+Production gunicorn configuration; docker/entrypoint.sh selects it when
+DJANGO_ENV=production (gunicorn.conf.py stays the development config).
+
+- The app is preloaded in the master so workers share its memory
+  copy-on-write; post_fork drops database and cache connections inherited
+  from the master.
+- gthread workers by default, sized from GUNICORN_* environment variables;
+  a uvicorn worker class serves techblog_cms.asgi instead.
+- Workers are recycled after GUNICORN_MAX_REQUESTS requests, with jitter so
+  they do not all restart at once, to bound memory growth.
+- Worker heartbeat files live on tmpfs (/dev/shm) so a slow disk cannot
+  make the arbiter kill healthy workers.
+- Each worker logs its request count, latency percentiles, 5xx count and
+  peak RSS every GUNICORN_STATS_INTERVAL seconds and when it exits (sync
+  and gthread workers; uvicorn workers bypass the request hooks).
+"""
+import math
+import os
+import resource
+import threading
+import time
+from collections import deque
+
+
+def _env(name, default):
+    # Empty values (e.g. unset compose variables) fall back to the default
+    return os.environ.get(name) or default
+
+
+def _env_int(name, default):
+    return int(_env(name, default))
+
+
+def available_cpus():
+    """CPUs this container may use: the cgroup v2 quota if set, else the affinity mask"""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            cpus = min(cpus, int(quota) / int(period))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+# Basic configurations
+bind = _env('GUNICORN_BIND', '0.0.0.0:8000')
+worker_class = _env('GUNICORN_WORKER_CLASS', 'gthread')
+workers = _env_int('GUNICORN_WORKERS', math.ceil(available_cpus()) * 2 + 1)
+# Requests handled concurrently per gthread worker (ignored by other classes)
+threads = _env_int('GUNICORN_THREADS', 4)
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = 5
+
+# Memory: share the loaded app copy-on-write, recycle workers with jitter
+preload_app = True
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', max(1, max_requests // 10))
+worker_tmp_dir = _env('GUNICORN_WORKER_TMP_DIR', '/dev/shm')
+
+# Path configurations
+pythonpath = '/app'
+chdir = '/app'
+if 'uvicorn' in worker_class.lower():
+    wsgi_app = 'techblog_cms.asgi:application'
+else:
+    wsgi_app = 'techblog_cms.wsgi:application'
+
+# Logging (files prepared by docker/entrypoint.sh)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+errorlog = os.path.join(current_dir, 'logs/error.log')
+accesslog = os.path.join(current_dir, 'logs/access.log')
+loglevel = _env('GUNICORN_LOG_LEVEL', 'info')
+
+reload = False
+capture_output = True
+
+# Seconds between each worker's stats log line
+stats_interval = _env_int('GUNICORN_STATS_INTERVAL', 60)
+
+
+class RequestStats:
+    """Per-worker request counters; gthread workers update them from several threads"""
+
+    # Latencies kept for the percentiles of the current interval
+    WINDOW = 2048
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=self.WINDOW)
+        self.last_report = self.started
+
+    def record(self, latency, status_code):
+        with self.lock:
+            self.requests += 1
+            if status_code >= 500:
+                self.errors += 1
+            self.latencies.append(latency)
+
+    def due(self, interval, now=None):
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            if now - self.last_report < interval:
+                return False
+            self.last_report = now
+            return True
+
+    def summary(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            self.latencies.clear()
+            requests, errors = self.requests, self.errors
+        uptime = max(time.monotonic() - self.started, 1e-9)
+
+        def percentile(fraction):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000
+
+        # ru_maxrss is in KiB on Linux
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return (
+            f"{requests} requests ({requests / uptime:.1f}/s), {errors} 5xx, "
+            f"p50 {percentile(0.5):.1f} ms, p95 {percentile(0.95):.1f} ms, "
+            f"max {percentile(1.0):.1f} ms over the last {len(latencies)}, peak RSS {rss:.0f} MiB"
+        )
+
+
+def _status_code(resp):
+    try:
+        return int(str(resp.status).split()[0])
+    except (AttributeError, ValueError, IndexError):
+        return 0
+
+
+def post_fork(server, worker):
+    # Connections opened while preloading belong to the master
+    from django.core.cache import caches
+    from django.db import connections
+
+    connections.close_all()
+    for cache in caches.all(initialized_only=True):
+        cache.close()
+
+
+def post_worker_init(worker):
+    worker.request_stats = RequestStats()
+
+
+def pre_request(worker, req):
+    req.started_at = time.perf_counter()
+
+
+def post_request(worker, req, environ, resp):
+    stats = getattr(worker, 'request_stats', None)
+    started_at = getattr(req, 'started_at', None)
+    if stats is None or started_at is None:
+        return
+    stats.record(time.perf_counter() - started_at, _status_code(resp))
+    if stats.due(stats_interval):
+        worker.log.info(f"worker {worker.pid}: {stats.summary()}")
+
+
+def worker_exit(server, worker):
+    stats = getattr(worker, 'request_stats', None)
+    if stats is not None:
+        server.log.info(f"worker {worker.pid} exiting: {stats.summary()}")
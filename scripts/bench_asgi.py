@@ -0,0 +1,215 @@
+"""
+Benchmark the sync gunicorn setup against an ASGI worker configuration while
+slow clients hold connections open.
+
+Starts gunicorn twice on a throwaway SQLite database with N published
+articles: once with sync workers serving techblog_cms.wsgi (the sync views),
+once with uvicorn workers serving techblog_cms.asgi (the async views in
+techblog_cms/async_views.py). Against each, "slow" clients trickle their
+request headers (one line every --slow-delay seconds, like a stalled mobile
+uplink) while "fast" clients send complete requests back to back; the fast
+clients' throughput and latency show how much of the server the slow ones
+tie up. Each setup also runs once without slow clients as a baseline.
+
+Requires gunicorn and uvicorn. The page cache is off, so every request
+renders.
+
+Usage:
+    python scripts/bench_asgi.py [--articles 200] [--workers 2] [--slow-clients 16]
+        [--fast-clients 8] [--duration 10] [--path /articles/]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import django
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+SETTINGS = """\
+from techblog_cms.settings import *  # noqa: F401,F403
+
+DATABASES = {{'default': {{'ENGINE': 'django.db.backends.sqlite3', 'NAME': {database!r}}}}}
+DEBUG = False
+ALLOWED_HOSTS = ['*']
+PAGE_CACHE_ENABLED = False
+"""
+
+SETUPS = {
+    'sync (gunicorn sync workers, WSGI)': ('sync', 'techblog_cms.wsgi:application'),
+    'asgi (gunicorn uvicorn workers, async views)': ('uvicorn.workers.UvicornWorker', 'techblog_cms.asgi:application'),
+}
+
+
+def build_site(workdir, articles):
+    database = workdir / 'bench.sqlite3'
+    (workdir / 'bench_settings.py').write_text(SETTINGS.format(database=str(database)))
+    sys.path.insert(0, str(workdir))
+    os.environ["DJANGO_SETTINGS_MODULE"] = "bench_settings"
+    os.environ["TESTING"] = "True"
+    django.setup()
+
+    from django.core.management import call_command
+
+    from techblog_cms.models import Article, Category, Tag
+
+    call_command("migrate", verbosity=0)
+    categories = [Category.objects.create(name=f"Category {n}", slug=f"category-{n}") for n in range(5)]
+    tags = [Tag.objects.create(name=f"Tag {n}", slug=f"tag-{n}") for n in range(10)]
+    Article.objects.bulk_create([
+        Article(
+            title=f"Article {n}",
+            slug=f"article-{n}",
+            content=f"# Article {n}\n\n" + "Some body text. " * 200,
+            excerpt=f"Excerpt {n}",
+            category=categories[n % len(categories)],
+            published=True,
+        )
+        for n in range(articles)
+    ])
+    through = Article.tags.through
+    through.objects.bulk_create([
+        through(article_id=article_id, tag_id=tags[article_id % len(tags)].pk)
+        for article_id in Article.objects.values_list('pk', flat=True)
+    ])
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workdir, worker_class, app, workers, port):
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE="bench_settings",
+        TESTING="True",
+        PYTHONPATH=os.pathsep.join([str(workdir), str(BASE_DIR)]),
+    )
+    # Run from workdir so the development gunicorn.conf.py (reload, /app paths) is not picked up
+    process = subprocess.Popen(
+        [
+            sys.executable, '-m', 'gunicorn', app,
+            '--bind', f'127.0.0.1:{port}',
+            '--workers', str(workers),
+            '--worker-class', worker_class,
+            '--timeout', '120',
+            '--log-level', 'warning',
+        ],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"{app} did not start")
+
+
+async def request(port, path, slow_delay=0.0):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        lines = [
+            f"GET {path} HTTP/1.1\r\n",
+            "Host: localhost\r\n",
+            "User-Agent: bench_asgi\r\n",
+            "Accept: text/html\r\n",
+            "Connection: close\r\n",
+            "\r\n",
+        ]
+        for line in lines:
+            writer.write(line.encode('ascii'))
+            await writer.drain()
+            if slow_delay and line != "\r\n":
+                await asyncio.sleep(slow_delay)
+        response = await reader.read()
+    finally:
+        writer.close()
+    if not response.startswith(b"HTTP/1.1 200"):
+        raise RuntimeError(response[:40])
+
+
+async def client_loop(port, path, stop_at, slow_delay, latencies, errors):
+    while time.monotonic() < stop_at:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(request(port, path, slow_delay), timeout=60)
+        except Exception:
+            errors.append(1)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+async def run_load(port, path, fast_clients, slow_clients, slow_delay, duration):
+    stop_at = time.monotonic() + duration
+    fast, slow, errors = [], [], []
+    await asyncio.gather(
+        *[client_loop(port, path, stop_at, 0.0, fast, errors) for _ in range(fast_clients)],
+        *[client_loop(port, path, stop_at, slow_delay, slow, errors) for _ in range(slow_clients)],
+    )
+    return fast, slow, len(errors)
+
+
+def percentile(values, fraction):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--fast-clients", type=int, default=8)
+    parser.add_argument("--slow-clients", type=int, default=16)
+    parser.add_argument("--slow-delay", type=float, default=0.5, help="Seconds between a slow client's header lines")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--path", default="/articles/")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        build_site(workdir, args.articles)
+        print(f"{args.articles} articles, {args.workers} workers, GET {args.path}, {args.duration:.0f}s per run; "
+              f"slow clients send a header line every {args.slow_delay}s")
+
+        for label, (worker_class, app) in SETUPS.items():
+            port = free_port()
+            server = start_server(workdir, worker_class, app, args.workers, port)
+            try:
+                # Warm up imports, templates and connections
+                asyncio.run(run_load(port, args.path, args.workers, 0, 0.0, 1.0))
+                print(f"\n{label}")
+                for slow_clients in (0, args.slow_clients):
+                    fast, slow, errors = asyncio.run(run_load(
+                        port, args.path, args.fast_clients, slow_clients, args.slow_delay, args.duration
+                    ))
+                    print(
+                        f"  {args.fast_clients} fast + {slow_clients:>3} slow clients: "
+                        f"{len(fast) / args.duration:8.1f} fast req/s  "
+                        f"p50 {statistics.median(fast) * 1000 if fast else float('nan'):8.1f} ms  "
+                        f"p95 {percentile(fast, 0.95) * 1000:8.1f} ms  "
+                        f"{len(slow)} slow done  {errors} errors"
+                    )
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark search-as-you-type suggestions (techblog_cms.autocomplete) against
+a naive istartswith/icontains query over titles, categories and tags.
+
+Builds N published articles plus categories and tags in the configured
+database (an in-memory SQLite database with TESTING=True, the default here),
+then replays every prefix of a few typed queries, as the header search box
+would send them, and reports per-request latency:
+
+- naive:  the database query a simple implementation would run;
+- index:  the in-process prefix index with the result cache cleared;
+- cached: a warm result cache (CACHES['default']; LocMemCache here, so this
+          omits the Redis round trip production adds).
+
+Usage:
+    python scripts/bench_autocomplete.py [--articles 100000] [--rounds 5]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import django
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "techblog_cms.settings")
+os.environ.setdefault("TESTING", "True")
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import Q  # noqa: E402
+
+from techblog_cms import autocomplete  # noqa: E402
+from techblog_cms.models import Article, Category, Tag  # noqa: E402
+
+WORDS = (
+    "django python postgres redis cache index query template view model "
+    "migration signal worker queue image markdown render deploy nginx gunicorn "
+    "async thread pool latency throughput benchmark profile memory cpu disk"
+).split()
+JAPANESE = ["非同期処理", "キャッシュ", "性能改善", "データベース", "入門", "設計"]
+TYPED = ["gunicorn", "redis cache", "キャッシュ", "throughput tuning"]
+
+
+def build_corpus(count, batch_size=2000):
+    call_command("migrate", verbosity=0)
+    categories = [Category.objects.create(name=word.title(), slug=f"cat-{word}") for word in WORDS[:10]]
+    Tag.objects.bulk_create(Tag(name=word, slug=f"tag-{word}") for word in WORDS)
+    rng = random.Random(0)
+    created = 0
+    while created < count:
+        batch = []
+        for n in range(created, min(count, created + batch_size)):
+            if rng.random() < 0.3:
+                title = f"{rng.choice(JAPANESE)}の{rng.choice(JAPANESE)} {n}"
+            else:
+                title = f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} notes {n}"
+            batch.append(Article(
+                title=title,
+                slug=f"bench-{n}",
+                content="body",
+                category=rng.choice(categories),
+                published=True,
+            ))
+        Article.objects.bulk_create(batch)
+        created += len(batch)
+
+
+def naive_suggest(query, limit=8):
+    categories = list(Category.objects.filter(name__istartswith=query).values_list("name", flat=True)[:limit])
+    tags = list(Tag.objects.filter(name__istartswith=query).values_list("name", flat=True)[:limit])
+    titles = list(
+        Article.objects.published()
+        .filter(Q(title__istartswith=query) | Q(title__icontains=f" {query}") | Q(title__icontains=query))
+        .order_by("-created_at")
+        .values_list("title", flat=True)[:limit]
+    )
+    return (categories + tags + titles)[:limit]
+
+
+def keystrokes():
+    return [typed[:n] for typed in TYPED for n in range(1, len(typed) + 1)]
+
+
+def measure(func, rounds, before=None):
+    timings = []
+    for _ in range(rounds):
+        for prefix in keystrokes():
+            if before:
+                before()
+            start = time.perf_counter()
+            func(prefix)
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    build_corpus(args.articles)
+    cache.clear()
+    start = time.perf_counter()
+    index = autocomplete.get_index(autocomplete._current_generation())
+    print(
+        f"{args.articles} articles on {connection.vendor}: index of {len(index)} labels, "
+        f"{len(index.keys)} keys built in {time.perf_counter() - start:.2f}s"
+    )
+
+    def clear_results():
+        # Keep the generation so the built index stays current
+        generation = cache.get(autocomplete.GENERATION_KEY)
+        cache.clear()
+        cache.set(autocomplete.GENERATION_KEY, generation, None)
+
+    rows = [
+        ("naive", measure(naive_suggest, max(1, args.rounds // 5))),
+        ("index", measure(autocomplete.suggest, args.rounds, before=clear_results)),
+        ("cached", measure(autocomplete.suggest, args.rounds)),
+    ]
+    print(f"{len(keystrokes())} keystrokes per round")
+    print(f"{'':<8} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, (p50, p95) in rows:
+        print(f"{name:<8} {p50:>8.3f} {p95:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
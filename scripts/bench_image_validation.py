@@ -0,0 +1,139 @@
+"""
+Benchmark validate_article_image against the previous double-open
+implementation over a corpus of JPEG/PNG/GIF/WEBP uploads sized close to
+ARTICLE_IMAGE_MAX_BYTES / ARTICLE_IMAGE_MAX_PIXELS.
+
+Uploads are wrapped in TemporaryUploadedFile (disk-backed, like Django uses
+for multi-MB uploads) and file reads are counted.
+
+Usage:
+    python scripts/bench_image_validation.py [--iterations 20]
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import django
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "techblog_cms.settings")
+os.environ.setdefault("TESTING", "True")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.files.uploadedfile import TemporaryUploadedFile  # noqa: E402
+from PIL import Image, UnidentifiedImageError  # noqa: E402
+
+from techblog_cms.views import validate_article_image  # noqa: E402
+
+
+def legacy_validate_article_image(uploaded_file):
+    """The implementation before the single-pass rewrite, for comparison"""
+    max_bytes = settings.ARTICLE_IMAGE_MAX_BYTES
+    allowed_formats = settings.ARTICLE_IMAGE_ALLOWED_FORMATS
+    max_pixels = settings.ARTICLE_IMAGE_MAX_PIXELS
+    if max_bytes and uploaded_file.size > max_bytes:
+        uploaded_file.seek(0)
+        return None, "too big"
+    uploaded_file.seek(0)
+    try:
+        with Image.open(uploaded_file) as image:
+            image.verify()
+        uploaded_file.seek(0)
+        with Image.open(uploaded_file) as image:
+            detected_format = (image.format or '').upper()
+            width, height = image.size
+    except (Image.DecompressionBombError, UnidentifiedImageError, OSError):
+        uploaded_file.seek(0)
+        return None, "invalid"
+    if max_pixels and width * height > max_pixels:
+        uploaded_file.seek(0)
+        return None, "too many pixels"
+    if allowed_formats and detected_format not in allowed_formats:
+        uploaded_file.seek(0)
+        return None, "format"
+    uploaded_file.seek(0)
+    return uploaded_file, None
+
+
+def build_corpus():
+    """Noisy photos near the byte limit plus one image just over the pixel limit"""
+    max_pixels = settings.ARTICLE_IMAGE_MAX_PIXELS
+    corpus = []
+    specs = [
+        ('JPEG', (2800, 1900), {'quality': 90}),
+        ('PNG', (1100, 800), {}),
+        ('GIF', (1600, 1200), {}),
+        ('WEBP', (3000, 2000), {'quality': 95}),
+    ]
+    for image_format, size, options in specs:
+        image = Image.effect_noise(size, 64).convert('RGB')
+        buffer = io.BytesIO()
+        image.save(buffer, image_format, **options)
+        corpus.append((f"{image_format} {size[0]}x{size[1]}", image_format, buffer.getvalue()))
+
+    side = int(max_pixels ** 0.5) + 10
+    buffer = io.BytesIO()
+    Image.new('L', (side, side)).save(buffer, 'PNG', optimize=True)
+    corpus.append((f"PNG {side}x{side} (over pixel limit)", 'PNG', buffer.getvalue()))
+    return corpus
+
+
+class CountingUpload(TemporaryUploadedFile):
+    reads = 0
+    bytes_read = 0
+
+    def read(self, *args, **kwargs):
+        data = super().read(*args, **kwargs)
+        self.reads += 1
+        self.bytes_read += len(data)
+        return data
+
+
+def make_upload(name, data):
+    upload = CountingUpload(name, 'application/octet-stream', len(data), None)
+    upload.write(data)
+    upload.seek(0)
+    return upload
+
+
+def measure(func, name, data, iterations):
+    timings = []
+    reads = bytes_read = 0
+    for _ in range(iterations):
+        upload = make_upload(name, data)
+        start = time.perf_counter()
+        func(upload)
+        timings.append((time.perf_counter() - start) * 1000)
+        reads, bytes_read = upload.reads, upload.bytes_read
+        upload.close()
+    return statistics.median(timings), reads, bytes_read
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f"Limits: {settings.ARTICLE_IMAGE_MAX_BYTES} bytes, "
+        f"{settings.ARTICLE_IMAGE_MAX_PIXELS} pixels"
+    )
+    for label, image_format, data in build_corpus():
+        print(f"{label} ({len(data) / 1024:.0f} KiB)")
+        for impl, func in (("legacy", legacy_validate_article_image), ("single", validate_article_image)):
+            median, reads, bytes_read = measure(func, f"upload.{image_format.lower()}", data, args.iterations)
+            print(
+                f"  {impl:<7} median {median:8.3f} ms  reads {reads:5d}  "
+                f"bytes read {bytes_read / 1024:9.0f} KiB"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark per-call Markdown rendering latency: fresh markdown.markdown()
+per call (the previous filter behaviour) versus the pooled renderer.
+
+Usage:
+    python scripts/bench_markdown_render.py [--iterations 50] [--blocks 40]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import markdown
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from techblog_cms.markdown_renderer import (  # noqa: E402
+    MARKDOWN_EXTENSION_CONFIGS,
+    MARKDOWN_EXTENSIONS,
+    MarkdownRendererPool,
+)
+
+CODE_BLOCK = '''
+## Section {n}
+
+Some prose with a link to https://example.com/{n} and `inline_code()`.
+
+```python
+def handler_{n}(request, *args, **kwargs):
+    """Docstring for handler {n}"""
+    items = [i * {n} for i in range(100) if i % 3]
+    return {{"status": "ok", "items": items}}
+```
+
+| key | value |
+|-----|-------|
+| a   | {n}   |
+
+```javascript
+const value{n} = async () => {{ await fetch('/api/{n}'); }};
+```
+'''
+
+
+def build_article(blocks):
+    return "# Benchmark article\n\n[TOC]\n" + "".join(
+        CODE_BLOCK.format(n=n) for n in range(blocks)
+    )
+
+
+def fresh_render(text):
+    return markdown.markdown(
+        text,
+        extensions=MARKDOWN_EXTENSIONS,
+        extension_configs=MARKDOWN_EXTENSION_CONFIGS,
+    )
+
+
+def measure(func, text, iterations):
+    func(text)  # warm-up
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func(text)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label, timings):
+    print(
+        f"{label:<10} mean {statistics.mean(timings):8.2f} ms  "
+        f"median {statistics.median(timings):8.2f} ms  "
+        f"min {min(timings):8.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--blocks', type=int, default=40)
+    args = parser.parse_args()
+
+    text = build_article(args.blocks)
+    pool = MarkdownRendererPool()
+    assert pool.render(text) == fresh_render(text)
+
+    print(f"Article size: {len(text)} chars, {args.blocks * 2} code blocks")
+    for label, func in (("fresh", fresh_render), ("pooled", pool.render)):
+        report(label, measure(func, text, args.iterations))
+
+    short = "Short *note* with https://example.com"
+    print("Short document:")
+    for label, func in (("fresh", fresh_render), ("pooled", pool.render)):
+        report(label, measure(func, short, args.iterations * 10))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark article search at scale: the full-text index (techblog_cms.search)
+versus a naive icontains scan over title/excerpt/content.
+
+Builds N published articles in the configured database (an in-memory SQLite
+database with TESTING=True, the default here; point DJANGO_SETTINGS_MODULE
+and TESTING at a PostgreSQL setup to measure the tsvector/GIN path), then
+times a first page of ranked results with snippets plus the total count.
+
+Usage:
+    python scripts/bench_search.py [--articles 100000] [--iterations 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import django
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "techblog_cms.settings")
+os.environ.setdefault("TESTING", "True")
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import Q  # noqa: E402
+
+from techblog_cms.models import Article, Category  # noqa: E402
+from techblog_cms.search import ArticleSearch  # noqa: E402
+
+WORDS = (
+    "django python postgres redis cache index query template view model "
+    "migration signal worker queue image markdown render deploy nginx gunicorn "
+    "async thread pool latency throughput benchmark profile memory cpu disk"
+).split()
+FILLER = [f"word{n}" for n in range(5000)]
+QUERIES = ["django", "redis cache", "gunicorn latency profile", "word42", "nomatch"]
+
+
+def build_corpus(count, batch_size=2000):
+    call_command("migrate", verbosity=0)
+    category = Category.objects.create(name="Bench", slug="bench")
+    rng = random.Random(0)
+    created = 0
+    while created < count:
+        batch = []
+        for n in range(created, min(count, created + batch_size)):
+            body = " ".join(rng.choice(FILLER if rng.random() < 0.99 else WORDS) for _ in range(300))
+            batch.append(Article(
+                title=f"{rng.choice(WORDS)} {rng.choice(WORDS)} notes {n}",
+                slug=f"bench-{n}",
+                content=body,
+                excerpt=body[:200],
+                category=category,
+                published=rng.random() < 0.95,
+            ))
+        Article.objects.bulk_create(batch)
+        created += len(batch)
+
+
+def naive_search(query, limit):
+    condition = Q()
+    for term in query.split():
+        condition &= Q(title__icontains=term) | Q(excerpt__icontains=term) | Q(content__icontains=term)
+    matches = Article.objects.published().filter(condition)
+    return matches.count(), list(matches.order_by("-created_at", "-id")[:limit])
+
+
+def indexed_search(query, limit):
+    results = ArticleSearch(query)
+    return results.count(), results[0:limit]
+
+
+def measure(func, query, iterations, limit=10):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        total, _ = func(query, limit)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    build_corpus(args.articles)
+    print(
+        f"Built {args.articles} articles on {connection.vendor} "
+        f"in {time.perf_counter() - start:.1f}s (index maintained by triggers)"
+    )
+
+    print(f"{'query':<28} {'matches':>8} {'naive ms':>10} {'index ms':>10}")
+    for query in QUERIES:
+        naive_ms, naive_total = measure(naive_search, query, max(1, args.iterations // 5))
+        indexed_ms, indexed_total = measure(indexed_search, query, args.iterations)
+        print(f"{query:<28} {indexed_total:>8} {naive_ms:>10.1f} {indexed_ms:>10.2f}")
+        if naive_total < indexed_total:
+            print(f"  note: substring scan found {naive_total}, index {indexed_total}")
+
+
+if __name__ == "__main__":
+    main()
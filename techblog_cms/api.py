@@ -0,0 +1,87 @@
+"""
+Compact JSON representation of published articles for /api/articles/.
+
+Clients pick fields with ?fields=id,slug,title; the queryset only loads the
+columns and relations those fields need, so a title-only page does not pull
+Markdown bodies, join categories or prefetch tags.
+"""
+from django.conf import settings
+
+from .models import Article
+
+# Field name -> columns/relations it needs: (only() columns, select_related, prefetch_related)
+ARTICLE_FIELDS = {
+    'id': ((), (), ()),
+    'slug': (('slug',), (), ()),
+    'title': (('title',), (), ()),
+    'excerpt': (('excerpt',), (), ()),
+    'created_at': ((), (), ()),
+    'url': (('slug',), (), ()),
+    'category': (('category', 'category__name', 'category__slug'), ('category',), ()),
+    'tags': ((), (), ('tags',)),
+    'thumbnail': (('image', 'image_variants'), (), ()),
+}
+DEFAULT_FIELDS = tuple(ARTICLE_FIELDS)
+
+# Largest ?limit= accepted
+MAX_LIMIT = 50
+
+
+def parse_fields(value):
+    """
+    Return the requested field names in declaration order.
+
+    Raises:
+        ValueError: for an unknown field name
+    """
+    if not value:
+        return DEFAULT_FIELDS
+    requested = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = requested - set(ARTICLE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    return tuple(name for name in ARTICLE_FIELDS if name in requested)
+
+
+def article_queryset(fields):
+    """Published articles in listing order, loading only what ``fields`` need"""
+    # created_at and id are always loaded: they make up the cursor
+    only, select, prefetch = {'created_at'}, set(), set()
+    for name in fields:
+        columns, related, prefetched = ARTICLE_FIELDS[name]
+        only.update(columns)
+        select.update(related)
+        prefetch.update(prefetched)
+    queryset = Article.objects.published().order_by('-created_at', '-id').only(*only)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+def thumbnail_url(article):
+    """Smallest derivative at least ARTICLE_THUMBNAIL_WIDTH wide, else the original"""
+    if not article.image:
+        return None
+    if article.has_current_image_variants():
+        min_width = getattr(settings, 'ARTICLE_THUMBNAIL_WIDTH', 320)
+        for variant in article.image_variants.get('variants', []):
+            if variant['width'] >= min_width:
+                return article.image.storage.url(variant['fallback'])
+    return article.image.url
+
+
+def serialize_article(article, fields):
+    values = {
+        'id': lambda: article.pk,
+        'slug': lambda: article.slug,
+        'title': lambda: article.title,
+        'excerpt': lambda: article.excerpt,
+        'created_at': lambda: article.created_at.isoformat(),
+        'url': article.get_absolute_url,
+        'category': lambda: {'slug': article.category.slug, 'name': article.category.name},
+        'tags': lambda: [tag.slug for tag in article.tags.all()],
+        'thumbnail': lambda: thumbnail_url(article),
+    }
+    return {name: values[name]() for name in fields}
@@ -0,0 +1,23 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def install_search_index(sender, using, **kwargs):
+    # Also covers test databases built without migrations and SQLite table
+    # rebuilds, which drop the FTS triggers
+    from django.db import connections
+
+    from .search import install_search_index
+
+    install_search_index(connections[using])
+
+
+class TechblogCmsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'techblog_cms'
+
+    def ready(self):
+        # Connect cache invalidation receivers
+        from . import signals  # noqa: F401
+
+        post_migrate.connect(install_search_index, sender=self)
@@ -0,0 +1,11 @@
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'techblog_cms.settings')
+# Route the public read views to their async variants (techblog_cms/async_views.py)
+os.environ.setdefault('ASYNC_READ_VIEWS', 'True')
+# Async requests run their queries in per-request threads, so persistent
+# connections would pile up; reuse connections through PgBouncer instead
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
+
+application = get_asgi_application()
@@ -0,0 +1,141 @@
+"""
+Async variants of the public read views, routed instead of the ones in
+techblog_cms.views when ASYNC_READ_VIEWS is on (asgi.py turns it on).
+
+Queries go through the async ORM, so under an ASGI server a worker's event
+loop keeps accepting and serving other connections while a request waits on
+the database or a slow client. Templates are rendered in a thread
+(sync_to_async): the navigation context processor and lazy model attributes
+may still query, which Django does not allow from the event loop. The page
+cache and conditional GET decorators detect async views, so the responses,
+headers and invalidation match the sync views exactly.
+"""
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from django.shortcuts import render
+
+from .conditional import (
+    article_validators,
+    category_listing_validators,
+    conditional_page,
+    published_listing_validators,
+    tag_listing_validators,
+    taxonomy_validators,
+)
+from .models import Article, Category, Tag
+from .page_cache import ais_authenticated, anonymous_page_cache
+from .pagination import apaginate_articles, encode_cursor
+from .views import _article_api_url
+
+arender = sync_to_async(render)
+
+
+async def _aget_or_404(queryset, **kwargs):
+    try:
+        return await queryset.aget(**kwargs)
+    except queryset.model.DoesNotExist:
+        raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+
+
+@conditional_page(published_listing_validators)
+@anonymous_page_cache
+async def home_view(request):
+    articles = [article async for article in Article.objects.published().for_listing()[:10]]
+    return await arender(
+        request,
+        'home.html',
+        {
+            'articles': articles,
+        },
+    )
+
+
+@conditional_page(published_listing_validators)
+@anonymous_page_cache
+async def article_list_view(request):
+    context = await apaginate_articles(request, Article.objects.published().for_listing())
+    if context['next_url']:
+        context['api_next_url'] = _article_api_url(after=encode_cursor(context['articles'][-1]))
+    return await arender(
+        request,
+        'article_list.html',
+        context,
+    )
+
+
+@conditional_page(taxonomy_validators)
+@anonymous_page_cache
+async def categories_view(request):
+    categories = Category.objects.with_article_counts(
+        published_only=not await ais_authenticated(request)
+    ).order_by('name')
+    return await arender(
+        request,
+        'category_list.html',
+        {
+            'categories': [category async for category in categories],
+        },
+    )
+
+
+@conditional_page(category_listing_validators)
+@anonymous_page_cache
+async def category_view(request, slug):
+    category = await _aget_or_404(Category.objects.all(), slug=slug)
+    articles = category.article_set.published().for_listing()
+    return await arender(
+        request,
+        'category_detail.html',
+        {
+            'category': category,
+            **await apaginate_articles(request, articles),
+        },
+    )
+
+
+@conditional_page(taxonomy_validators)
+@anonymous_page_cache
+async def tags_view(request):
+    return await arender(
+        request,
+        'tag_list.html',
+        {
+            'tags': [tag async for tag in Tag.objects.all()],
+        },
+    )
+
+
+@conditional_page(tag_listing_validators)
+@anonymous_page_cache
+async def tag_view(request, slug):
+    tag = await _aget_or_404(Tag.objects.all(), slug=slug)
+    if await ais_authenticated(request):
+        articles = tag.article_set.for_listing()
+    else:
+        articles = tag.article_set.published().for_listing()
+
+    return await arender(
+        request,
+        'tag_detail.html',
+        {
+            'tag': tag,
+            **await apaginate_articles(request, articles, with_count=True),
+        },
+    )
+
+
+@conditional_page(article_validators)
+@anonymous_page_cache
+async def article_detail_view(request, slug):
+    # Signed-in users may also view drafts
+    articles = Article.objects.select_related('category').prefetch_related('tags')
+    if not await ais_authenticated(request):
+        articles = articles.filter(published=True)
+    article = await _aget_or_404(articles, slug=slug)
+    return await arender(
+        request,
+        'article_detail.html',
+        {
+            'article': article,
+        },
+    )
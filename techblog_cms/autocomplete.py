@@ -0,0 +1,243 @@
+"""
+Search-as-you-type suggestions over article titles, category names and tag
+names.
+
+Each process keeps a prefix index built from the published data:
+
+- every label gets one sort key per word start ("Django REST framework" is
+  found by "dj", "rest" and "fra"), and one per character inside CJK runs,
+  since Japanese titles have no spaces to mark where a word begins;
+- the keys live in one sorted list searched with bisect, and the best
+  suggestions for every prefix of up to TOP_PREFIX_LENGTH characters are
+  precomputed, so short prefixes (the bulk of keystrokes, and the ones that
+  match the most labels) are a dict lookup.
+
+Suggestions are ordered by where the match starts (label start first), then
+by entry weight: categories and tags by published article count, then
+articles newest first.
+
+The index is tagged with a generation token kept in CACHES['default']; the
+model signals replace the token and every process rebuilds on its next
+request. Results for a prefix are also cached there for
+AUTOCOMPLETE_CACHE_TIMEOUT seconds, and the hot path reads the token and
+the cached result in a single round trip.
+"""
+import hashlib
+import logging
+import re
+import threading
+import unicodedata
+import uuid
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.urls import reverse
+
+from .models import Article, Category, Tag
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = 'autocomplete:gen'
+
+# Longest query considered; longer input is cut before lookup
+MAX_QUERY_LENGTH = 50
+# Keys are label suffixes cut to this length; longer queries are checked
+# against the full label
+KEY_LENGTH = 24
+MAX_KEYS_PER_LABEL = 32
+TOP_PREFIX_LENGTH = 3
+MAX_LIMIT = 20
+# Upper bound on index keys examined for a prefix longer than TOP_PREFIX_LENGTH
+MAX_SCAN = 10_000
+
+URL_NAMES = {
+    'category': 'category',
+    'tag': 'tag',
+    'article': 'article_detail',
+}
+
+CJK = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]')
+WORD_START = re.compile(r'(?<!\w)\w')
+
+
+def fold(text):
+    """NFKC, case-folded, single-spaced; full-width and half-width input compare equal"""
+    text = unicodedata.normalize('NFKC', text or '').casefold()
+    return ' '.join(text.split())
+
+
+def normalize_query(query):
+    return fold(query)[:MAX_QUERY_LENGTH]
+
+
+def key_starts(label):
+    """Offsets in a normalized label at which a query may start matching"""
+    starts = {0}
+    starts.update(match.start() for match in WORD_START.finditer(label))
+    starts.update(match.start() for match in CJK.finditer(label))
+    return sorted(starts)[:MAX_KEYS_PER_LABEL]
+
+
+class SuggestionIndex:
+    def __init__(self, entries):
+        """
+        Args:
+            entries: (label, kind, slug) tuples, best first
+        """
+        self.entries = entries
+        self.labels = [fold(label) for label, _, _ in entries]
+        size = len(entries)
+
+        pairs = []
+        for entry_id, label in enumerate(self.labels):
+            for start in key_starts(label):
+                # Matches at the start of a label outrank matches inside it
+                rank = entry_id if start == 0 else size + entry_id
+                pairs.append((label[start:start + KEY_LENGTH], rank))
+        pairs.sort()
+        self.keys = [key for key, _ in pairs]
+        self.ranks = [rank for _, rank in pairs]
+
+        self.top = {}
+        for key, rank in sorted(pairs, key=lambda pair: pair[1]):
+            entry_id = rank % size
+            for length in range(1, min(TOP_PREFIX_LENGTH, len(key)) + 1):
+                best = self.top.setdefault(key[:length], [])
+                if len(best) < MAX_LIMIT and entry_id not in best:
+                    best.append(entry_id)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _scan(self, query, limit):
+        size = len(self.entries)
+        prefix = query[:KEY_LENGTH]
+        start = bisect_left(self.keys, prefix)
+        ranks = []
+        for position in range(start, min(len(self.keys), start + MAX_SCAN)):
+            if not self.keys[position].startswith(prefix):
+                break
+            rank = self.ranks[position]
+            # Keys are cut at KEY_LENGTH; check longer queries against the label
+            if len(query) > KEY_LENGTH and query not in self.labels[rank % size]:
+                continue
+            ranks.append(rank)
+
+        found = []
+        for rank in sorted(ranks):
+            entry_id = rank % size
+            if entry_id not in found:
+                found.append(entry_id)
+                if len(found) == limit:
+                    break
+        return found
+
+    def lookup(self, query, limit):
+        """Entry ids for a normalized query, best first"""
+        if not query or not self.entries:
+            return []
+        if len(query) <= TOP_PREFIX_LENGTH:
+            return self.top.get(query, [])[:limit]
+        return self._scan(query, limit)
+
+    def suggest(self, query, limit):
+        suggestions = []
+        for entry_id in self.lookup(query, limit):
+            label, kind, slug = self.entries[entry_id]
+            suggestions.append({
+                'label': label,
+                'type': kind,
+                'url': reverse(URL_NAMES[kind], kwargs={'slug': slug}),
+            })
+        return suggestions
+
+
+def build_entries():
+    categories = (
+        Category.objects.annotate(num_articles=Count('article', filter=Q(article__published=True)))
+        .order_by('-num_articles', 'name')
+        .values_list('name', 'slug')
+    )
+    tags = (
+        Tag.objects.annotate(num_articles=Count('article', filter=Q(article__published=True)))
+        .order_by('-num_articles', 'name')
+        .values_list('name', 'slug')
+    )
+    articles = Article.objects.published().order_by('-created_at', '-id').values_list('title', 'slug')
+    return [
+        *((name, 'category', slug) for name, slug in categories),
+        *((name, 'tag', slug) for name, slug in tags),
+        *((title, 'article', slug) for title, slug in articles),
+    ]
+
+
+_index = None
+_index_generation = None
+_build_lock = threading.Lock()
+
+
+def _current_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, uuid.uuid4().hex, None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def get_index(generation):
+    global _index, _index_generation
+    if _index is not None and _index_generation == generation:
+        return _index
+    with _build_lock:
+        if _index is None or _index_generation != generation:
+            _index = SuggestionIndex(build_entries())
+            _index_generation = generation
+    return _index
+
+
+def _result_key(generation, query, limit):
+    digest = hashlib.sha256(query.encode('utf-8')).hexdigest()[:32]
+    return f"autocomplete:{generation}:{limit}:{digest}"
+
+
+def suggest(query, limit=None):
+    """Up to ``limit`` suggestion dicts (label, type, url) for a prefix"""
+    query = normalize_query(query)
+    if limit is None:
+        limit = getattr(settings, 'AUTOCOMPLETE_LIMIT', 8)
+    limit = max(1, min(limit, MAX_LIMIT))
+    if not query:
+        return []
+
+    try:
+        # Guess that this process's index is current: one round trip for
+        # both the generation and the cached result
+        guess_key = _result_key(_index_generation, query, limit)
+        found = cache.get_many([GENERATION_KEY, guess_key])
+        generation = found.get(GENERATION_KEY) or _current_generation()
+        if generation == _index_generation and guess_key in found:
+            return found[guess_key]
+        key = _result_key(generation, query, limit)
+        cached = cache.get(key) if key != guess_key else None
+    except Exception as e:
+        logger.warning(f"Autocomplete cache read failed: {e}")
+        generation, key, cached = None, None, None
+    if cached is not None:
+        return cached
+
+    suggestions = get_index(generation).suggest(query, limit)
+    if key is not None:
+        try:
+            cache.set(key, suggestions, getattr(settings, 'AUTOCOMPLETE_CACHE_TIMEOUT', 60))
+        except Exception as e:
+            logger.warning(f"Autocomplete cache write failed: {e}")
+    return suggestions
+
+
+def invalidate_autocomplete():
+    try:
+        cache.set(GENERATION_KEY, uuid.uuid4().hex, None)
+    except Exception as e:
+        logger.warning(f"Autocomplete invalidation failed: {e}")
@@ -0,0 +1,162 @@
+"""
+Conditional GET (ETag / Last-Modified) for the public read views.
+
+Each view supplies a validators function returning a tuple of values that
+identify the content it would render (e.g. slug and updated_at) plus the
+newest updated_at among them, or None when the view should run normally
+(typically to produce a 404). The validators are combined with the page
+cache generation tokens, which the model signals replace whenever category,
+tag or sidebar data changes, so:
+
+- the weak ETag changes whenever the rendered page could change;
+- Last-Modified is the newest of the content timestamp and the generations;
+- the computed validators can be cached under those same generations, so a
+  revalidation costs no database queries on a warm cache.
+
+A current client gets a 304 before the view runs: no template rendering and
+no Markdown conversion. Signed-in users are skipped because their pages
+include drafts. Async views are wrapped with an async variant that computes
+the validators in a thread.
+"""
+import asyncio
+import hashlib
+import logging
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .markdown_renderer import RENDERER_VERSION
+from .models import Article, Category, Tag
+from .page_cache import ais_authenticated, generation_time, generations
+
+logger = logging.getLogger(__name__)
+
+
+def validators_timeout():
+    # Entries become unreachable once a generation changes. The TTL matches
+    # the page cache, so a write that skips the signals (a queryset update())
+    # is not answered with a stale 304 for longer than a cached page lives.
+    return getattr(settings, 'PAGE_CACHE_TIMEOUT', 300)
+
+
+def _compute_validators(request, validators_func, args, kwargs):
+    site_generation, path_generation = generations(request.path)
+    key = f"validators:{RENDERER_VERSION}:{site_generation}:{path_generation}:{request.path}"
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = validators_func(request, *args, **kwargs)
+    if result is None:
+        return None
+    parts, updated_at = result
+    fingerprint = repr((parts, RENDERER_VERSION, site_generation, path_generation))
+    etag = f'W/"{hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:32]}"'
+    timestamps = [generation_time(site_generation), generation_time(path_generation)]
+    if updated_at is not None:
+        timestamps.append(updated_at.timestamp())
+    validators = (etag, int(max(timestamps)))
+    cache.set(key, validators, validators_timeout())
+    return validators
+
+
+def _safe_validators(request, validators_func, args, kwargs):
+    try:
+        return _compute_validators(request, validators_func, args, kwargs)
+    except Exception as e:
+        logger.warning(f"Conditional GET validators failed: {e}")
+        return None
+
+
+def _with_validators(response, validators):
+    etag, last_modified = validators
+    if response.status_code in (200, 304):
+        response.headers.setdefault('ETag', etag)
+        response.headers.setdefault('Last-Modified', http_date(last_modified))
+    return response
+
+
+def conditional_page(validators_func):
+    """Answer If-None-Match / If-Modified-Since for anonymous GET requests (sync or async views)"""
+
+    def decorator(view_func):
+        if asyncio.iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD') or await ais_authenticated(request):
+                    return await view_func(request, *args, **kwargs)
+
+                validators = await sync_to_async(_safe_validators)(request, validators_func, args, kwargs)
+                if validators is None:
+                    return await view_func(request, *args, **kwargs)
+
+                etag, last_modified = validators
+                response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+                if response is None:
+                    response = await view_func(request, *args, **kwargs)
+                return _with_validators(response, validators)
+
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+                return view_func(request, *args, **kwargs)
+
+            validators = _safe_validators(request, validators_func, args, kwargs)
+            if validators is None:
+                return view_func(request, *args, **kwargs)
+
+            etag, last_modified = validators
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+            return _with_validators(response, validators)
+
+        return wrapper
+
+    return decorator
+
+
+def _listing_validators(queryset):
+    summary = queryset.aggregate(total=Count('pk'), newest=Max('updated_at'))
+    return (summary['total'], summary['newest']), summary['newest']
+
+
+def published_listing_validators(request, *args, **kwargs):
+    return _listing_validators(Article.objects.published())
+
+
+def category_listing_validators(request, slug):
+    if not Category.objects.filter(slug=slug).exists():
+        return None
+    return _listing_validators(Article.objects.published().filter(category__slug=slug))
+
+
+def tag_listing_validators(request, slug):
+    if not Tag.objects.filter(slug=slug).exists():
+        return None
+    return _listing_validators(Article.objects.published().filter(tags__slug=slug))
+
+
+def taxonomy_validators(request, *args, **kwargs):
+    # Category/tag index pages only change through signals that bump generations
+    return (), None
+
+
+def sitemap_validators(request, *args, **kwargs):
+    # Sitemap paths are invalidated precisely by the signal receivers, so the
+    # generation tokens alone identify their content
+    return (), None
+
+
+def article_validators(request, slug):
+    article = Article.objects.published().filter(slug=slug).values('slug', 'updated_at').first()
+    if article is None:
+        return None
+    return (article['slug'], article['updated_at']), article['updated_at']
@@ -1,9 +1,18 @@
 import os
 import sys
 
+from django.utils.functional import SimpleLazyObject
+
+from .navigation import get_navigation
+
 def testing_mode(request):
     """Add IS_TESTING variable to template context"""
     IS_TESTING = os.environ.get('TESTING') == 'True' or 'PYTEST_CURRENT_TEST' in os.environ or any(
         x.endswith('pytest') for x in sys.modules.keys()
     )
     return {'IS_TESTING': IS_TESTING}
+
+
+def navigation(request):
+    """Add lazily loaded, cached sidebar data (categories and tags)"""
+    return {'navigation': SimpleLazyObject(get_navigation)}
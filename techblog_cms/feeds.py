@@ -0,0 +1,150 @@
+"""
+RSS 2.0 and Atom feeds: site-wide, per category and per tag.
+
+Entries use the stored content_html (Article.rendered_content()), so building
+a feed costs one query for the articles and one for their tags, and never
+converts Markdown. The views are wrapped like the HTML listings: the listing
+validators answer conditional GETs from feed readers with 304, and the page
+cache keeps the serialized XML until the signal receivers invalidate a path
+returned by feed_paths().
+"""
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+
+from .conditional import (
+    category_listing_validators,
+    conditional_page,
+    published_listing_validators,
+    tag_listing_validators,
+)
+from .models import Article, Category, Tag
+from .page_cache import anonymous_page_cache
+
+
+class AtomWithContentFeed(Atom1Feed):
+    """Atom feed whose entries carry the full article HTML in <content>"""
+
+    def add_item_elements(self, handler, item):
+        super().add_item_elements(handler, item)
+        if item.get('content'):
+            handler.addQuickElement('content', item['content'], {'type': 'html'})
+
+
+class ArticleFeed(Feed):
+    """Newest published articles; RSS descriptions are the full article HTML"""
+
+    title = "TechBlog CMS"
+    description = "Latest articles"
+
+    def link(self):
+        return reverse('home')
+
+    def feed_articles(self, obj):
+        return Article.objects.published()
+
+    def items(self, obj):
+        limit = getattr(settings, 'FEED_ITEMS', 20)
+        return self.feed_articles(obj).for_listing().prefetch_related('tags')[:limit]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.rendered_content()
+
+    def item_pubdate(self, item):
+        return item.created_at
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_categories(self, item):
+        return [item.category.name, *(tag.name for tag in item.tags.all())]
+
+
+class ArticleAtomFeed(ArticleFeed):
+    feed_type = AtomWithContentFeed
+    subtitle = ArticleFeed.description
+
+    def item_description(self, item):
+        return item.excerpt
+
+    def item_extra_kwargs(self, item):
+        return {'content': item.rendered_content()}
+
+
+class CategoryFeedMixin:
+    def get_object(self, request, slug):
+        return get_object_or_404(Category, slug=slug)
+
+    def title(self, obj):
+        return f"{obj.name} - TechBlog CMS"
+
+    def description(self, obj):
+        return obj.description or f"Latest articles in {obj.name}"
+
+    def link(self, obj):
+        return obj.get_absolute_url()
+
+    def feed_articles(self, obj):
+        return obj.article_set.published()
+
+
+class TagFeedMixin:
+    def get_object(self, request, slug):
+        return get_object_or_404(Tag, slug=slug)
+
+    def title(self, obj):
+        return f"#{obj.name} - TechBlog CMS"
+
+    def description(self, obj):
+        return f"Latest articles tagged {obj.name}"
+
+    def link(self, obj):
+        return obj.get_absolute_url()
+
+    def feed_articles(self, obj):
+        return obj.article_set.published()
+
+
+class CategoryFeed(CategoryFeedMixin, ArticleFeed):
+    pass
+
+
+class CategoryAtomFeed(CategoryFeedMixin, ArticleAtomFeed):
+    subtitle = CategoryFeedMixin.description
+
+
+class TagFeed(TagFeedMixin, ArticleFeed):
+    pass
+
+
+class TagAtomFeed(TagFeedMixin, ArticleAtomFeed):
+    subtitle = TagFeedMixin.description
+
+
+def _cached(feed, validators):
+    return conditional_page(validators)(anonymous_page_cache(feed))
+
+
+site_rss = _cached(ArticleFeed(), published_listing_validators)
+site_atom = _cached(ArticleAtomFeed(), published_listing_validators)
+category_rss = _cached(CategoryFeed(), category_listing_validators)
+category_atom = _cached(CategoryAtomFeed(), category_listing_validators)
+tag_rss = _cached(TagFeed(), tag_listing_validators)
+tag_atom = _cached(TagAtomFeed(), tag_listing_validators)
+
+
+def feed_paths(category_slugs=(), tag_slugs=()):
+    """Feed URLs that list articles from the given categories and tags"""
+    paths = {reverse('feed_rss'), reverse('feed_atom')}
+    for slug in category_slugs:
+        paths.add(reverse('category_feed_rss', kwargs={'slug': slug}))
+        paths.add(reverse('category_feed_atom', kwargs={'slug': slug}))
+    for slug in tag_slugs:
+        paths.add(reverse('tag_feed_rss', kwargs={'slug': slug}))
+        paths.add(reverse('tag_feed_atom', kwargs={'slug': slug}))
+    return paths
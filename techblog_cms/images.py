@@ -0,0 +1,281 @@
+"""
+Responsive derivatives for Article.image.
+
+For every configured width narrower than the original, a WebP copy and a
+copy in the original format (PNG for GIF sources) are written next to the
+original, e.g. articles/cover.png -> articles/cover-640w.webp and
+articles/cover-640w.png. The resulting file names and dimensions are stored
+in Article.image_variants so templates can build srcset without touching
+storage.
+
+optimize_upload() runs on editor uploads after they are stored, in the
+article.optimize_image job (Article.optimize_image): it re-encodes the image
+without metadata, may turn PNG photos into JPEG/WebP, and tries to keep the
+result within ARTICLE_IMAGE_BYTE_BUDGET.
+"""
+import io
+import logging
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+try:
+    from PIL import ImageCms
+except ImportError:  # Pillow built without littlecms
+    ImageCms = None
+
+logger = logging.getLogger(__name__)
+
+# Pillow format name -> file extension / fallback format for derivatives
+FALLBACK_FORMATS = {
+    'JPEG': 'JPEG',
+    'PNG': 'PNG',
+    'GIF': 'PNG',  # still frame; animated GIFs keep the original as the largest candidate
+    'WEBP': 'WEBP',
+}
+EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp', 'GIF': 'gif'}
+LOSSY_FORMATS = ('JPEG', 'WEBP')
+# image.info keys that carry metadata rather than pixels
+METADATA_KEYS = ('exif', 'icc_profile', 'xmp', 'XML:com.adobe.xmp', 'photoshop', 'comment')
+
+
+def derivative_name(name, width, image_format):
+    base, _ = os.path.splitext(name)
+    return f"{base}-{width}w.{EXTENSIONS[image_format]}"
+
+
+def _default_quality(image_format):
+    if image_format == 'JPEG':
+        return getattr(settings, 'ARTICLE_IMAGE_JPEG_QUALITY', 82)
+    return getattr(settings, 'ARTICLE_IMAGE_WEBP_QUALITY', 80)
+
+
+def _encode(image, image_format, quality=None):
+    # Nothing from image.info is passed on, so the output carries no metadata
+    buffer = io.BytesIO()
+    if quality is None and image_format in LOSSY_FORMATS:
+        quality = _default_quality(image_format)
+    if image_format == 'JPEG':
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        image.save(buffer, 'JPEG', quality=quality, optimize=True, progressive=True)
+    elif image_format == 'WEBP':
+        image.save(buffer, 'WEBP', quality=quality, method=4)
+    else:
+        image.save(buffer, image_format, optimize=True)
+    return buffer.getvalue()
+
+
+def variant_names(variants):
+    return {
+        name
+        for variant in (variants or {}).get('variants', [])
+        for name in (variant.get('webp'), variant.get('fallback'))
+        if name
+    }
+
+
+def delete_variants(storage, variants, keep=None):
+    """
+    Delete the derivative files listed in ``variants``, except those also
+    listed in ``keep``: derivatives of a replacement image with the same base
+    name (cover.png -> cover.jpg) are written under the same names.
+    """
+    for name in variant_names(variants) - variant_names(keep):
+        try:
+            storage.delete(name)
+        except OSError as e:
+            logger.warning(f"Could not delete image derivative {name}: {e}")
+
+
+def _save(storage, name, data):
+    # A file already at this name is a stale derivative of the same source
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, ContentFile(data))
+
+
+def generate_variants(field_file):
+    """Write resized derivatives for an ImageField file and return their metadata"""
+    storage = field_file.storage
+    widths = sorted(set(getattr(settings, 'ARTICLE_IMAGE_WIDTHS', (320, 640, 960, 1280))))
+
+    with field_file.open('rb') as source, Image.open(source) as original:
+        source_format = (original.format or '').upper()
+        fallback_format = FALLBACK_FORMATS.get(source_format, 'PNG')
+        image = ImageOps.exif_transpose(original)
+        if image.mode == 'P':
+            image = image.convert('RGBA')
+        elif image.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+            image = image.convert('RGB')
+        original_width, original_height = image.size
+
+        variants = []
+        for width in widths:
+            if width >= original_width:
+                break
+            height = max(1, round(original_height * width / original_width))
+            resized = image.resize((width, height), Image.LANCZOS)
+            variant = {'width': width, 'height': height}
+            variant['webp'] = _save(
+                storage,
+                derivative_name(field_file.name, width, 'WEBP'),
+                _encode(resized, 'WEBP'),
+            )
+            if fallback_format == 'WEBP':
+                variant['fallback'] = variant['webp']
+            else:
+                variant['fallback'] = _save(
+                    storage,
+                    derivative_name(field_file.name, width, fallback_format),
+                    _encode(resized, fallback_format),
+                )
+            variants.append(variant)
+
+    return {
+        'source': field_file.name,
+        'width': original_width,
+        'height': original_height,
+        'variants': variants,
+    }
+
+
+def _has_metadata(image):
+    return any(key in image.info for key in METADATA_KEYS)
+
+
+def _has_transparency(image):
+    if image.mode in ('RGBA', 'LA'):
+        return image.getextrema()[-1][0] < 255
+    return 'transparency' in image.info
+
+
+def _to_srgb(image):
+    """Convert pixels tagged with an ICC profile to sRGB before the profile is dropped"""
+    icc_profile = image.info.get('icc_profile')
+    if not icc_profile or ImageCms is None or image.mode not in ('RGB', 'RGBA', 'CMYK'):
+        return image
+    try:
+        return ImageCms.profileToProfile(
+            image,
+            ImageCms.ImageCmsProfile(io.BytesIO(icc_profile)),
+            ImageCms.createProfile('sRGB'),
+            outputMode='RGBA' if image.mode == 'RGBA' else 'RGB',
+        )
+    except (ImageCms.PyCMSError, OSError, ValueError) as e:
+        logger.warning(f"Could not convert embedded ICC profile to sRGB: {e}")
+        return image
+
+
+def _fit_budget(image, image_format, budget):
+    """
+    Encode, lowering quality and then dimensions until the result fits the
+    budget. Only lossy formats are shrunk: a lossless PNG/GIF keeps its
+    dimensions (screenshots and diagrams would lose legibility), so the
+    result may still exceed the budget.
+    """
+    quality = _default_quality(image_format) if image_format in LOSSY_FORMATS else None
+    data = _encode(image, image_format, quality)
+    if not budget:
+        return data, image.size
+
+    if image_format not in LOSSY_FORMATS:
+        return data, image.size
+
+    min_quality = getattr(settings, 'ARTICLE_IMAGE_MIN_QUALITY', 60)
+    while len(data) > budget and quality - 10 >= min_quality:
+        quality -= 10
+        data = _encode(image, image_format, quality)
+
+    # Encoded size roughly follows the pixel count; a few rounds are enough
+    for _ in range(3):
+        if len(data) <= budget:
+            break
+        scale = max(0.5, (budget / len(data)) ** 0.5 * 0.95)
+        width, height = image.size
+        image = image.resize((max(1, round(width * scale)), max(1, round(height * scale))), Image.LANCZOS)
+        data = _encode(image, image_format, quality)
+    return data, image.size
+
+
+def optimize_upload(uploaded_file):
+    """
+    Re-encode a validated upload for storage.
+
+    Metadata (EXIF, ICC profiles after conversion to sRGB, XMP, comments) is
+    dropped and orientation is applied to the pixels. Opaque PNG photos are
+    also tried as JPEG/WebP, and lossy encodings step down in quality (then
+    size) to fit ARTICLE_IMAGE_BYTE_BUDGET; lossless images are never
+    resized. The original is kept when it has no metadata and nothing smaller
+    was found, as are animated images.
+
+    Returns:
+        tuple(File, dict): the file to store and a report with
+        original_bytes, bytes, saved_bytes, format, width, height,
+        resized (dimensions were reduced) and over_budget (the stored file
+        still exceeds the budget)
+    """
+    uploaded_file.seek(0)
+    original = uploaded_file.read()
+    uploaded_file.seek(0)
+    budget = getattr(settings, 'ARTICLE_IMAGE_BYTE_BUDGET', 0)
+    allowed_formats = getattr(settings, 'ARTICLE_IMAGE_ALLOWED_FORMATS', ())
+
+    with Image.open(io.BytesIO(original)) as source:
+        source_format = (source.format or '').upper()
+        report = {
+            'original_bytes': len(original),
+            'bytes': len(original),
+            'saved_bytes': 0,
+            'format': source_format,
+            'width': source.width,
+            'height': source.height,
+            'resized': False,
+            'over_budget': bool(budget) and len(original) > budget,
+        }
+        if getattr(source, 'n_frames', 1) > 1 or source_format not in EXTENSIONS:
+            return uploaded_file, report
+
+        has_metadata = _has_metadata(source)
+        image = _to_srgb(ImageOps.exif_transpose(source))
+        if image.mode == 'CMYK':
+            image = image.convert('RGB')
+
+        candidates = [source_format]
+        is_photo = (
+            source_format == 'PNG'
+            and not _has_transparency(image)
+            and image.mode not in ('1', 'P')
+            # More colours than a palette can hold (all 256 levels for greyscale)
+            and image.getcolors(255) is None
+        )
+        if is_photo:
+            # Lossless PNG is rarely the smallest option for photographs
+            candidates = [
+                fmt for fmt in getattr(settings, 'ARTICLE_IMAGE_PHOTO_FORMATS', ('JPEG', 'WEBP'))
+                if not allowed_formats or fmt in allowed_formats
+            ] or candidates
+
+        best = None
+        for image_format in candidates:
+            data, size = _fit_budget(image, image_format, budget)
+            if best is None or len(data) < len(best[0]):
+                best = (data, size, image_format)
+
+    data, (width, height), image_format = best
+    if not has_metadata and len(data) >= len(original):
+        return uploaded_file, report
+
+    base, _ = os.path.splitext(os.path.basename(uploaded_file.name or 'image'))
+    report.update({
+        'bytes': len(data),
+        'saved_bytes': len(original) - len(data),
+        'format': image_format,
+        'width': width,
+        'height': height,
+        'resized': (width, height) != image.size,
+        'over_budget': bool(budget) and len(data) > budget,
+    })
+    return ContentFile(data, name=f"{base}.{EXTENSIONS[image_format]}"), report
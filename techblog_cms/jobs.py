@@ -0,0 +1,294 @@
+"""
+Background jobs for work that should not hold a request (and a sync
+gunicorn worker) open, such as image derivatives and bulk re-rendering.
+
+The Job table is the source of truth for status, attempts and errors, and is
+what the dashboard shows. When CACHES['default'] is django-redis, enqueue()
+also pushes the job id onto a Redis list so idle workers wake up at once
+instead of on their next database poll; without Redis workers just poll.
+
+Handlers are registered with @job('name') and receive the payload as keyword
+arguments. A handler that raises is retried with exponential backoff
+(JOB_RETRY_BACKOFF seconds, doubling per attempt, capped at
+JOB_RETRY_BACKOFF_MAX) until max_attempts, then marked failed. A worker that
+dies mid-job leaves it running; it is picked up again once its lease
+(JOB_LEASE_TIMEOUT) expires. With JOB_QUEUE_EAGER jobs run inline at enqueue
+time, which is what the test settings use.
+
+Run workers with `python manage.py worker`.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import close_old_connections, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+from .models import Article, Job
+from .page_cache import invalidate_paths
+
+logger = logging.getLogger(__name__)
+
+WAKEUP_KEY = 'jobs:wakeup'
+# Wake-up ids are hints only; cap the list if no worker is consuming it
+WAKEUP_MAX_LENGTH = 1000
+
+HANDLERS = {}
+
+
+def job(name):
+    """Register a function as the handler for jobs called `name`"""
+
+    def decorator(func):
+        HANDLERS[name] = func
+        return func
+
+    return decorator
+
+
+def _redis():
+    """Raw client behind CACHES['default'], or None when it is not django-redis"""
+    try:
+        return get_redis_connection('default')
+    except NotImplementedError:
+        return None
+
+
+def _notify(job_id):
+    client = _redis()
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline()
+        pipe.rpush(WAKEUP_KEY, job_id)
+        pipe.ltrim(WAKEUP_KEY, -WAKEUP_MAX_LENGTH, -1)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Job wake-up notification failed: {e}")
+
+
+def _wait(client, timeout):
+    if client is not None:
+        try:
+            client.blpop(WAKEUP_KEY, timeout=max(1, int(timeout)))
+            return
+        except Exception as e:
+            logger.warning(f"Waiting on Redis failed, falling back to polling: {e}")
+    time.sleep(timeout)
+
+
+def enqueue(name, payload=None, dedupe_key='', delay=0, requeue_failed=True):
+    """
+    Queue a job and return it. When dedupe_key is given and a job with that
+    key is still pending, that job is returned instead of queueing another
+    one; with requeue_failed=False a job that failed for good counts too.
+    """
+    if name not in HANDLERS:
+        raise ValueError(f"Unknown job: {name}")
+    if dedupe_key:
+        statuses = [Job.QUEUED, Job.RUNNING]
+        if not requeue_failed:
+            statuses.append(Job.FAILED)
+        existing = Job.objects.filter(dedupe_key=dedupe_key, status__in=statuses).first()
+        if existing is not None:
+            return existing
+
+    eager = getattr(settings, 'JOB_QUEUE_EAGER', False)
+    queued = Job.objects.create(
+        name=name,
+        payload=payload or {},
+        dedupe_key=dedupe_key,
+        max_attempts=getattr(settings, 'JOB_MAX_ATTEMPTS', 5),
+        run_at=timezone.now() + timedelta(seconds=0 if eager else delay),
+    )
+    if eager:
+        claimed = claim(queued.pk)
+        if claimed is not None:
+            run_job(claimed)
+            queued.refresh_from_db()
+    else:
+        transaction.on_commit(lambda: _notify(queued.pk))
+    return queued
+
+
+def _due():
+    now = timezone.now()
+    lease_expired = now - timedelta(seconds=getattr(settings, 'JOB_LEASE_TIMEOUT', 600))
+    return Job.objects.filter(
+        Q(status=Job.QUEUED, run_at__lte=now)
+        | Q(status=Job.RUNNING, locked_at__lt=lease_expired)
+    )
+
+
+def claim(job_id=None):
+    """
+    Mark the next due job (or the given one) running and return it, or None.
+    The conditional UPDATE makes the claim atomic, so several workers can
+    poll the same table without row locks.
+    """
+    due = _due()
+    if job_id is not None:
+        due = due.filter(pk=job_id)
+    for pk in due.order_by('run_at', 'pk').values_list('pk', flat=True)[:10]:
+        claimed = due.filter(pk=pk).update(
+            status=Job.RUNNING,
+            locked_at=timezone.now(),
+            attempts=F('attempts') + 1,
+            updated_at=timezone.now(),
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def retry_delay(attempts):
+    """Seconds to wait before retrying a job that has failed `attempts` times"""
+    base = getattr(settings, 'JOB_RETRY_BACKOFF', 30)
+    cap = getattr(settings, 'JOB_RETRY_BACKOFF_MAX', 60 * 60)
+    return min(base * 2 ** max(0, attempts - 1), cap)
+
+
+def run_job(claimed):
+    """Run a claimed job and record the outcome. Returns True on success."""
+    handler = HANDLERS.get(claimed.name)
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for job {claimed.name}")
+        handler(**claimed.payload)
+    except Exception as e:
+        claimed.last_error = f"{type(e).__name__}: {e}"
+        if claimed.attempts < claimed.max_attempts:
+            delay = retry_delay(claimed.attempts)
+            claimed.status = Job.QUEUED
+            claimed.run_at = timezone.now() + timedelta(seconds=delay)
+            logger.warning(
+                f"Job {claimed.name} #{claimed.pk} failed (attempt {claimed.attempts}/{claimed.max_attempts}), "
+                f"retrying in {delay}s: {claimed.last_error}"
+            )
+        else:
+            claimed.status = Job.FAILED
+            claimed.finished_at = timezone.now()
+            logger.error(f"Job {claimed.name} #{claimed.pk} failed permanently: {claimed.last_error}")
+        claimed.locked_at = None
+        claimed.save(update_fields=['status', 'run_at', 'locked_at', 'finished_at', 'last_error', 'updated_at'])
+        return False
+
+    claimed.status = Job.DONE
+    claimed.locked_at = None
+    claimed.finished_at = timezone.now()
+    claimed.last_error = ''
+    claimed.save(update_fields=['status', 'locked_at', 'finished_at', 'last_error', 'updated_at'])
+    return True
+
+
+def work(burst=False, poll_interval=None, max_jobs=None, should_stop=lambda: False):
+    """
+    Process jobs until should_stop() returns True, max_jobs have run or, in
+    burst mode, no job is due. Returns the number of jobs processed.
+    """
+    if poll_interval is None:
+        poll_interval = getattr(settings, 'JOB_POLL_INTERVAL', 5)
+    client = None if burst else _redis()
+    processed = 0
+    while not should_stop():
+        close_old_connections()
+        claimed = claim()
+        if claimed is None:
+            if burst:
+                break
+            _wait(client, poll_interval)
+            continue
+        run_job(claimed)
+        processed += 1
+        if max_jobs and processed >= max_jobs:
+            break
+    return processed
+
+
+def purge_finished(days=None):
+    """Delete finished jobs older than JOB_RETENTION_DAYS; failed jobs are kept"""
+    if days is None:
+        days = getattr(settings, 'JOB_RETENTION_DAYS', 7)
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = Job.objects.filter(status=Job.DONE, finished_at__lt=cutoff).delete()
+    return deleted
+
+
+def status_summary():
+    """Job counts per status for the dashboard"""
+    counts = dict(Job.objects.values_list('status').annotate(n=Count('pk')))
+    return {status: counts.get(status, 0) for status, _ in Job.STATUS_CHOICES}
+
+
+# Job handlers
+
+@job('article.image_variants')
+def generate_article_image_variants(article_id):
+    article = Article.objects.filter(pk=article_id).first()
+    if article is None:
+        # Deleted while queued
+        return
+    if article.refresh_image_variants() and article.published:
+        # The variants are written with update(), which sends no signals;
+        # pages and validators cached without srcset must go
+        from .signals import article_paths
+
+        invalidate_paths(*article_paths(article))
+        schedule_static_export()
+
+
+@job('article.optimize_image')
+def optimize_article_image(article_id, image_name):
+    article = Article.objects.filter(pk=article_id).first()
+    if article is None or article.image.name != image_name:
+        # Deleted, or given another image (with its own job), while queued
+        return
+    article.optimize_image()
+
+
+@job('articles.rerender')
+def rerender_articles(force=False):
+    call_command('rerender_articles', force=force)
+
+
+@job('site.export')
+def export_static_site():
+    call_command('export_static_site')
+
+
+def schedule_static_export():
+    """Queue an incremental static export after public content changed (STATIC_EXPORT_ENABLED)"""
+    if not getattr(settings, 'STATIC_EXPORT_ENABLED', False):
+        return None
+    # A running export may already have passed the changed pages, so only a
+    # job that has not started yet makes this one redundant
+    pending = Job.objects.filter(name='site.export', status=Job.QUEUED).first()
+    if pending is not None:
+        return pending
+    # The delay lets a burst of edits share one export
+    return enqueue('site.export', delay=getattr(settings, 'STATIC_EXPORT_DELAY', 5))
+
+
+def schedule_image_variants(article):
+    """Queue derivative generation for the article's current image"""
+    # An image that failed for good is not retried on every page view; the
+    # failure stays on the dashboard until a new image is uploaded
+    return enqueue(
+        'article.image_variants',
+        {'article_id': article.pk},
+        dedupe_key=f"article.image_variants:{article.pk}:{article.image.name}",
+        requeue_failed=False,
+    )
+
+
+def schedule_image_optimization(article):
+    """Queue re-encoding of an editor upload (see Article.optimize_image)"""
+    return enqueue(
+        'article.optimize_image',
+        {'article_id': article.pk, 'image_name': article.image.name},
+        dedupe_key=f"article.optimize_image:{article.pk}:{article.image.name}",
+    )
@@ -0,0 +1,217 @@
+"""
+Pre-render the public blog to disk so nginx can serve it with try_files.
+
+Pages are requested through the normal request/response stack as an
+anonymous reader, so the files are exactly what the views would return.
+Each request carries the ETag recorded for that page by the previous export
+(in .export-manifest.json); the conditional GET decorator answers 304 for
+pages whose validators have not changed, so an incremental run only renders
+articles that changed and the listings the signal receivers invalidated
+with them. Pages that are no longer public are deleted; a page that fails to
+render (any status but 200, 304 or 404) keeps its previous file and manifest
+entry, and the run ends with an error once the manifest is written.
+
+A change to the templates or the collected static files invalidates every
+recorded ETag, as the views' validators do not cover them.
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+
+from techblog_cms.models import Article, Category, Tag
+
+MANIFEST_NAME = '.export-manifest.json'
+
+_client = None
+_host = None
+
+
+def public_paths():
+    """URL paths of every page an anonymous reader can reach without a query string"""
+    paths = [reverse('home'), reverse('article_list'), reverse('categories'), reverse('tags')]
+    paths += [
+        reverse('category', kwargs={'slug': slug})
+        for slug in Category.objects.order_by('pk').values_list('slug', flat=True)
+    ]
+    paths += [
+        reverse('tag', kwargs={'slug': slug})
+        for slug in Tag.objects.order_by('pk').values_list('slug', flat=True)
+    ]
+    paths += [
+        reverse('article_detail', kwargs={'slug': slug})
+        for slug in Article.objects.published().order_by('pk').values_list('slug', flat=True)
+    ]
+    return paths
+
+
+def output_file(output, path):
+    """/articles/foo/ -> <output>/articles/foo/index.html"""
+    return Path(output, *[part for part in path.split('/') if part], 'index.html')
+
+
+def build_fingerprint():
+    """Hash of the inputs that views' validators do not track: templates and static files"""
+    digest = hashlib.sha256()
+    # Relative names, so containers mounting the same files elsewhere agree
+    sources = []
+    for directory in settings.TEMPLATES[0]['DIRS']:
+        sources += [(path.relative_to(directory), path) for path in sorted(Path(directory).rglob('*.html'))]
+    static_manifest = static_manifest_path()
+    if static_manifest.exists():
+        sources.append((static_manifest.name, static_manifest))
+    for name, source in sources:
+        digest.update(str(name).encode('utf-8'))
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def static_manifest_path():
+    return Path(settings.STATIC_ROOT, 'staticfiles.json')
+
+
+def _init_worker(host):
+    global _client, _host
+    # Failing views come back as 500 responses instead of aborting the run
+    _client = Client(raise_request_exception=False)
+    _host = host
+
+
+def _write(target, content):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temporary = target.with_name(f".{target.name}.tmp")
+    temporary.write_bytes(content)
+    # Atomic: nginx never serves a half-written page
+    os.replace(temporary, target)
+
+
+def export_page(task):
+    """Render one path; returns (path, state, etag)"""
+    path, etag, output = task
+    headers = {'HTTP_HOST': _host}
+    if etag:
+        headers['HTTP_IF_NONE_MATCH'] = etag
+    response = _client.get(path, secure=True, **headers)
+    if response.status_code == 304:
+        return path, 'unchanged', etag
+    if response.status_code == 404:
+        # Unpublished since the path list was read
+        return path, 'gone', None
+    if response.status_code != 200:
+        return path, f'failed ({response.status_code})', None
+    _write(output_file(output, path), response.content)
+    return path, 'written', response.get('ETag')
+
+
+class Command(BaseCommand):
+    help = 'Render the public pages to static files for nginx, re-rendering only what changed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=getattr(settings, 'STATIC_EXPORT_ROOT', None),
+            help='Directory to write to (default: STATIC_EXPORT_ROOT)'
+        )
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=getattr(settings, 'STATIC_EXPORT_JOBS', 1),
+            help='Number of rendering processes'
+        )
+        parser.add_argument(
+            '--host',
+            default=getattr(settings, 'STATIC_EXPORT_HOST', None),
+            help='Host header for rendered requests (default: first non-wildcard ALLOWED_HOSTS entry)'
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Ignore recorded ETags and re-render every page'
+        )
+
+    def handle(self, *args, **options):
+        output = options['output']
+        if not output:
+            raise CommandError("Set STATIC_EXPORT_ROOT or pass --output")
+        if getattr(settings, 'STATIC_PIPELINE_ENABLED', False) and not static_manifest_path().exists():
+            # Every page would fail to resolve its static URLs
+            raise CommandError(f"{static_manifest_path()} is missing; run collectstatic first")
+        output = Path(output)
+        output.mkdir(parents=True, exist_ok=True)
+        host = options['host'] or next(
+            (h for h in settings.ALLOWED_HOSTS if h and '*' not in h and not h.startswith('.')),
+            'localhost',
+        )
+
+        manifest_path = output / MANIFEST_NAME
+        try:
+            manifest = json.loads(manifest_path.read_text())
+        except (OSError, ValueError):
+            manifest = {}
+        fingerprint = build_fingerprint()
+        etags = manifest.get('pages', {})
+        if options['full'] or manifest.get('fingerprint') != fingerprint:
+            etags = {}
+
+        paths = public_paths()
+        tasks = [(path, etags.get(path), str(output)) for path in paths]
+        jobs = max(1, options['jobs'])
+        if jobs == 1:
+            _init_worker(host)
+            results = [export_page(task) for task in tasks]
+        else:
+            # Children open their own database connections
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=jobs,
+                mp_context=get_context('fork'),
+                initializer=_init_worker,
+                initargs=(host,),
+            ) as executor:
+                results = list(executor.map(export_page, tasks, chunksize=16))
+
+        previous = manifest.get('pages', {})
+        pages = {}
+        counts = {}
+        failed = 0
+        for path, state, etag in results:
+            counts[state] = counts.get(state, 0) + 1
+            if state in ('written', 'unchanged'):
+                pages[path] = etag
+            elif state.startswith('failed'):
+                failed += 1
+                if path in previous:
+                    # Keep serving the last good copy; the next run retries it
+                    pages[path] = previous[path]
+            if options['verbosity'] > 1 and state != 'unchanged':
+                self.stdout.write(f"{state}: {path}")
+
+        removed = 0
+        for path in set(previous) - set(pages):
+            target = output_file(output, path)
+            if target.exists():
+                target.unlink()
+                removed += 1
+            for parent in target.parents:
+                if parent == output:
+                    break
+                try:
+                    parent.rmdir()
+                except OSError:
+                    break
+
+        _write(manifest_path, json.dumps({'fingerprint': fingerprint, 'pages': pages}, indent=1).encode('utf-8'))
+
+        summary = ', '.join(f"{count} {state}" for state, count in sorted(counts.items()))
+        message = f"Exported {len(paths)} pages to {output} ({summary or 'nothing'}, {removed} removed)"
+        if failed:
+            raise CommandError(f"{message}; {failed} pages failed to render and kept their previous copy")
+        self.stdout.write(self.style.SUCCESS(message))
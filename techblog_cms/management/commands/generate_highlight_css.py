@@ -0,0 +1,43 @@
+"""
+Write the code highlighting stylesheet generated from the Markdown renderer's
+Pygments style into the app's static files (run before collectstatic)
+"""
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from techblog_cms.markdown_renderer import highlight_stylesheet
+
+STYLESHEET_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'static', 'css', 'highlight.css',
+)
+
+
+class Command(BaseCommand):
+    help = 'Generate static/css/highlight.css from the configured Pygments style'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Exit with an error if the stylesheet is missing or out of date instead of writing it'
+        )
+
+    def handle(self, *args, **options):
+        css = highlight_stylesheet()
+        try:
+            with open(STYLESHEET_PATH, encoding='utf-8') as handle:
+                current = handle.read()
+        except FileNotFoundError:
+            current = None
+
+        if current == css:
+            self.stdout.write(f"{STYLESHEET_PATH} is up to date")
+            return
+        if options['check']:
+            raise CommandError(f"{STYLESHEET_PATH} is out of date; run `manage.py generate_highlight_css`")
+
+        with open(STYLESHEET_PATH, 'w', encoding='utf-8') as handle:
+            handle.write(css)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {STYLESHEET_PATH}"))
@@ -0,0 +1,42 @@
+"""
+Queue responsive derivatives for article images that have none (or stale ones),
+e.g. images uploaded before derivatives existed
+"""
+from django.core.management.base import BaseCommand
+
+from techblog_cms.jobs import schedule_image_variants
+from techblog_cms.models import Article
+
+
+class Command(BaseCommand):
+    help = 'Queue image derivative generation for articles whose derivatives are missing or stale'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many articles need derivatives'
+        )
+
+    def handle(self, *args, **options):
+        articles = (
+            Article.objects.exclude(image='')
+            .exclude(image__isnull=True)
+            .only('pk', 'image', 'image_variants')
+            .order_by('pk')
+        )
+
+        checked = 0
+        stale = 0
+        for article in articles.iterator(chunk_size=500):
+            checked += 1
+            if article.has_current_image_variants():
+                continue
+            stale += 1
+            if not options['dry_run']:
+                schedule_image_variants(article)
+
+        if options['dry_run']:
+            self.stdout.write(f"{stale} of {checked} article images need derivatives")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Queued derivatives for {stale} of {checked} article images"))
@@ -0,0 +1,82 @@
+"""
+Re-render stored article HTML whose content hash or renderer version is stale
+"""
+from django.core.management.base import BaseCommand
+
+from techblog_cms.jobs import enqueue, schedule_static_export
+from techblog_cms.models import Article
+from techblog_cms.page_cache import invalidate_site
+
+
+class Command(BaseCommand):
+    help = 'Re-render Article.content_html for rows with a stale content hash or renderer version'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Number of articles written per bulk update'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-render every article, even if the stored HTML is current'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many articles are stale'
+        )
+        parser.add_argument(
+            '--background',
+            action='store_true',
+            help='Queue the re-render for `manage.py worker` and return immediately'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        force = options['force']
+        dry_run = options['dry_run']
+
+        if options['background'] and not dry_run:
+            queued = enqueue('articles.rerender', {'force': force}, dedupe_key='articles.rerender')
+            self.stdout.write(self.style.SUCCESS(f"Queued re-render as job #{queued.pk}"))
+            return
+
+        articles = Article.objects.only(
+            'pk', 'content', *Article.RENDERED_FIELDS
+        ).order_by('pk')
+
+        checked = 0
+        stale = 0
+        batch = []
+        for article in articles.iterator(chunk_size=batch_size):
+            checked += 1
+            if force:
+                article.renderer_version = 0
+            if article.has_current_rendering():
+                continue
+            stale += 1
+            if dry_run:
+                continue
+            article.refresh_rendered_content()
+            batch.append(article)
+            if len(batch) >= batch_size:
+                Article.objects.bulk_update(batch, Article.RENDERED_FIELDS)
+                batch = []
+
+        if batch:
+            Article.objects.bulk_update(batch, Article.RENDERED_FIELDS)
+        if stale and not dry_run:
+            # bulk_update() sends no signals: drop cached pages and validators,
+            # then let the static export pick up the new ETags
+            invalidate_site()
+            schedule_static_export()
+
+        if dry_run:
+            self.stdout.write(f"{stale} of {checked} articles need re-rendering")
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f"Re-rendered {stale} of {checked} articles")
+            )
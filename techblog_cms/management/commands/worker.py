@@ -0,0 +1,53 @@
+"""
+Run background jobs (image derivatives, re-rendering) from the Job queue
+"""
+import signal
+
+from django.core.management.base import BaseCommand
+
+from techblog_cms.jobs import purge_finished, work
+
+
+class Command(BaseCommand):
+    help = 'Process queued background jobs until stopped (SIGTERM/SIGINT finish the current job first)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Exit once no job is due instead of waiting for new ones'
+        )
+        parser.add_argument(
+            '--max-jobs',
+            type=int,
+            default=0,
+            help='Exit after processing this many jobs (0 = no limit)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=None,
+            help='Seconds between database polls when idle (default: JOB_POLL_INTERVAL)'
+        )
+
+    def handle(self, *args, **options):
+        stopping = []
+
+        def request_stop(signum, frame):
+            self.stdout.write("Stopping after the current job...")
+            stopping.append(signum)
+
+        signal.signal(signal.SIGTERM, request_stop)
+        signal.signal(signal.SIGINT, request_stop)
+
+        purged = purge_finished()
+        if purged:
+            self.stdout.write(f"Purged {purged} finished jobs")
+
+        processed = work(
+            burst=options['burst'],
+            poll_interval=options['poll_interval'],
+            max_jobs=options['max_jobs'],
+            should_stop=lambda: bool(stopping),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} jobs"))
@@ -0,0 +1,74 @@
+"""
+Custom Python-Markdown extensions used by the article renderer
+"""
+from xml.etree import ElementTree
+
+from linkify_it import LinkifyIt
+from markdown.extensions import Extension
+from markdown.treeprocessors import Treeprocessor
+
+
+class LinkifyTreeprocessor(Treeprocessor):
+    """Wrap plain URLs found in text nodes with <a> elements"""
+
+    # Text inside these elements is left untouched
+    SKIP_TAGS = {'a', 'code', 'pre', 'script', 'style'}
+
+    def __init__(self, md=None):
+        super().__init__(md)
+        self.linkify = LinkifyIt()
+
+    def run(self, root):
+        self._walk(root)
+
+    def _walk(self, element):
+        if element.tag in self.SKIP_TAGS:
+            return
+
+        index = 0
+        if element.text:
+            head, anchors = self._split(element.text)
+            if anchors:
+                element.text = head
+                for anchor in anchors:
+                    element.insert(index, anchor)
+                    index += 1
+
+        while index < len(element):
+            child = element[index]
+            self._walk(child)
+            index += 1
+            if child.tail:
+                head, anchors = self._split(child.tail)
+                if anchors:
+                    child.tail = head
+                    for anchor in anchors:
+                        element.insert(index, anchor)
+                        index += 1
+
+    def _split(self, text):
+        """Return (leading_text, [anchor elements]) for the links found in text"""
+        matches = self.linkify.match(text)
+        if not matches:
+            return text, []
+
+        anchors = []
+        for position, match in enumerate(matches):
+            anchor = ElementTree.Element('a', {'href': match.url})
+            anchor.text = match.text
+            end = matches[position + 1].index if position + 1 < len(matches) else len(text)
+            anchor.tail = text[match.last_index:end]
+            anchors.append(anchor)
+        return text[:matches[0].index], anchors
+
+
+class LinkifyExtension(Extension):
+    """Auto-link plain URLs, www. hosts and e-mail addresses"""
+
+    def extendMarkdown(self, md):
+        # Run after inline patterns so existing links and code spans are already elements
+        md.treeprocessors.register(LinkifyTreeprocessor(md), 'linkify', 15)
+
+
+def makeExtension(**kwargs):
+    return LinkifyExtension(**kwargs)
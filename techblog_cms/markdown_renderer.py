@@ -0,0 +1,250 @@
+"""
+Markdown rendering pipeline shared by the template filter, the editor preview
+and the stored Article.content_html
+"""
+import hashlib
+import logging
+import queue
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import markdown
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the extension list or configuration below changes the output,
+# so stored Article.content_html is treated as stale and re-rendered.
+RENDERER_VERSION = 1
+
+MARKDOWN_EXTENSIONS = [
+    'extra',           # Extra features like tables, footnotes, and raw HTML
+    'codehilite',      # Code highlighting with Pygments
+    'toc',             # Table of contents
+    'fenced_code',     # Fenced code blocks
+    'nl2br',           # Convert newlines to <br>
+    'techblog_cms.markdown_extensions',  # Auto-link plain URLs
+]
+
+MARKDOWN_EXTENSION_CONFIGS = {
+    'codehilite': {
+        'linenums': False,  # Disable line numbers
+        'guess_lang': True,  # Guess language if not specified
+        'css_class': 'highlight',  # CSS class for code blocks
+        'pygments_style': 'github-dark',  # Use GitHub-like dark theme
+    }
+}
+
+
+# Part of every render cache key, so a configuration change never serves old HTML
+CONFIG_FINGERPRINT = hashlib.sha256(
+    repr((RENDERER_VERSION, MARKDOWN_EXTENSIONS, sorted(
+        (name, sorted(options.items())) for name, options in MARKDOWN_EXTENSION_CONFIGS.items()
+    ))).encode('utf-8')
+).hexdigest()[:16]
+
+
+# Wrapper class codehilite puts around highlighted blocks; its presence in
+# rendered HTML is what decides whether a page links the highlight stylesheet
+HIGHLIGHT_MARKER = f'class="{MARKDOWN_EXTENSION_CONFIGS["codehilite"]["css_class"]}"'
+
+# Layout of highlighted blocks, appended to the generated Pygments rules
+HIGHLIGHT_BLOCK_CSS = """
+.{css_class} pre {{
+    background-color: {background} !important;
+    border-radius: 6px;
+    padding: 16px !important;
+    margin: 16px 0 !important;
+    overflow-x: auto;
+    border: 1px solid #30363d;
+}}
+"""
+
+
+def has_highlighted_code(html):
+    return HIGHLIGHT_MARKER in (html or '')
+
+
+def highlight_stylesheet():
+    """
+    CSS for codehilite output, generated from the configured Pygments style.
+    Written to static/css/highlight.css by `manage.py generate_highlight_css`.
+    """
+    from pygments.formatters import HtmlFormatter
+
+    options = MARKDOWN_EXTENSION_CONFIGS['codehilite']
+    css_class = options['css_class']
+    formatter = HtmlFormatter(style=options['pygments_style'])
+    return (
+        f"/* Generated by `manage.py generate_highlight_css` from the Pygments "
+        f"\"{options['pygments_style']}\" style; do not edit. */\n"
+        f"{formatter.get_style_defs(f'.{css_class}')}\n"
+        f"{HIGHLIGHT_BLOCK_CSS.format(css_class=css_class, background=formatter.style.background_color)}"
+    )
+
+
+def content_hash(text):
+    """Return the SHA-256 hex digest used to detect stale rendered content"""
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+
+
+def build_markdown():
+    """Create a Markdown instance with the production extension set"""
+    return markdown.Markdown(
+        extensions=MARKDOWN_EXTENSIONS,
+        extension_configs=MARKDOWN_EXTENSION_CONFIGS,
+    )
+
+
+class MarkdownRendererPool:
+    """
+    Thread-safe pool of pre-configured Markdown instances.
+
+    A Markdown instance keeps per-document state (toc, footnotes, html stash)
+    and must not be shared between threads while converting, so each render
+    checks one out, converts, resets it and hands it back. Building the
+    instance (extension loading, regex compilation) only happens when the
+    pool is empty.
+    """
+
+    def __init__(self, max_idle=8, factory=build_markdown):
+        self.max_idle = max_idle
+        self.factory = factory
+        self._idle = queue.LifoQueue()
+
+    @contextmanager
+    def renderer(self):
+        try:
+            md = self._idle.get_nowait()
+        except queue.Empty:
+            md = self.factory()
+        try:
+            yield md
+        finally:
+            md.reset()
+            if self._idle.qsize() < self.max_idle:
+                self._idle.put_nowait(md)
+
+    def render(self, text):
+        with self.renderer() as md:
+            return md.convert(text)
+
+    def clear(self):
+        """Drop idle instances, e.g. after changing the extension configuration"""
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                return
+
+
+class RenderCache:
+    """
+    Two-tier cache for rendered HTML.
+
+    The local tier is a per-process LRU bounded by MARKDOWN_RENDER_CACHE_MAX_BYTES;
+    the shared tier is CACHES['default'] (Redis), so gunicorn workers share
+    renders. Shared-tier errors are logged and treated as misses.
+    """
+
+    def __init__(self, alias='default'):
+        self.alias = alias
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text):
+        return f"markdown:{CONFIG_FINGERPRINT}:{content_hash(text)}"
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.local_hits += 1
+                return entry[0]
+
+        try:
+            html = caches[self.alias].get(key)
+        except Exception as e:
+            logger.warning(f"Markdown render cache read failed: {e}")
+            html = None
+
+        if html is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.shared_hits += 1
+        self._store_local(key, html)
+        return html
+
+    def set(self, key, html):
+        self._store_local(key, html)
+        timeout = getattr(settings, 'MARKDOWN_RENDER_CACHE_TIMEOUT', 24 * 60 * 60)
+        try:
+            caches[self.alias].set(key, html, timeout)
+        except Exception as e:
+            logger.warning(f"Markdown render cache write failed: {e}")
+
+    def _store_local(self, key, html):
+        max_bytes = getattr(settings, 'MARKDOWN_RENDER_CACHE_MAX_BYTES', 8 * 1024 * 1024)
+        size = len(html.encode('utf-8'))
+        if size > max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[key] = (html, size)
+            self._size += size
+            while self._size > max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def clear(self):
+        """Empty the local tier and reset counters (the shared tier expires by TTL)"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.local_hits = self.shared_hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'local_hits': self.local_hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+            }
+
+
+renderer_pool = MarkdownRendererPool()
+render_cache = RenderCache()
+
+
+def render_markdown(text):
+    """
+    Render markdown text to an HTML string (not marked safe)
+    """
+    if not text:
+        return ''
+
+    if not getattr(settings, 'MARKDOWN_RENDER_CACHE_ENABLED', True):
+        return renderer_pool.render(text)
+
+    key = render_cache.make_key(text)
+    html = render_cache.get(key)
+    if html is None:
+        # Convert markdown to HTML with Pygments for syntax highlighting
+        html = renderer_pool.render(text)
+        render_cache.set(key, html)
+    return html
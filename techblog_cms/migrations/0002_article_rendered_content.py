@@ -0,0 +1,48 @@
+# Generated by Django 4.2.10 on 2026-10-18 16:14
+
+from django.db import migrations, models
+
+
+def render_existing_articles(apps, schema_editor):
+    # Fill the new columns so existing articles do not fall back to live
+    # rendering until `manage.py rerender_articles` is run
+    from techblog_cms.markdown_renderer import RENDERER_VERSION, content_hash, render_markdown
+
+    Article = apps.get_model('techblog_cms', 'Article')
+    batch = []
+    for article in Article.objects.only('pk', 'content').order_by('pk').iterator(chunk_size=200):
+        article.content_html = render_markdown(article.content)
+        article.content_hash = content_hash(article.content)
+        article.renderer_version = RENDERER_VERSION
+        batch.append(article)
+        if len(batch) >= 200:
+            Article.objects.bulk_update(batch, ['content_html', 'content_hash', 'renderer_version'])
+            batch = []
+    if batch:
+        Article.objects.bulk_update(batch, ['content_html', 'content_hash', 'renderer_version'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('techblog_cms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='renderer_version',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(render_existing_articles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('techblog_cms', '0002_article_rendered_content'),
+    ]
+
+    operations = [
+        # Article.tags gains an explicit through model so its table can carry
+        # a (tag_id, article_id) index. The table itself already exists under
+        # the same name, so only the migration state changes here.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='ArticleTag',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='techblog_cms.article')),
+                        ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='techblog_cms.tag')),
+                    ],
+                    options={
+                        'db_table': 'techblog_cms_article_tags',
+                        'unique_together': {('article', 'tag')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='article',
+                    name='tags',
+                    field=models.ManyToManyField(blank=True, through='techblog_cms.ArticleTag', to='techblog_cms.tag'),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(
+                condition=models.Q(('published', True)),
+                fields=['-created_at', '-id'],
+                name='article_published_feed_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(
+                condition=models.Q(('published', True)),
+                fields=['category', '-created_at', '-id'],
+                name='article_category_feed_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='articletag',
+            index=models.Index(fields=['tag', 'article'], name='article_tags_tag_article_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    from techblog_cms.search import install_search_index
+
+    install_search_index(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    from techblog_cms.search import uninstall_search_index
+
+    uninstall_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('techblog_cms', '0005_job'),
+    ]
+
+    operations = [
+        # PostgreSQL: trigger-maintained tsvector column + partial GIN index;
+        # SQLite: FTS5 table + triggers. See techblog_cms/search.py.
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.10 on 2026-10-18 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('techblog_cms', '0006_article_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='image_optimization',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
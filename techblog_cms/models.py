@@ -1,13 +1,31 @@
+import logging
 import uuid
 from django.db import models
+from django.utils import timezone
 from django.utils.text import slugify
 from django.urls import reverse
+from django.utils.safestring import mark_safe
+from PIL import Image
+
+from techblog_cms.images import delete_variants, generate_variants, optimize_upload
+from techblog_cms.markdown_renderer import RENDERER_VERSION, content_hash, has_highlighted_code, render_markdown
+
+logger = logging.getLogger(__name__)
+
+class CategoryQuerySet(models.QuerySet):
+    def with_article_counts(self, published_only=True):
+        """Annotate num_articles in the same query instead of one COUNT per row"""
+        condition = models.Q(article__published=True) if published_only else None
+        return self.annotate(num_articles=models.Count('article', filter=condition))
+
 
 class Category(models.Model):
     name = models.CharField(max_length=100)
     slug = models.SlugField(unique=True)
     description = models.TextField(blank=True)
 
+    objects = CategoryQuerySet.as_manager()
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
@@ -19,9 +37,6 @@ class Category(models.Model):
     def get_absolute_url(self):
         return reverse('category', kwargs={'slug': self.slug})
 
-    def article_count(self):
-        return self.article_set.count()
-
     class Meta:
         verbose_name_plural = "categories"
 
@@ -40,6 +55,15 @@ class Tag(models.Model):
     def get_absolute_url(self):
         return reverse('tag', kwargs={'slug': self.slug})
 
+class ArticleQuerySet(models.QuerySet):
+    def published(self):
+        return self.filter(published=True)
+
+    def for_listing(self):
+        """Newest first (id breaks ties for keyset pagination), with the category joined in"""
+        return self.select_related('category').order_by('-created_at', '-id')
+
+
 class Article(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(unique=True)
@@ -49,8 +73,21 @@ class Article(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     published = models.BooleanField(default=False)
     category = models.ForeignKey(Category, on_delete=models.PROTECT)
-    tags = models.ManyToManyField(Tag, blank=True)
+    tags = models.ManyToManyField(Tag, blank=True, through='ArticleTag')
     image = models.ImageField(upload_to='articles/', blank=True, null=True)
+    # Pre-rendered Markdown, refreshed on save and by `manage.py rerender_articles`
+    content_html = models.TextField(blank=True, editable=False)
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
+    renderer_version = models.PositiveSmallIntegerField(default=0, editable=False)
+    # Resized WebP/original-format copies of `image`, see techblog_cms/images.py
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # {'pending': True} until the background job has re-encoded an editor
+    # upload, then its images.optimize_upload() report (or {'failed': ...})
+    image_optimization = models.JSONField(default=dict, blank=True, editable=False)
+
+    RENDERED_FIELDS = ('content_html', 'content_hash', 'renderer_version')
+
+    objects = ArticleQuerySet.as_manager()
 
     def _generate_unique_slug(self):
         slug_field = self._meta.get_field('slug')
@@ -76,11 +113,95 @@ class Article(models.Model):
             if not Article.objects.filter(slug=candidate).exclude(pk=self.pk).exists():
                 return candidate
 
+    def has_current_rendering(self):
+        """True when content_html matches the current content and renderer"""
+        return (
+            self.renderer_version == RENDERER_VERSION
+            and self.content_hash == content_hash(self.content)
+        )
+
+    def refresh_rendered_content(self):
+        """Re-render content_html if it is stale. Returns True when it changed."""
+        if self.has_current_rendering():
+            return False
+        self.content_html = render_markdown(self.content)
+        self.content_hash = content_hash(self.content)
+        self.renderer_version = RENDERER_VERSION
+        return True
+
+    def rendered_content(self):
+        """
+        Stored HTML, or a live rendering when the stored copy is stale; the
+        live rendering is kept on the instance so a page that needs the HTML
+        more than once (has_highlighted_code, the body) converts it once
+        """
+        if self.has_current_rendering():
+            return mark_safe(self.content_html)
+        live = getattr(self, '_live_rendering', None)
+        if live is None or live[0] != self.content:
+            live = self._live_rendering = (self.content, render_markdown(self.content))
+        return mark_safe(live[1])
+
+    def has_highlighted_code(self):
+        """True when the rendered content needs the code highlighting stylesheet"""
+        return has_highlighted_code(self.rendered_content())
+
+    def has_current_image_variants(self):
+        if not self.image:
+            return not self.image_variants
+        return self.image_variants.get('source') == self.image.name
+
+    def refresh_image_variants(self):
+        """Regenerate image derivatives if the image changed. Returns True when they changed."""
+        if self.has_current_image_variants():
+            return False
+        previous = self.image_variants
+        self.image_variants = generate_variants(self.image) if self.image else {}
+        delete_variants(self.image.storage, previous, keep=self.image_variants)
+        # Written directly so derivative bookkeeping does not bump updated_at
+        Article.objects.filter(pk=self.pk).update(image_variants=self.image_variants)
+        return True
+
+    def optimize_image(self):
+        """
+        Replace the stored image with its images.optimize_upload() encoding
+        and save the report in image_optimization. Saved with signals, so the
+        derivatives and cached pages follow the new file.
+        """
+        previous = self.image.name
+        try:
+            with self.image.open('rb') as source:
+                optimized, report = optimize_upload(source)
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            logger.warning(f"Image optimization failed, keeping {previous} as uploaded: {e}")
+            self.image_optimization = {'failed': str(e)}
+        else:
+            if optimized is not source:
+                self.image.save(optimized.name, optimized, save=False)
+                self.image.storage.delete(previous)
+            logger.info(
+                f"Optimized {previous}: {report['original_bytes']} -> {report['bytes']} bytes "
+                f"({report['saved_bytes']} saved, {report['format']} {report['width']}x{report['height']}"
+                f"{', resized' if report['resized'] else ''})"
+            )
+            if report['over_budget']:
+                logger.warning(
+                    f"{self.image.name} is still {report['bytes']} bytes, over ARTICLE_IMAGE_BYTE_BUDGET "
+                    f"({report['format']} images are only resized when lossy)"
+                )
+            self.image_optimization = report
+        self.save(update_fields=['image', 'image_optimization', 'updated_at'])
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = self._generate_unique_slug()
         if not self.excerpt and self.content:
             self.excerpt = self.content[:200]
+        if self.refresh_rendered_content():
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | set(self.RENDERED_FIELDS)
+        # Image derivatives are generated by a background job, see signals.py
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -88,3 +209,70 @@ class Article(models.Model):
 
     def get_absolute_url(self):
         return reverse('article_detail', kwargs={'slug': self.slug})
+
+    class Meta:
+        indexes = [
+            # Home/article list/feeds: published=True ORDER BY created_at DESC, id DESC
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='article_published_feed_idx',
+                condition=models.Q(published=True),
+            ),
+            # Category pages: category_id = X AND published=True ORDER BY created_at DESC
+            models.Index(
+                fields=['category', '-created_at', '-id'],
+                name='article_category_feed_idx',
+                condition=models.Q(published=True),
+            ),
+        ]
+
+
+class ArticleTag(models.Model):
+    """Article/Tag link table (keeps the auto-created table name)"""
+    article = models.ForeignKey(Article, on_delete=models.CASCADE)
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = 'techblog_cms_article_tags'
+        unique_together = [('article', 'tag')]
+        indexes = [
+            # Tag pages: tag_id = X joined to article ids without touching the heap
+            models.Index(fields=['tag', 'article'], name='article_tags_tag_article_idx'),
+        ]
+
+
+class Job(models.Model):
+    """A unit of background work, run by `manage.py worker` (see techblog_cms/jobs.py)"""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, '待機中'),
+        (RUNNING, '実行中'),
+        (DONE, '完了'),
+        (FAILED, '失敗'),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    # Jobs sharing a key are not queued twice (e.g. one per article image)
+    dedupe_key = models.CharField(max_length=255, blank=True, db_index=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+    class Meta:
+        indexes = [
+            # Worker polling: status = 'queued' AND run_at <= now ORDER BY run_at
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'),
+        ]
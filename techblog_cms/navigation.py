@@ -0,0 +1,47 @@
+"""
+Cached sidebar navigation (categories and tags) shared by every public page
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Category, Tag
+
+logger = logging.getLogger(__name__)
+
+NAVIGATION_CACHE_KEY = 'navigation:v2'
+
+
+def build_navigation():
+    """Query the sidebar data as plain dicts so it can be pickled into the cache"""
+    return {
+        'categories': list(
+            Category.objects.with_article_counts().order_by('name').values('name', 'slug', 'num_articles')
+        ),
+        'tags': list(Tag.objects.order_by('name').values('name', 'slug')),
+    }
+
+
+def get_navigation():
+    try:
+        navigation = cache.get(NAVIGATION_CACHE_KEY)
+    except Exception as e:
+        logger.warning(f"Navigation cache read failed: {e}")
+        return build_navigation()
+
+    if navigation is None:
+        navigation = build_navigation()
+        timeout = getattr(settings, 'NAVIGATION_CACHE_TIMEOUT', 60 * 60)
+        try:
+            cache.set(NAVIGATION_CACHE_KEY, navigation, timeout)
+        except Exception as e:
+            logger.warning(f"Navigation cache write failed: {e}")
+    return navigation
+
+
+def invalidate_navigation():
+    try:
+        cache.delete(NAVIGATION_CACHE_KEY)
+    except Exception as e:
+        logger.warning(f"Navigation cache invalidation failed: {e}")
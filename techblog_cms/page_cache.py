@@ -0,0 +1,169 @@
+"""
+Full-page response cache for anonymous readers.
+
+Responses are stored in CACHES['default'] under a key made of the request
+path, a hash of the query string and two generation tokens: one per path and
+one site-wide. Invalidating a path (or the whole site) just replaces its
+token, so every cached variant of that page (?page=2, ?after=...) is dropped
+at once without tracking individual keys. The signal receivers in
+techblog_cms/signals.py decide which paths an edit affects.
+
+Opt in with PAGE_CACHE_ENABLED = True; responses carry X-Cache: HIT/MISS
+(or BYPASS for signed-in users, who can see drafts). Async views get an
+async wrapper that runs the cache I/O in a thread.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+SITE_GENERATION_KEY = 'page:gen:site'
+
+
+def _path_generation_key(path):
+    return f"page:gen:path:{hashlib.sha256(path.encode('utf-8')).hexdigest()}"
+
+
+def _new_generation():
+    # Microsecond timestamp (hex) plus a random suffix; the timestamp doubles
+    # as the Last-Modified contribution of an invalidation
+    return f"{int(time.time() * 1_000_000):x}.{uuid.uuid4().hex[:6]}"
+
+
+def generation_time(generation):
+    """Unix timestamp at which a generation token was issued"""
+    try:
+        return int(generation.split('.', 1)[0], 16) / 1_000_000
+    except (AttributeError, ValueError):
+        return 0
+
+
+def generations(path):
+    """Return the (site, path) generation tokens, creating missing ones"""
+    keys = [SITE_GENERATION_KEY, _path_generation_key(path)]
+    found = cache.get_many(keys)
+    tokens = []
+    for key in keys:
+        value = found.get(key)
+        if value is None:
+            cache.add(key, _new_generation(), None)
+            value = cache.get(key)
+        tokens.append(value)
+    return tokens
+
+
+def page_cache_key(request):
+    site_generation, path_generation = generations(request.path)
+    query = hashlib.sha256(request.META.get('QUERY_STRING', '').encode('utf-8')).hexdigest()
+    return f"page:{site_generation}:{path_generation}:{request.path}:{query}"
+
+
+def invalidate_paths(*paths):
+    """Drop every cached variant of the given URL paths"""
+    try:
+        cache.set_many({_path_generation_key(path): _new_generation() for path in paths}, None)
+    except Exception as e:
+        logger.warning(f"Page cache invalidation failed: {e}")
+
+
+def invalidate_site():
+    """Drop every cached page, e.g. when sidebar categories/tags change"""
+    try:
+        cache.set(SITE_GENERATION_KEY, _new_generation(), None)
+    except Exception as e:
+        logger.warning(f"Page cache invalidation failed: {e}")
+
+
+def _lookup(request):
+    """Return (key, cached HIT response or None); key is None when the cache is unreachable"""
+    try:
+        key = page_cache_key(request)
+        cached = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Page cache read failed: {e}")
+        return None, None
+
+    if cached is None:
+        return key, None
+    content, content_type = cached
+    response = HttpResponse(content, content_type=content_type)
+    response['X-Cache'] = 'HIT'
+    return key, response
+
+
+def _store(key, response):
+    if response.status_code == 200 and not response.streaming and not response.cookies:
+        timeout = getattr(settings, 'PAGE_CACHE_TIMEOUT', 300)
+        try:
+            cache.set(key, (response.content, response['Content-Type']), timeout)
+        except Exception as e:
+            logger.warning(f"Page cache write failed: {e}")
+    response['X-Cache'] = 'MISS'
+    return response
+
+
+def _is_authenticated(request):
+    return request.user.is_authenticated
+
+
+async def ais_authenticated(request):
+    """request.user.is_authenticated for async views: the lazy user is loaded from the session in a thread"""
+    return await sync_to_async(_is_authenticated)(request)
+
+
+def _applies(request):
+    return getattr(settings, 'PAGE_CACHE_ENABLED', False) and request.method in ('GET', 'HEAD')
+
+
+def anonymous_page_cache(view_func):
+    """Serve and store rendered GET responses for anonymous users (sync or async views)"""
+
+    if asyncio.iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            if not _applies(request):
+                return await view_func(request, *args, **kwargs)
+
+            if await ais_authenticated(request):
+                response = await view_func(request, *args, **kwargs)
+                response['X-Cache'] = 'BYPASS'
+                return response
+
+            key, cached = await sync_to_async(_lookup)(request)
+            if cached is not None:
+                return cached
+            response = await view_func(request, *args, **kwargs)
+            if key is None:
+                return response
+            return await sync_to_async(_store)(key, response)
+
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not _applies(request):
+            return view_func(request, *args, **kwargs)
+
+        if request.user.is_authenticated:
+            response = view_func(request, *args, **kwargs)
+            response['X-Cache'] = 'BYPASS'
+            return response
+
+        key, cached = _lookup(request)
+        if cached is not None:
+            return cached
+        response = view_func(request, *args, **kwargs)
+        if key is None:
+            return response
+        return _store(key, response)
+
+    return wrapper
@@ -0,0 +1,158 @@
+"""
+Pagination for public article listings.
+
+Two modes share one template block (components/pagination.html):
+
+- ``?page=N`` uses Django's Paginator (COUNT + OFFSET) and emits numbered links.
+- ``?after=<created_at>,<id>`` is keyset (cursor) mode. It filters on the
+  (created_at, id) ordering instead of OFFSET, so deep pages cost the same as
+  the first one. "Next" links always use the cursor of the last row shown.
+"""
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+# Number of page links shown either side of the current page
+PAGE_LINK_WINDOW = 2
+
+
+def encode_cursor(article):
+    return f"{article.created_at.isoformat()},{article.pk}"
+
+
+def decode_cursor(value):
+    """Return (created_at, pk) or None for a malformed cursor"""
+    if not value or ',' not in value:
+        return None
+    created_at, _, pk = value.rpartition(',')
+    try:
+        # Well-formed but impossible dates (month 13) raise ValueError too
+        created_at = parse_datetime(created_at)
+        pk = int(pk)
+    except ValueError:
+        return None
+    if created_at is None:
+        return None
+    return created_at, pk
+
+
+def after_cursor(queryset, cursor):
+    """Rows strictly after cursor in (-created_at, -id) order"""
+    created_at, pk = cursor
+    return queryset.filter(
+        Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+    )
+
+
+def paginate_articles(request, queryset, per_page=None, with_count=False):
+    """
+    Paginate a queryset ordered by (-created_at, -id).
+
+    Returns a context dict with ``articles`` (the rows for this page) plus the
+    values used by components/pagination.html. ``total`` is the number of
+    rows in the whole queryset; cursor pages only count them when
+    ``with_count`` is set, and leave it None otherwise.
+    """
+    per_page = per_page or getattr(settings, 'ARTICLE_PAGE_SIZE', 10)
+    cursor = decode_cursor(request.GET.get('after'))
+
+    if cursor:
+        rows = list(after_cursor(queryset, cursor)[:per_page + 1])
+        total = queryset.count() if with_count else None
+        return _cursor_context(request, rows, per_page, total)
+
+    paginator = Paginator(queryset, per_page)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    return _numbered_context(request, page_obj, list(page_obj.object_list))
+
+
+async def apaginate_articles(request, queryset, per_page=None, with_count=False):
+    """paginate_articles() for async views, querying through the async ORM"""
+    per_page = per_page or getattr(settings, 'ARTICLE_PAGE_SIZE', 10)
+    cursor = decode_cursor(request.GET.get('after'))
+
+    if cursor:
+        rows = [row async for row in after_cursor(queryset, cursor)[:per_page + 1]]
+        total = await queryset.acount() if with_count else None
+        return _cursor_context(request, rows, per_page, total)
+
+    paginator = Paginator(queryset, per_page)
+    # Counted up front so get_page() does not query from the event loop
+    paginator.count = await queryset.acount()
+    page_obj = paginator.get_page(request.GET.get('page'))
+    page_obj.object_list = [row async for row in page_obj.object_list]
+    return _numbered_context(request, page_obj, page_obj.object_list)
+
+
+def _cursor_context(request, rows, per_page, total=None):
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
+    return {
+        'articles': rows,
+        'total': total,
+        'page_obj': None,
+        'pagination': [],
+        'current_page': None,
+        'first_url': request.path,
+        'previous_url': None,
+        'next_url': _query_url(request, after=encode_cursor(rows[-1])) if has_next else None,
+    }
+
+
+def _numbered_context(request, page_obj, rows):
+    paginator = page_obj.paginator
+    first = max(1, page_obj.number - PAGE_LINK_WINDOW)
+    last = min(paginator.num_pages, page_obj.number + PAGE_LINK_WINDOW)
+
+    previous_url = None
+    if page_obj.has_previous():
+        previous_url = _query_url(request, page=page_obj.previous_page_number())
+
+    return {
+        'articles': rows,
+        'total': paginator.count,
+        'page_obj': page_obj,
+        'pagination': list(range(first, last + 1)) if paginator.num_pages > 1 else [],
+        'current_page': page_obj.number,
+        'first_url': None,
+        'previous_url': previous_url,
+        'next_url': _query_url(request, after=encode_cursor(rows[-1])) if page_obj.has_next() else None,
+    }
+
+
+def paginate_search(request, results, per_page=None):
+    """
+    Numbered pages over ranked search results (techblog_cms.search), with
+    ?q= carried into every link. Keyset mode does not apply: results are
+    ordered by rank, not by (created_at, id).
+    """
+    per_page = per_page or getattr(settings, 'ARTICLE_PAGE_SIZE', 10)
+    paginator = Paginator(results, per_page)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    first = max(1, page_obj.number - PAGE_LINK_WINDOW)
+    last = min(paginator.num_pages, page_obj.number + PAGE_LINK_WINDOW)
+    query = {'q': results.query}
+
+    return {
+        'articles': list(page_obj.object_list),
+        'page_obj': page_obj,
+        'pagination': list(range(first, last + 1)) if paginator.num_pages > 1 else [],
+        'current_page': page_obj.number,
+        'page_query': urlencode(query),
+        'first_url': None,
+        'previous_url': (
+            _query_url(request, **query, page=page_obj.previous_page_number())
+            if page_obj.has_previous() else None
+        ),
+        'next_url': (
+            _query_url(request, **query, page=page_obj.next_page_number())
+            if page_obj.has_next() else None
+        ),
+    }
+
+
+def _query_url(request, **params):
+    return f"{request.path}?{urlencode(params)}"
@@ -0,0 +1,306 @@
+"""
+Full-text search over published articles.
+
+The index lives next to the Article table rather than on the model:
+
+- PostgreSQL: a ``search_vector`` tsvector column (title weighted A, excerpt
+  B, content C) kept current by a BEFORE INSERT/UPDATE trigger, with a
+  partial GIN index over published rows. Queries use websearch_to_tsquery,
+  ts_rank_cd and ts_headline.
+- SQLite (tests, local runs): an external-content FTS5 table kept in sync by
+  AFTER INSERT/UPDATE/DELETE triggers, ranked with bm25() and excerpted with
+  snippet().
+
+install_search_index() creates either set idempotently. Migration 0006 runs
+it, and so does post_migrate (see apps.py), which covers test databases built
+without migrations and SQLite table rebuilds that drop triggers.
+
+ArticleSearch exposes count() and slicing, so Django's Paginator can page it;
+snippets are computed only for the rows on the requested page.
+"""
+import html
+import re
+
+from django.conf import settings
+from django.db import NotSupportedError, connection
+from django.utils.safestring import mark_safe
+
+from .models import Article
+
+ARTICLE_TABLE = Article._meta.db_table
+FTS_TABLE = f"{ARTICLE_TABLE}_fts"
+
+# Highlight delimiters handed to the database; the snippet text is escaped
+# before they are turned into <mark> tags
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+# Longest query string accepted from users
+MAX_QUERY_LENGTH = 200
+
+SNIPPET_WORDS = 24
+
+
+def _search_config():
+    config = getattr(settings, 'SEARCH_CONFIG', 'simple')
+    if not re.fullmatch(r'[a-z_]+', config):
+        raise ValueError(f"Invalid text search configuration: {config!r}")
+    return config
+
+
+def _postgresql_install_sql():
+    config = _search_config()
+    return [
+        f"ALTER TABLE {ARTICLE_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector",
+        f"""
+        CREATE OR REPLACE FUNCTION {ARTICLE_TABLE}_search_vector() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('{config}', coalesce(NEW.title, '')), 'A') ||
+                setweight(to_tsvector('{config}', coalesce(NEW.excerpt, '')), 'B') ||
+                setweight(to_tsvector('{config}', coalesce(NEW.content, '')), 'C');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        f"DROP TRIGGER IF EXISTS {ARTICLE_TABLE}_search_vector_update ON {ARTICLE_TABLE}",
+        f"""
+        CREATE TRIGGER {ARTICLE_TABLE}_search_vector_update
+        BEFORE INSERT OR UPDATE OF title, excerpt, content ON {ARTICLE_TABLE}
+        FOR EACH ROW EXECUTE FUNCTION {ARTICLE_TABLE}_search_vector()
+        """,
+        # Backfill through the trigger
+        f"UPDATE {ARTICLE_TABLE} SET title = title WHERE search_vector IS NULL",
+        f"""
+        CREATE INDEX IF NOT EXISTS article_search_vector_idx
+        ON {ARTICLE_TABLE} USING GIN (search_vector) WHERE published
+        """,
+    ]
+
+
+def _postgresql_uninstall_sql():
+    return [
+        f"DROP TRIGGER IF EXISTS {ARTICLE_TABLE}_search_vector_update ON {ARTICLE_TABLE}",
+        f"DROP FUNCTION IF EXISTS {ARTICLE_TABLE}_search_vector()",
+        "DROP INDEX IF EXISTS article_search_vector_idx",
+        f"ALTER TABLE {ARTICLE_TABLE} DROP COLUMN IF EXISTS search_vector",
+    ]
+
+
+def _sqlite_install_sql():
+    columns = "title, excerpt, content"
+    new_values = "new.id, new.title, new.excerpt, new.content"
+    old_values = "old.id, old.title, old.excerpt, old.content"
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+            {columns}, content='{ARTICLE_TABLE}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {ARTICLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES ({new_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {ARTICLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', {old_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {columns} ON {ARTICLE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', {old_values});
+            INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES ({new_values});
+        END
+        """,
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+    ]
+
+
+def _sqlite_uninstall_sql():
+    return [
+        f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+        f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+        f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+        f"DROP TABLE IF EXISTS {FTS_TABLE}",
+    ]
+
+
+def _run(conn, statements):
+    with conn.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def install_search_index(conn=connection):
+    """Create (or refresh) the search column/table, triggers and index"""
+    if conn.vendor == 'postgresql':
+        _run(conn, _postgresql_install_sql())
+    elif conn.vendor == 'sqlite':
+        _run(conn, _sqlite_install_sql())
+
+
+def uninstall_search_index(conn=connection):
+    if conn.vendor == 'postgresql':
+        _run(conn, _postgresql_uninstall_sql())
+    elif conn.vendor == 'sqlite':
+        _run(conn, _sqlite_uninstall_sql())
+
+
+def normalize_query(query):
+    return ' '.join((query or '').split())[:MAX_QUERY_LENGTH]
+
+
+def fts5_match_expression(query):
+    """
+    AND of quoted terms. Quoting keeps FTS5 operators and punctuation in user
+    input from being parsed as query syntax.
+    """
+    terms = [term.replace('"', '""') for term in normalize_query(query).split()]
+    return ' '.join(f'"{term}"' for term in terms if term.strip('"'))
+
+
+def highlight(snippet):
+    """Escape a database snippet and turn its delimiters into <mark> tags"""
+    text = html.escape(snippet or '')
+    return mark_safe(text.replace(MARK_START, '<mark>').replace(MARK_END, '</mark>'))
+
+
+class PostgreSQLSearch:
+    QUERY = "websearch_to_tsquery(%s::regconfig, %s)"
+
+    def __init__(self, query):
+        self.query = normalize_query(query)
+        self.config = _search_config()
+        self.empty = not self.query
+
+    def count(self, cursor):
+        cursor.execute(
+            f"SELECT COUNT(*) FROM {ARTICLE_TABLE} "
+            f"WHERE published AND search_vector @@ {self.QUERY}",
+            [self.config, self.query],
+        )
+        return cursor.fetchone()[0]
+
+    def ranked_ids(self, cursor, offset, limit):
+        cursor.execute(
+            f"SELECT id, ts_rank_cd(search_vector, query) AS rank "
+            f"FROM {ARTICLE_TABLE}, {self.QUERY} AS query "
+            f"WHERE published AND search_vector @@ query "
+            f"ORDER BY rank DESC, created_at DESC, id DESC LIMIT %s OFFSET %s",
+            [self.config, self.query, limit, offset],
+        )
+        return cursor.fetchall()
+
+    def snippets(self, cursor, ids):
+        options = (
+            f'StartSel="{MARK_START}", StopSel="{MARK_END}", '
+            f'MaxWords={SNIPPET_WORDS}, MinWords=8, MaxFragments=2, FragmentDelimiter=" … "'
+        )
+        cursor.execute(
+            f"SELECT id, ts_headline(%s::regconfig, content, {self.QUERY}, %s) "
+            f"FROM {ARTICLE_TABLE} WHERE id = ANY(%s)",
+            [self.config, self.config, self.query, options, list(ids)],
+        )
+        return dict(cursor.fetchall())
+
+
+class SQLiteSearch:
+    # bm25() column weights: title, excerpt, content
+    WEIGHTS = (10.0, 4.0, 1.0)
+
+    def __init__(self, query):
+        self.match = fts5_match_expression(query)
+        # Input made only of quotes leaves no terms; MATCH '' is a syntax error
+        self.empty = not self.match
+
+    def count(self, cursor):
+        cursor.execute(
+            f"SELECT COUNT(*) FROM {FTS_TABLE} JOIN {ARTICLE_TABLE} a ON a.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s AND a.published",
+            [self.match],
+        )
+        return cursor.fetchone()[0]
+
+    def ranked_ids(self, cursor, offset, limit):
+        weights = ', '.join(str(weight) for weight in self.WEIGHTS)
+        # bm25() is lower-is-better; negate it so both backends rank descending
+        cursor.execute(
+            f"SELECT a.id, -bm25({FTS_TABLE}, {weights}) AS rank "
+            f"FROM {FTS_TABLE} JOIN {ARTICLE_TABLE} a ON a.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s AND a.published "
+            f"ORDER BY rank DESC, a.created_at DESC, a.id DESC LIMIT %s OFFSET %s",
+            [self.match, limit, offset],
+        )
+        return cursor.fetchall()
+
+    def snippets(self, cursor, ids):
+        placeholders = ', '.join(['%s'] * len(ids))
+        cursor.execute(
+            f"SELECT rowid, snippet({FTS_TABLE}, -1, %s, %s, '…', %s) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid IN ({placeholders})",
+            [MARK_START, MARK_END, SNIPPET_WORDS, self.match, *ids],
+        )
+        return dict(cursor.fetchall())
+
+
+BACKENDS = {
+    'postgresql': PostgreSQLSearch,
+    'sqlite': SQLiteSearch,
+}
+
+
+class ArticleSearch:
+    """
+    Ranked search results for a query. Slicing returns Article instances
+    with ``search_rank`` and ``search_snippet`` (safe HTML) attached.
+    """
+
+    def __init__(self, query, conn=connection):
+        try:
+            backend_class = BACKENDS[conn.vendor]
+        except KeyError:
+            raise NotSupportedError(f"Full-text search is not available on {conn.vendor}")
+        self.query = normalize_query(query)
+        self.conn = conn
+        self.backend = backend_class(self.query)
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            if self.backend.empty:
+                self._count = 0
+            else:
+                with self.conn.cursor() as cursor:
+                    self._count = self.backend.count(cursor)
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise TypeError("ArticleSearch only supports slicing")
+        offset = key.start or 0
+        limit = (key.stop - offset) if key.stop is not None else self.count() - offset
+        if self.backend.empty or limit <= 0:
+            return []
+
+        with self.conn.cursor() as cursor:
+            ranked = self.backend.ranked_ids(cursor, offset, limit)
+            if not ranked:
+                return []
+            ids = [pk for pk, _ in ranked]
+            snippets = self.backend.snippets(cursor, ids)
+
+        articles = Article.objects.select_related('category').in_bulk(ids)
+        results = []
+        for pk, rank in ranked:
+            article = articles.get(pk)
+            if article is None:
+                continue
+            article.search_rank = rank
+            article.search_snippet = highlight(snippets.get(pk) or article.excerpt)
+            results.append(article)
+        return results
@@ -25,6 +25,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.sitemaps',
     'techblog_cms',  # Add the techblog_cms application
 ]
 
@@ -52,12 +53,14 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'techblog_cms.context_processors.testing_mode',
+                'techblog_cms.context_processors.navigation',
             ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'techblog_cms.wsgi.application'
+ASGI_APPLICATION = 'techblog_cms.asgi.application'
 
 # Database
 # Detect testing mode either via explicit env var or when running under pytest
@@ -119,6 +122,20 @@ else:
             }
         }
 
+    # Persistent connections: each worker thread keeps its connection for
+    # DB_CONN_MAX_AGE seconds ("none" = no limit, 0 = reconnect per request)
+    # and checks that it is still alive before reusing it for a new request.
+    # DB_POOL_MODE=pgbouncer targets a PgBouncer in transaction pooling mode,
+    # where server-side cursors break because consecutive transactions can
+    # run on different server connections.
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': config(
+            'DB_CONN_MAX_AGE', default='60', cast=lambda v: None if v.lower() == 'none' else int(v)
+        ),
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+        'DISABLE_SERVER_SIDE_CURSORS': config('DB_POOL_MODE', default='none') == 'pgbouncer',
+    })
+
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = 'static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'static')
@@ -126,6 +143,31 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'techblog_cms', 'static'),
 ]
 
+# Production static pipeline: `collectstatic` writes content-hashed copies
+# (css/style.3f2a9c1b7d4e.css) with precompressed .gz/.br siblings, so
+# templates reference names that can be cached as immutable and nginx or
+# WhiteNoise never compress at request time. Needs a collectstatic run, so it
+# is off for DEBUG and tests.
+STATIC_PIPELINE_ENABLED = config('STATIC_PIPELINE_ENABLED', default=not DEBUG and not IS_TESTING, cast=bool)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'whitenoise.storage.CompressedManifestStaticFilesStorage'
+            if STATIC_PIPELINE_ENABLED
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
+if STATIC_PIPELINE_ENABLED:
+    # Serves /static/ with far-future caching when gunicorn is hit without nginx
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+        'whitenoise.middleware.WhiteNoiseMiddleware',
+    )
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
@@ -135,6 +177,41 @@ ARTICLE_IMAGE_ALLOWED_FORMATS = tuple(
     fmt.upper() for fmt in config('ARTICLE_IMAGE_ALLOWED_FORMATS', default='JPEG,PNG,GIF,WEBP', cast=Csv())
 )
 ARTICLE_IMAGE_MAX_PIXELS = config('ARTICLE_IMAGE_MAX_PIXELS', default=20_000_000, cast=int)
+# Widths of the resized derivatives generated for srcset, and their encoder quality
+ARTICLE_IMAGE_WIDTHS = tuple(config('ARTICLE_IMAGE_WIDTHS', default='320,640,960,1280', cast=Csv(int)))
+ARTICLE_IMAGE_WEBP_QUALITY = config('ARTICLE_IMAGE_WEBP_QUALITY', default=80, cast=int)
+ARTICLE_IMAGE_JPEG_QUALITY = config('ARTICLE_IMAGE_JPEG_QUALITY', default=82, cast=int)
+# Upload optimization, a background job after the editor stores the upload:
+# metadata is stripped, PNG photos may become JPEG/WebP, and lossy encodes
+# step down to ARTICLE_IMAGE_MIN_QUALITY (then shrink) to fit
+# ARTICLE_IMAGE_BYTE_BUDGET bytes (0 = no budget); lossless PNG/GIF are never
+# shrunk, the dashboard flags them when they stay over budget
+ARTICLE_IMAGE_OPTIMIZE = config('ARTICLE_IMAGE_OPTIMIZE', default=True, cast=bool)
+ARTICLE_IMAGE_BYTE_BUDGET = config('ARTICLE_IMAGE_BYTE_BUDGET', default=1024 * 1024, cast=int)
+ARTICLE_IMAGE_MIN_QUALITY = config('ARTICLE_IMAGE_MIN_QUALITY', default=60, cast=int)
+ARTICLE_IMAGE_PHOTO_FORMATS = tuple(
+    fmt.upper() for fmt in config('ARTICLE_IMAGE_PHOTO_FORMATS', default='JPEG,WEBP', cast=Csv())
+)
+
+# Articles per page on public listings (article list, category and tag pages)
+ARTICLE_PAGE_SIZE = config('ARTICLE_PAGE_SIZE', default=10, cast=int)
+# /api/articles/: Cache-Control max-age (seconds) and the thumbnail width
+# (smallest derivative at least this wide) in its responses
+ARTICLE_API_MAX_AGE = config('ARTICLE_API_MAX_AGE', default=60, cast=int)
+ARTICLE_THUMBNAIL_WIDTH = config('ARTICLE_THUMBNAIL_WIDTH', default=320, cast=int)
+# Entries per RSS/Atom feed (site-wide, category and tag feeds)
+FEED_ITEMS = config('FEED_ITEMS', default=20, cast=int)
+# URLs per sitemap chunk (/sitemap-<section>-<page>.xml); the protocol allows 50,000
+SITEMAP_LIMIT = config('SITEMAP_LIMIT', default=10000, cast=int)
+
+# Static export (`manage.py export_static_site`): pre-rendered public pages
+# served by nginx. With STATIC_EXPORT_ENABLED, content changes queue an
+# incremental export on the worker STATIC_EXPORT_DELAY seconds later.
+STATIC_EXPORT_ENABLED = config('STATIC_EXPORT_ENABLED', default=False, cast=bool)
+STATIC_EXPORT_ROOT = config('STATIC_EXPORT_ROOT', default=os.path.join(BASE_DIR, 'export'))
+STATIC_EXPORT_JOBS = config('STATIC_EXPORT_JOBS', default=2, cast=int)
+STATIC_EXPORT_HOST = config('STATIC_EXPORT_HOST', default='') or None
+STATIC_EXPORT_DELAY = config('STATIC_EXPORT_DELAY', default=5, cast=int)
 
 # Admin hardening
 HIDE_ADMIN_URL = True
@@ -201,7 +278,7 @@ CSRF_TRUSTED_ORIGINS = config('CSRF_TRUSTED_ORIGINS', default='', cast=Csv())
 # Cache Configuration
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'BACKEND': 'django_redis.cache.RedisCache',
         'LOCATION': config('REDIS_URL', default='redis://redis:6379/1'),
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
@@ -211,6 +288,51 @@ CACHES = {
     }
 }
 
+if IS_TESTING:
+    # Tests run without Redis, mirroring the SQLite database override above
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'KEY_PREFIX': 'techblog',
+            'TIMEOUT': 300,
+        }
+    }
+
+# Markdown render cache: an in-process LRU (bounded in bytes) in front of
+# CACHES['default'], keyed by a hash of the input and renderer configuration
+MARKDOWN_RENDER_CACHE_ENABLED = config('MARKDOWN_RENDER_CACHE_ENABLED', default=True, cast=bool)
+MARKDOWN_RENDER_CACHE_MAX_BYTES = config('MARKDOWN_RENDER_CACHE_MAX_BYTES', default=8 * 1024 * 1024, cast=int)
+MARKDOWN_RENDER_CACHE_TIMEOUT = config('MARKDOWN_RENDER_CACHE_TIMEOUT', default=24 * 60 * 60, cast=int)
+
+# Sidebar categories/tags cache; invalidated by model signals, the TTL is only a safety net
+NAVIGATION_CACHE_TIMEOUT = config('NAVIGATION_CACHE_TIMEOUT', default=60 * 60, cast=int)
+
+# Full-page cache for anonymous readers (opt-in); invalidated by model signals
+PAGE_CACHE_ENABLED = config('PAGE_CACHE_ENABLED', default=False, cast=bool)
+PAGE_CACHE_TIMEOUT = config('PAGE_CACHE_TIMEOUT', default=300, cast=int)
+
+# Serve the public read views as async views (techblog_cms/async_views.py);
+# asgi.py turns this on, WSGI deployments keep the sync views
+ASYNC_READ_VIEWS = config('ASYNC_READ_VIEWS', default=False, cast=bool)
+
+# Full-text search: PostgreSQL text search configuration used for the
+# article tsvector ('simple' does no stemming, so it suits mixed-language text)
+SEARCH_CONFIG = config('SEARCH_CONFIG', default='simple')
+
+# Search-as-you-type suggestions (/api/search/suggest/): results per prefix,
+# and how long a prefix's results stay in CACHES['default']
+AUTOCOMPLETE_LIMIT = config('AUTOCOMPLETE_LIMIT', default=8, cast=int)
+AUTOCOMPLETE_CACHE_TIMEOUT = config('AUTOCOMPLETE_CACHE_TIMEOUT', default=60, cast=int)
+
+# Background jobs (`manage.py worker`), see techblog_cms/jobs.py
+JOB_QUEUE_EAGER = config('JOB_QUEUE_EAGER', default=IS_TESTING, cast=bool)
+JOB_MAX_ATTEMPTS = config('JOB_MAX_ATTEMPTS', default=5, cast=int)
+JOB_RETRY_BACKOFF = config('JOB_RETRY_BACKOFF', default=30, cast=int)
+JOB_RETRY_BACKOFF_MAX = config('JOB_RETRY_BACKOFF_MAX', default=60 * 60, cast=int)
+JOB_LEASE_TIMEOUT = config('JOB_LEASE_TIMEOUT', default=10 * 60, cast=int)
+JOB_POLL_INTERVAL = config('JOB_POLL_INTERVAL', default=5, cast=int)
+JOB_RETENTION_DAYS = config('JOB_RETENTION_DAYS', default=7, cast=int)
+
 # Session Configuration
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'default'
@@ -32,15 +32,14 @@ MIDDLEWARE.insert(0, 'django.middleware.security.SecurityMiddleware')
 SESSION_COOKIE_HTTPONLY = True
 CSRF_COOKIE_HTTPONLY = True
 
-# Database connection pooling
-DATABASES['default']['CONN_MAX_AGE'] = 60
+# Persistent database connections (DB_CONN_MAX_AGE, DB_POOL_MODE) are
+# configured in settings.py for every profile
 
 # Disable debug toolbar in production
 INTERNAL_IPS = []
 
-# Use whitenoise for static files in production (optional)
-# MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
-# STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Hashed, precompressed static files and the WhiteNoise middleware are set up
+# in settings.py (STATIC_PIPELINE_ENABLED, on whenever DEBUG is off)
 
 # Production logging - only log warnings and above
 LOGGING['root']['level'] = 'WARNING'
@@ -0,0 +1,150 @@
+"""
+Signal receivers that keep cached data in sync with the models
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.urls import reverse
+
+from .autocomplete import invalidate_autocomplete
+from .feeds import feed_paths
+from .jobs import schedule_image_optimization, schedule_image_variants, schedule_static_export
+from .models import Article, Category, Tag
+from .navigation import invalidate_navigation
+from .page_cache import invalidate_paths, invalidate_site
+from .sitemaps import sitemap_paths
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def navigation_changed(sender, **kwargs):
+    invalidate_navigation()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def taxonomy_changed(sender, **kwargs):
+    # Category and tag names appear in the sidebar of every page
+    invalidate_site()
+    invalidate_autocomplete()
+    schedule_static_export()
+
+
+def _article_api_path():
+    # Also called where a signal argument named ``reverse`` shadows the function
+    return reverse('article_api')
+
+
+def article_paths(article, slugs=(), category_slugs=()):
+    """Public URLs that render the given article"""
+    paths = {
+        reverse('home'),
+        reverse('article_list'),
+        _article_api_path(),
+        reverse('search'),
+        reverse('search_api'),
+    }
+    for slug in {article.slug, *slugs}:
+        paths.add(reverse('article_detail', kwargs={'slug': slug}))
+    category_slugs = {article.category.slug, *category_slugs}
+    for slug in category_slugs:
+        paths.add(reverse('category', kwargs={'slug': slug}))
+    tags = list(article.tags.all())
+    for tag in tags:
+        paths.add(tag.get_absolute_url())
+    paths.update(feed_paths(category_slugs, [tag.slug for tag in tags]))
+    paths.update(sitemap_paths(article, categories=[article.category], tags=tags))
+    return paths
+
+
+@receiver(pre_save, sender=Article)
+def remember_previous_article_state(sender, instance, raw=False, **kwargs):
+    instance._previous_state = None
+    if raw or not instance.pk:
+        return
+    instance._previous_state = (
+        Article.objects.filter(pk=instance.pk)
+        .values('title', 'slug', 'published', 'category_id', 'category__slug')
+        .first()
+    )
+
+
+@receiver(post_save, sender=Article)
+def article_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_state', None)
+    was_published = bool(previous and previous['published'])
+    if not was_published and not instance.published:
+        # Drafts never reach the anonymous page cache or suggestions
+        return
+    if previous is None or any(
+        previous[field] != getattr(instance, field)
+        for field in ('title', 'slug', 'published', 'category_id')
+    ):
+        # Suggestions list titles and slugs, and rank categories by article count
+        invalidate_autocomplete()
+    if was_published != instance.published or previous['category_id'] != instance.category_id:
+        # Sidebar article counts change on every page
+        invalidate_site()
+    else:
+        invalidate_paths(*article_paths(
+            instance,
+            slugs=[previous['slug']],
+            category_slugs=[previous['category__slug']],
+        ))
+    # After invalidation, so the export sees the new validators
+    schedule_static_export()
+
+
+@receiver(post_save, sender=Article)
+def article_image_changed(sender, instance, raw=False, **kwargs):
+    # Optimization and derivatives are slow to encode; keep them off the request path
+    if raw:
+        return
+    if instance.image and instance.image_optimization.get('pending'):
+        # Saving the optimized image queues its derivatives
+        schedule_image_optimization(instance)
+    elif not instance.has_current_image_variants():
+        schedule_image_variants(instance)
+
+
+@receiver(post_delete, sender=Article)
+def article_deleted(sender, instance, **kwargs):
+    if instance.published:
+        invalidate_site()
+        invalidate_autocomplete()
+        schedule_static_export()
+
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def article_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if pk_set is None:
+        # clear() does not report which links were removed
+        invalidate_site()
+        schedule_static_export()
+        return
+    if reverse:
+        articles = Article.objects.published().filter(pk__in=pk_set).only('slug')
+        paths = [instance.get_absolute_url(), *(a.get_absolute_url() for a in articles)]
+        paths += feed_paths(tag_slugs=[instance.slug])
+        paths += sitemap_paths(tags=[instance])
+        if articles:
+            # Tag slugs are part of the article API and feed entry categories
+            paths += [_article_api_path(), *feed_paths()]
+    elif instance.published:
+        tags = list(Tag.objects.filter(pk__in=pk_set).only('slug'))
+        paths = [instance.get_absolute_url(), _article_api_path(), *(t.get_absolute_url() for t in tags)]
+        paths += feed_paths([instance.category.slug], [t.slug for t in tags])
+        paths += sitemap_paths(tags=tags)
+    else:
+        return
+    invalidate_paths(*paths)
+    schedule_static_export()
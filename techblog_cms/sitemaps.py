@@ -0,0 +1,183 @@
+"""
+sitemap.xml: an index plus per-section sitemaps (articles, categories, tags),
+split into chunks of SITEMAP_LIMIT URLs.
+
+Each chunk has its own path (/sitemap-articles-3.xml) so the page cache and
+the conditional GET validators can treat chunks independently. Sections are
+ordered oldest first, so publishing an article only appends to the last
+chunk, and editing one changes only the chunk that holds it: the signal
+receivers invalidate that chunk and the index (see sitemap_paths()), and the
+other chunks stay cached.
+"""
+import bisect
+import math
+
+from django.conf import settings
+from django.contrib.sitemaps import Sitemap
+from django.contrib.sites.requests import RequestSite
+from django.core.cache import cache
+from django.db.models import Max, Q
+from django.http import Http404
+from django.shortcuts import render
+from django.urls import reverse
+
+from .conditional import conditional_page, sitemap_validators
+from .models import Article, Category, Tag
+from .page_cache import anonymous_page_cache, generations
+
+# Protocol limit on URLs per sitemap file
+MAX_LIMIT = 50_000
+
+
+def sitemap_limit():
+    return min(getattr(settings, 'SITEMAP_LIMIT', 10_000), MAX_LIMIT)
+
+
+class ArticleSitemap(Sitemap):
+    changefreq = 'weekly'
+
+    @property
+    def limit(self):
+        return sitemap_limit()
+
+    def items(self):
+        return Article.objects.published().order_by('created_at', 'id').only('slug', 'updated_at')
+
+    def lastmod(self, item):
+        return item.updated_at
+
+
+class TaxonomySitemap(Sitemap):
+    """Categories or tags with at least one published article; lastmod is the newest of them"""
+
+    changefreq = 'daily'
+    model = None
+
+    @property
+    def limit(self):
+        return sitemap_limit()
+
+    def items(self):
+        return (
+            self.model.objects.annotate(
+                last_updated=Max('article__updated_at', filter=Q(article__published=True))
+            )
+            .filter(last_updated__isnull=False)
+            .order_by('pk')
+            .only('slug')
+        )
+
+    def lastmod(self, item):
+        return item.last_updated
+
+
+class CategorySitemap(TaxonomySitemap):
+    model = Category
+
+
+class TagSitemap(TaxonomySitemap):
+    model = Tag
+
+
+SECTIONS = {
+    'articles': ArticleSitemap,
+    'categories': CategorySitemap,
+    'tags': TagSitemap,
+}
+
+
+def chunk_count(section):
+    return max(1, math.ceil(SECTIONS[section]().items().count() / sitemap_limit()))
+
+
+def chunk_path(section, page):
+    return reverse('sitemap_section', kwargs={'section': section, 'page': page})
+
+
+def chunk_lastmod(section, page):
+    limit = sitemap_limit()
+    sitemap = SECTIONS[section]()
+    chunk = sitemap.items()[(page - 1) * limit:page * limit]
+    field = 'updated_at' if section == 'articles' else 'last_updated'
+    return chunk.aggregate(newest=Max(field))['newest']
+
+
+@conditional_page(sitemap_validators)
+@anonymous_page_cache
+def sitemap_index(request):
+    entries = []
+    for section in SECTIONS:
+        for page in range(1, chunk_count(section) + 1):
+            entries.append({
+                'location': request.build_absolute_uri(chunk_path(section, page)),
+                'last_mod': chunk_lastmod(section, page),
+            })
+    return render(request, 'sitemap_index.xml', {'sitemaps': entries}, content_type='application/xml')
+
+
+@conditional_page(sitemap_validators)
+@anonymous_page_cache
+def sitemap_section(request, section, page):
+    if section not in SECTIONS or page < 1:
+        raise Http404("No such sitemap")
+    sitemap = SECTIONS[section]()
+    if page > 1 and page > sitemap.paginator.num_pages:
+        raise Http404("No such sitemap page")
+    urls = sitemap.get_urls(page=page, site=RequestSite(request), protocol=request.scheme)
+    return render(request, 'sitemap.xml', {'urlset': urls}, content_type='application/xml')
+
+
+def article_chunk_boundaries():
+    """
+    (created_at, id) of the first article on each page of the articles
+    section after the first, oldest first.
+
+    Publishing, unpublishing and deleting an article replace the site
+    generation, so the boundaries are cached under it: edits in between
+    look their chunk up without querying.
+    """
+    limit = sitemap_limit()
+    site_generation, _ = generations(reverse('sitemap_index'))
+    key = f"sitemap:boundaries:{site_generation}:{limit}"
+    boundaries = cache.get(key)
+    if boundaries is None:
+        rows = ArticleSitemap().items().values_list('created_at', 'id')
+        boundaries = []
+        while True:
+            start = rows[(len(boundaries) + 1) * limit:(len(boundaries) + 1) * limit + 1]
+            row = next(iter(start), None)
+            if row is None:
+                break
+            boundaries.append(row)
+        cache.set(key, boundaries, getattr(settings, 'PAGE_CACHE_TIMEOUT', 300))
+    return boundaries
+
+
+def article_chunk(article):
+    """Page of the articles section that lists (or would list) the article"""
+    return bisect.bisect_right(article_chunk_boundaries(), (article.created_at, article.pk)) + 1
+
+
+def term_chunk(section, term):
+    """Page of the categories or tags section that lists (or would list) the term"""
+    limit = sitemap_limit()
+    if term.pk <= limit:
+        # At most pk - 1 listed terms come before it, all on the first page
+        return 1
+    before = SECTIONS[section]().items().filter(pk__lt=term.pk).count()
+    return before // limit + 1
+
+
+def sitemap_paths(article=None, categories=(), tags=()):
+    """
+    Sitemap URLs to invalidate: the index, the article's own chunk and the
+    chunks listing the given categories and tags (their lastmod follows
+    article edits). Other chunks are left alone, and with the chunk
+    boundaries cached an article edit needs no query here.
+    """
+    paths = {reverse('sitemap_index')}
+    if article is not None:
+        paths.add(chunk_path('articles', article_chunk(article)))
+    for section, terms in (('categories', categories), ('tags', tags)):
+        paths.update(chunk_path(section, term_chunk(section, term)) for term in terms)
+    return paths
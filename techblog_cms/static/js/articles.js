@@ -1,71 +1,91 @@
-let currentPage = 1;
-const articlesPerPage = 6;
-let articlesData = [];
+// Infinite scroll for article listings. The first page is rendered by the
+// server; further pages come from /api/articles/ (data-next-url on the
+// container), so scrolling loads JSON instead of whole HTML pages. Without
+// JavaScript the numbered pagination links keep working.
+const API_FIELDS = 'slug,title,excerpt,created_at,url,category';
 
-// Fetch articles function
-async function fetchArticles(page) {
-  return new Promise((resolve) => {
-    setTimeout(() => {
-      const newArticles = Array.from({ length: articlesPerPage }, (_, i) => ({
-        id: (page - 1) * articlesPerPage + i + 1,
-        title: `記事タイトル ${(page - 1) * articlesPerPage + i + 1}`,
-        excerpt: `これは記事 ${(page - 1) * articlesPerPage + i + 1} の概要です。`,
-        link: '#'
-      }));
-      resolve(newArticles);
-    }, 500);
-  });
+const dateFormat = new Intl.DateTimeFormat('en-US', { month: 'short', day: '2-digit', year: 'numeric' });
+
+function truncateWords(text, count) {
+  const words = (text || '').split(/\s+/).filter(Boolean);
+  return words.length > count ? `${words.slice(0, count).join(' ')} …` : words.join(' ');
 }
 
-// Render articles
-function renderArticles(articles) {
-  const container = document.getElementById('articlesContainer');
+// Mirrors the markup of article_list.html; text goes through textContent
+function renderArticles(container, articles) {
   articles.forEach(article => {
-    const card = document.createElement('div');
-    card.className = 'article-card bg-white p-4 rounded shadow hover:shadow-lg transition';
-    card.innerHTML = `
-      <h3 class="text-lg font-bold text-gray-800 mb-2">${article.title}</h3>
-      <p class="text-gray-600 mb-4">${article.excerpt}</p>
-      <a href="${article.link}" class="text-blue-500 hover:underline">続きを読む</a>
-    `;
-    container.appendChild(card);
+    const item = document.createElement('div');
+    item.className = 'border-b border-gray-200 pb-4';
+
+    const heading = document.createElement('h3');
+    heading.className = 'text-xl font-semibold text-blue-600 hover:text-blue-800';
+    const link = document.createElement('a');
+    link.href = article.url;
+    link.textContent = article.title;
+    heading.appendChild(link);
+
+    const excerpt = document.createElement('p');
+    excerpt.className = 'text-gray-600 mt-2';
+    excerpt.textContent = truncateWords(article.excerpt, 30);
+
+    const meta = document.createElement('div');
+    meta.className = 'text-sm text-gray-500 mt-2';
+    const published = document.createElement('span');
+    published.textContent = `Published: ${dateFormat.format(new Date(article.created_at))}`;
+    meta.appendChild(published);
+    if (article.category) {
+      const category = document.createElement('span');
+      category.className = 'ml-4';
+      category.textContent = `Category: ${article.category.name}`;
+      meta.appendChild(category);
+    }
+
+    item.append(heading, excerpt, meta);
+    container.appendChild(item);
   });
 }
 
-// Search functionality
-document.getElementById('searchBox')?.addEventListener('input', (e) => {
-  const query = e.target.value.toLowerCase();
-  const filteredArticles = articlesData.filter(article => 
-    article.title.toLowerCase().includes(query) ||
-    article.excerpt.toLowerCase().includes(query)
-  );
-  
+document.addEventListener('DOMContentLoaded', () => {
   const container = document.getElementById('articlesContainer');
-  container.innerHTML = '';
-  renderArticles(filteredArticles);
-});
-
-// Infinite scroll
-const observer = new IntersectionObserver(async (entries) => {
-  if (entries[0].isIntersecting) {
-    const newArticles = await fetchArticles(currentPage);
-    articlesData = [...articlesData, ...newArticles];
-    renderArticles(newArticles);
-    currentPage++;
+  const sentinel = document.getElementById('scrollSentinel');
+  if (!container || !sentinel || !container.dataset.nextUrl || !('IntersectionObserver' in window)) {
+    return;
   }
-}, {
-  root: null,
-  rootMargin: '100px',
-  threshold: 0.1
-});
 
-// Start observation
-document.addEventListener('DOMContentLoaded', () => {
-  const sentinel = document.getElementById('scrollSentinel');
-  if (sentinel) observer.observe(sentinel);
-  fetchArticles(currentPage).then(articles => {
-    articlesData = articles;
-    renderArticles(articles);
-    currentPage++;
+  let nextUrl = container.dataset.nextUrl;
+  let loading = false;
+  document.querySelectorAll('[data-pagination]').forEach(element => element.classList.add('hidden'));
+
+  const observer = new IntersectionObserver(async (entries) => {
+    if (!entries[0].isIntersecting || loading || !nextUrl) {
+      return;
+    }
+    loading = true;
+    try {
+      const url = new URL(nextUrl, window.location.origin);
+      url.searchParams.set('fields', API_FIELDS);
+      const response = await fetch(url);
+      if (!response.ok) {
+        throw new Error(`HTTP ${response.status}`);
+      }
+      const page = await response.json();
+      renderArticles(container, page.results);
+      nextUrl = page.next;
+    } catch (error) {
+      // Fall back to the numbered links
+      nextUrl = null;
+      document.querySelectorAll('[data-pagination]').forEach(element => element.classList.remove('hidden'));
+    } finally {
+      loading = false;
+    }
+    if (!nextUrl) {
+      observer.disconnect();
+    }
+  }, {
+    root: null,
+    rootMargin: '100px',
+    threshold: 0.1
   });
+
+  observer.observe(sentinel);
 });
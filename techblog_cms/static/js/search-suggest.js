@@ -0,0 +1,122 @@
+// Search-as-you-type suggestions for inputs with data-suggest-url.
+// Requests are debounced, and a newer keystroke aborts the request in flight,
+// so a burst of typing costs one round trip.
+document.addEventListener('DOMContentLoaded', () => {
+    const DEBOUNCE_MS = 150;
+    const TYPE_LABELS = { article: '記事', category: 'カテゴリ', tag: 'タグ' };
+
+    document.querySelectorAll('input[data-suggest-url]').forEach((input, index) => {
+        const form = input.closest('form');
+        const list = document.createElement('ul');
+        list.id = `search-suggestions-${index}`;
+        list.className = 'search-suggestions hidden';
+        list.setAttribute('role', 'listbox');
+        form.appendChild(list);
+
+        input.setAttribute('autocomplete', 'off');
+        input.setAttribute('role', 'combobox');
+        input.setAttribute('aria-autocomplete', 'list');
+        input.setAttribute('aria-controls', list.id);
+        input.setAttribute('aria-expanded', 'false');
+
+        let timer = null;
+        let controller = null;
+        let lastQuery = '';
+        let active = -1;
+
+        const close = () => {
+            list.classList.add('hidden');
+            input.setAttribute('aria-expanded', 'false');
+            active = -1;
+        };
+
+        const setActive = (next) => {
+            const items = list.querySelectorAll('[role="option"]');
+            if (!items.length) {
+                return;
+            }
+            active = (next + items.length) % items.length;
+            items.forEach((item, i) => item.setAttribute('aria-selected', i === active ? 'true' : 'false'));
+        };
+
+        const render = (suggestions) => {
+            list.replaceChildren();
+            suggestions.forEach((suggestion) => {
+                const item = document.createElement('li');
+                item.setAttribute('role', 'option');
+                const link = document.createElement('a');
+                link.href = suggestion.url;
+                link.textContent = suggestion.label;
+                const type = document.createElement('span');
+                type.className = 'search-suggestion-type';
+                type.textContent = TYPE_LABELS[suggestion.type] || suggestion.type;
+                link.appendChild(type);
+                item.appendChild(link);
+                list.appendChild(item);
+            });
+            active = -1;
+            if (suggestions.length) {
+                list.classList.remove('hidden');
+                input.setAttribute('aria-expanded', 'true');
+            } else {
+                close();
+            }
+        };
+
+        const fetchSuggestions = async (query) => {
+            if (controller) {
+                controller.abort();
+            }
+            controller = new AbortController();
+            try {
+                const url = `${input.dataset.suggestUrl}?q=${encodeURIComponent(query)}`;
+                const response = await fetch(url, { signal: controller.signal });
+                if (response.ok) {
+                    render((await response.json()).suggestions);
+                }
+            } catch (error) {
+                if (error.name !== 'AbortError') {
+                    close();
+                }
+            }
+        };
+
+        input.addEventListener('input', () => {
+            const query = input.value.trim();
+            clearTimeout(timer);
+            if (query === lastQuery) {
+                return;
+            }
+            lastQuery = query;
+            if (!query) {
+                if (controller) {
+                    controller.abort();
+                }
+                close();
+                return;
+            }
+            timer = setTimeout(() => fetchSuggestions(query), DEBOUNCE_MS);
+        });
+
+        input.addEventListener('keydown', (event) => {
+            if (list.classList.contains('hidden')) {
+                return;
+            }
+            if (event.key === 'ArrowDown' || event.key === 'ArrowUp') {
+                event.preventDefault();
+                setActive(active + (event.key === 'ArrowDown' ? 1 : -1));
+            } else if (event.key === 'Enter' && active >= 0) {
+                event.preventDefault();
+                window.location.href = list.querySelectorAll('a')[active].href;
+            } else if (event.key === 'Escape') {
+                close();
+            }
+        });
+
+        document.addEventListener('click', (event) => {
+            if (!form.contains(event.target)) {
+                close();
+            }
+        });
+    });
+});
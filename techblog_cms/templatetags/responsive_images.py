@@ -0,0 +1,35 @@
+from django import template
+
+register = template.Library()
+
+
+@register.inclusion_tag('components/responsive_image.html')
+def article_image(article, sizes='100vw', css_class=''):
+    """
+    Render article.image as a <picture> with WebP and original-format srcsets
+    """
+    if not article.image:
+        return {'image_url': None}
+
+    # Until the worker has written derivatives for the current image (queued
+    # on save, or by `manage.py generate_image_variants` for older uploads)
+    # only the original is offered; rendering never writes to the database
+    info = article.image_variants if article.has_current_image_variants() else {}
+
+    storage = article.image.storage
+    variants = info.get('variants', [])
+    webp_srcset = [f"{storage.url(v['webp'])} {v['width']}w" for v in variants]
+    srcset = [f"{storage.url(v['fallback'])} {v['width']}w" for v in variants]
+    if variants:
+        srcset.append(f"{article.image.url} {info['width']}w")
+
+    return {
+        'image_url': article.image.url,
+        'alt': article.title,
+        'sizes': sizes,
+        'css_class': css_class,
+        'webp_srcset': ", ".join(webp_srcset),
+        'srcset': ", ".join(srcset),
+        'width': info.get('width'),
+        'height': info.get('height'),
+    }
@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from techblog_cms.models import Article, Category, Tag
+
+
+class ArticleApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('article_api')
+        self.category = Category.objects.create(name="Python", description="Python articles")
+        self.tag = Tag.objects.create(name="Django")
+        now = timezone.now()
+        self.articles = []
+        for n in range(5):
+            article = Article.objects.create(
+                title=f"Article {n}",
+                content="# Body",
+                category=self.category,
+                published=True,
+            )
+            Article.objects.filter(pk=article.pk).update(created_at=now - timedelta(hours=n))
+            self.articles.append(article)
+        self.articles[0].tags.add(self.tag)
+        Article.objects.create(title="Draft", content="x", category=self.category, published=False)
+
+    def test_first_page_has_every_field(self):
+        data = self.client.get(self.url, {'limit': 2}).json()
+
+        first = data['results'][0]
+        self.assertEqual(
+            set(first),
+            {'id', 'slug', 'title', 'excerpt', 'created_at', 'url', 'category', 'tags', 'thumbnail'},
+        )
+        self.assertEqual(first['title'], "Article 0")
+        self.assertEqual(first['category'], {'slug': self.category.slug, 'name': "Python"})
+        self.assertEqual(first['tags'], [self.tag.slug])
+        self.assertIsNone(first['thumbnail'])
+        self.assertIsNotNone(data['next'])
+
+    def test_cursor_walks_every_published_article_once(self):
+        titles, url = [], f"{self.url}?limit=2&fields=title"
+        while url:
+            data = self.client.get(url).json()
+            titles += [row['title'] for row in data['results']]
+            url = data['next']
+
+        self.assertEqual(titles, [f"Article {n}" for n in range(5)])
+
+    def test_field_selection_limits_columns_and_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(self.url, {'fields': 'slug,title'}).json()
+
+        self.assertEqual(set(data['results'][0]), {'slug', 'title'})
+        # Validators aggregate plus one page query: no content, join or tag prefetch
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('"content"', queries[-1]['sql'])
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(self.url, {'fields': 'title,content'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'after': 'nonsense'}).status_code, 400)
+
+    def test_responses_are_cacheable_and_revalidated(self):
+        response = self.client.get(self.url)
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('max-age=60', response['Cache-Control'])
+
+        etag = response['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.articles[1].title = "Renamed"
+        self.articles[1].save()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_tagging_changes_etag(self):
+        etag = self.client.get(self.url)['ETag']
+
+        self.articles[2].tags.add(self.tag)
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_article_list_hands_off_to_api(self):
+        with self.settings(ARTICLE_PAGE_SIZE=2):
+            response = self.client.get(reverse('article_list'))
+
+        self.assertContains(response, 'id="articlesContainer"')
+        next_url = response.context['api_next_url']
+        data = self.client.get(f"{next_url}&fields=title").json()
+        self.assertEqual([row['title'] for row in data['results']], ["Article 2", "Article 3", "Article 4"])
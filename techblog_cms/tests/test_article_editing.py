@@ -1,15 +1,28 @@
 import io
 import shutil
 import tempfile
+from unittest import mock
 
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase, override_settings
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
 from PIL import Image
 
-from techblog_cms.models import Article, Category
+from techblog_cms.jobs import work
+from techblog_cms.models import Article, Category, Job
+from techblog_cms.markdown_renderer import (
+    RENDERER_VERSION,
+    MarkdownRendererPool,
+    RenderCache,
+    build_markdown,
+    render_cache,
+    render_markdown,
+)
 from techblog_cms.templatetags.markdown_filter import markdown_to_html
+from techblog_cms.views import validate_article_image
 
 
 class ArticleSlugTests(TestCase):
@@ -114,6 +127,85 @@ class ArticleEditingTests(TestCase):
         self.assertTrue(refreshed.image.name.startswith("articles/"))
         self.assertTrue(refreshed.image.name.endswith(".png"))
 
+    def test_upload_reports_bytes_saved(self):
+        self.client.login(username="editor", password="pass1234")
+        url = reverse("article_edit", args=[self.article.slug])
+        buffer = io.BytesIO()
+        Image.merge('RGB', [Image.effect_noise((200, 200), 40) for _ in range(3)]).save(buffer, format="PNG")
+        image_file = SimpleUploadedFile("photo.png", buffer.getvalue(), content_type="image/png")
+
+        response = self.client.post(
+            url,
+            {
+                "title": "Original Title",
+                "content": "Updated body with a photo",
+                "action": "save",
+                "image": image_file,
+            },
+            follow=True,
+        )
+
+        self.assertContains(response, "画像を最適化しました")
+        refreshed = Article.objects.get(pk=self.article.pk)
+        self.assertFalse(refreshed.image.name.endswith(".png"))
+        self.assertLess(refreshed.image.size, len(buffer.getvalue()))
+
+    @override_settings(ARTICLE_IMAGE_BYTE_BUDGET=20 * 1024)
+    def test_lossless_upload_over_budget_warns(self):
+        self.client.login(username="editor", password="pass1234")
+        url = reverse("article_edit", args=[self.article.slug])
+        buffer = io.BytesIO()
+        Image.merge('RGBA', [Image.effect_noise((200, 200), 40) for _ in range(4)]).save(buffer, format="PNG")
+        image_file = SimpleUploadedFile("diagram.png", buffer.getvalue(), content_type="image/png")
+
+        response = self.client.post(
+            url,
+            {
+                "title": "Original Title",
+                "content": "Updated body with a diagram",
+                "action": "save",
+                "image": image_file,
+            },
+            follow=True,
+        )
+
+        self.assertContains(response, "を超えています")
+        refreshed = Article.objects.get(pk=self.article.pk)
+        with refreshed.image.open('rb') as handle, Image.open(handle) as image:
+            self.assertEqual(image.size, (200, 200))
+
+    @override_settings(JOB_QUEUE_EAGER=False)
+    def test_upload_is_optimized_by_the_job_queue(self):
+        self.client.login(username="editor", password="pass1234")
+        url = reverse("article_edit", args=[self.article.slug])
+        buffer = io.BytesIO()
+        Image.merge('RGB', [Image.effect_noise((200, 200), 40) for _ in range(3)]).save(buffer, format="PNG")
+        image_file = SimpleUploadedFile("photo.png", buffer.getvalue(), content_type="image/png")
+
+        with mock.patch("techblog_cms.models.optimize_upload") as optimize:
+            response = self.client.post(
+                url,
+                {"title": "Original Title", "content": "Body", "action": "save", "image": image_file},
+                follow=True,
+            )
+        optimize.assert_not_called()
+        self.assertContains(response, "画像を最適化しています")
+        article = Article.objects.get(pk=self.article.pk)
+        uploaded_name = article.image.name
+        self.assertEqual(article.image.size, len(buffer.getvalue()))
+        self.assertEqual(article.image_optimization, {'pending': True})
+        self.assertEqual(list(Job.objects.values_list('name', flat=True)), ['article.optimize_image'])
+
+        work(burst=True)
+
+        article.refresh_from_db()
+        self.assertFalse(article.image.name.endswith(".png"))
+        self.assertFalse(article.image.storage.exists(uploaded_name))
+        self.assertEqual(article.image_optimization['bytes'], article.image.size)
+        self.assertTrue(article.has_current_image_variants())
+        response = self.client.get(reverse("dashboard"))
+        self.assertContains(response, f"{article.image_optimization['format']} 200×200")
+
     def test_plain_text_upload_is_rejected(self):
         self.client.login(username="editor", password="pass1234")
         url = reverse("article_edit", args=[self.article.slug])
@@ -156,7 +248,193 @@ class ArticleEditingTests(TestCase):
         self.assertFalse(refreshed.image)
 
 
+class ValidateArticleImageTests(TestCase):
+    def _file(self, format="PNG", size=(64, 48)):
+        buffer = io.BytesIO()
+        with Image.new('RGB', size, (10, 20, 30)) as image:
+            image.save(buffer, format=format)
+        return SimpleUploadedFile(f"test.{format.lower()}", buffer.getvalue())
+
+    def test_valid_image_is_returned_rewound(self):
+        upload = self._file()
+
+        cleaned, error = validate_article_image(upload)
+
+        self.assertIsNone(error)
+        self.assertIs(cleaned, upload)
+        self.assertEqual(upload.tell(), 0)
+
+    @override_settings(ARTICLE_IMAGE_MAX_PIXELS=1000)
+    def test_pixel_limit_is_checked_from_header(self):
+        upload = self._file(size=(64, 48))
+
+        cleaned, error = validate_article_image(upload)
+
+        self.assertIsNone(cleaned)
+        self.assertIn("maximum allowed pixel count of 1000", error)
+        self.assertEqual(upload.tell(), 0)
+
+    @override_settings(ARTICLE_IMAGE_ALLOWED_FORMATS=('PNG',))
+    def test_disallowed_format_is_rejected(self):
+        cleaned, error = validate_article_image(self._file(format="GIF"))
+
+        self.assertIsNone(cleaned)
+        self.assertEqual(error, "Unsupported image format. Allowed formats: PNG.")
+
+    def test_corrupted_png_is_rejected(self):
+        data = self._file().read()
+        corrupted = data[:40] + bytes(b ^ 0xFF for b in data[40:60]) + data[60:]
+
+        cleaned, error = validate_article_image(SimpleUploadedFile("bad.png", corrupted))
+
+        self.assertIsNone(cleaned)
+        self.assertIsNotNone(error)
+
+
 class MarkdownRenderingTests(TestCase):
     def test_plain_urls_are_linkified(self):
         html = markdown_to_html("Check https://example.com for details")
         self.assertIn('<a href="https://example.com">https://example.com</a>', html)
+
+    def test_pooled_renderer_does_not_leak_state_between_documents(self):
+        pool = MarkdownRendererPool(max_idle=1)
+        first = pool.render("Text with a note[^1].\n\n[^1]: First footnote")
+        second = pool.render("Plain paragraph")
+
+        self.assertIn("First footnote", first)
+        self.assertEqual(second, "<p>Plain paragraph</p>")
+        self.assertEqual(first, build_markdown().convert("Text with a note[^1].\n\n[^1]: First footnote"))
+
+
+class MarkdownRenderCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        render_cache.clear()
+        self.addCleanup(render_cache.clear)
+
+    def test_repeated_render_hits_local_tier(self):
+        first = render_markdown("Cached *text*")
+        second = render_markdown("Cached *text*")
+
+        self.assertEqual(first, second)
+        stats = render_cache.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['local_hits'], 1)
+
+    def test_shared_tier_serves_other_processes(self):
+        render_markdown("Shared *text*")
+        other_worker = RenderCache()
+
+        html = other_worker.get(RenderCache.make_key("Shared *text*"))
+
+        self.assertEqual(html, "<p>Shared <em>text</em></p>")
+        self.assertEqual(other_worker.stats()['shared_hits'], 1)
+
+    @override_settings(MARKDOWN_RENDER_CACHE_MAX_BYTES=40)
+    def test_local_tier_evicts_oldest_entries_beyond_byte_cap(self):
+        local = RenderCache()
+        local.set("a", "x" * 30)
+        local.set("b", "y" * 30)
+
+        self.assertEqual(local.stats()['entries'], 1)
+        self.assertLessEqual(local.stats()['bytes'], 40)
+
+    @override_settings(MARKDOWN_RENDER_CACHE_ENABLED=False)
+    def test_disabled_cache_is_bypassed(self):
+        render_markdown("Uncached")
+        render_markdown("Uncached")
+
+        self.assertEqual(render_cache.stats()['misses'], 0)
+        self.assertEqual(render_cache.stats()['entries'], 0)
+
+
+class ArticleRenderedContentTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name="General", description="General articles")
+
+    def test_save_stores_rendered_html(self):
+        article = Article.objects.create(
+            title="Rendered",
+            content="# Heading\n\nBody text",
+            category=self.category,
+            published=True,
+        )
+        self.assertIn("<h1", article.content_html)
+        self.assertEqual(article.renderer_version, RENDERER_VERSION)
+        self.assertTrue(article.has_current_rendering())
+
+    def test_stale_html_falls_back_to_live_rendering(self):
+        article = Article.objects.create(
+            title="Stale",
+            content="Original body",
+            category=self.category,
+            published=True,
+        )
+        Article.objects.filter(pk=article.pk).update(content="Changed **body**")
+        article.refresh_from_db()
+
+        self.assertFalse(article.has_current_rendering())
+        self.assertIn("<strong>body</strong>", article.rendered_content())
+
+        response = self.client.get(reverse("article_detail", args=[article.slug]))
+        self.assertContains(response, "<strong>body</strong>")
+
+    def test_rerender_command_refreshes_stale_rows(self):
+        article = Article.objects.create(
+            title="Command",
+            content="Some *text*",
+            category=self.category,
+        )
+        Article.objects.filter(pk=article.pk).update(content_html="", renderer_version=0)
+
+        out = io.StringIO()
+        call_command("rerender_articles", stdout=out)
+
+        article.refresh_from_db()
+        self.assertTrue(article.has_current_rendering())
+        self.assertIn("<em>text</em>", article.content_html)
+        self.assertIn("Re-rendered 1 of 1 articles", out.getvalue())
+
+    def test_highlight_stylesheet_is_linked_only_with_code(self):
+        with_code = Article.objects.create(
+            title="With code",
+            content="```python\nprint('hi')\n```",
+            category=self.category,
+            published=True,
+        )
+        without_code = Article.objects.create(
+            title="Without code",
+            content="Only `inline` code",
+            category=self.category,
+            published=True,
+        )
+
+        response = self.client.get(reverse("article_detail", args=[with_code.slug]))
+        self.assertContains(response, "css/highlight.css")
+        self.assertContains(response, "css/article.css")
+        self.assertNotContains(response, ".highlight .k")
+
+        response = self.client.get(reverse("article_detail", args=[without_code.slug]))
+        self.assertNotContains(response, "css/highlight.css")
+        self.assertContains(response, "css/article.css")
+
+    def test_stale_article_is_rendered_once_per_page(self):
+        article = Article.objects.create(
+            title="Stale code",
+            content="```python\nprint('hi')\n```",
+            category=self.category,
+            published=True,
+        )
+        Article.objects.filter(pk=article.pk).update(renderer_version=0)
+        render_cache.clear()
+
+        with mock.patch("techblog_cms.models.render_markdown", wraps=render_markdown) as render:
+            response = self.client.get(reverse("article_detail", args=[article.slug]))
+
+        self.assertContains(response, "css/highlight.css")
+        self.assertContains(response, 'class="highlight"')
+        self.assertEqual(render.call_count, 1)
+
+    def test_highlight_stylesheet_matches_pygments_style(self):
+        # Fails when the Pygments style changes without regenerating the file
+        call_command("generate_highlight_css", "--check", stdout=io.StringIO())
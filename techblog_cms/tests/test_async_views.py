@@ -0,0 +1,109 @@
+import asyncio
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import URLPattern, reverse
+
+from techblog_cms import async_views, urls, views
+from techblog_cms.models import Article, Category, Tag
+
+READ_VIEWS = (
+    'home_view', 'article_list_view', 'article_detail_view',
+    'categories_view', 'category_view', 'tags_view', 'tag_view',
+)
+
+# The site's URLs with the read views routed as with ASYNC_READ_VIEWS (asgi.py)
+urlpatterns = [
+    URLPattern(pattern.pattern, getattr(async_views, pattern.callback.__name__), pattern.default_args, pattern.name)
+    if isinstance(pattern, URLPattern) and pattern.callback.__name__ in READ_VIEWS else pattern
+    for pattern in urls.urlpatterns
+]
+
+
+@override_settings(ROOT_URLCONF=__name__, ARTICLE_PAGE_SIZE=2)
+class AsyncReadViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Python", description="Python articles")
+        self.tag = Tag.objects.create(name="Django")
+        self.articles = []
+        for n in range(3):
+            article = Article.objects.create(
+                title=f"Async article {n}",
+                content=f"Body {n}",
+                category=self.category,
+                published=True,
+            )
+            article.tags.add(self.tag)
+            self.articles.append(article)
+        self.draft = Article.objects.create(
+            title="Async draft", content="Draft body", category=self.category, published=False
+        )
+        self.draft.tags.add(self.tag)
+        self.paths = [
+            reverse('home'),
+            reverse('article_list'),
+            reverse('article_list') + '?page=2',
+            reverse('article_list') + f"?after={self.articles[2].created_at.isoformat()},{self.articles[2].pk}",
+            reverse('categories'),
+            reverse('category', args=[self.category.slug]),
+            reverse('tags'),
+            reverse('tag', args=[self.tag.slug]),
+            self.articles[0].get_absolute_url(),
+        ]
+
+    def test_read_views_are_coroutines(self):
+        for name in READ_VIEWS:
+            self.assertTrue(asyncio.iscoroutinefunction(getattr(async_views, name)), name)
+
+    async def test_pages_match_the_sync_views(self):
+        for path in self.paths:
+            response = await self.async_client.get(path)
+            with override_settings(ROOT_URLCONF='techblog_cms.urls'):
+                expected = await self.async_client.get(path)
+
+            self.assertEqual(response.status_code, 200, path)
+            self.assertEqual(response.content, expected.content, path)
+            self.assertEqual(response['ETag'], expected['ETag'], path)
+            self.assertNotContains(response, "Async draft")
+
+    async def test_missing_and_draft_pages_are_404(self):
+        for path in (
+            self.draft.get_absolute_url(),
+            reverse('category', args=['missing']),
+            reverse('tag', args=['missing']),
+        ):
+            response = await self.async_client.get(path)
+            self.assertEqual(response.status_code, 404, path)
+
+    def test_signed_in_users_see_drafts(self):
+        user = User.objects.create_user(username="editor", password="password")
+        self.client.force_login(user)
+
+        self.assertContains(self.client.get(self.draft.get_absolute_url()), "Draft body")
+        self.assertContains(self.client.get(reverse('tag', args=[self.tag.slug])), "Async draft")
+
+    async def test_conditional_get(self):
+        url = reverse('article_list')
+        etag = (await self.async_client.get(url))['ETag']
+
+        response = await self.async_client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    @override_settings(PAGE_CACHE_ENABLED=True)
+    def test_page_cache_hits_and_invalidation(self):
+        url = self.articles[0].get_absolute_url()
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        self.articles[0].content = "Edited body"
+        self.articles[0].save()
+
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertContains(response, "Edited body")
+
+    def test_urls_route_sync_views_by_default(self):
+        self.assertIs(urls.read_views, views)
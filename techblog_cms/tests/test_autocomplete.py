@@ -0,0 +1,123 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from techblog_cms import autocomplete
+from techblog_cms.autocomplete import SuggestionIndex, suggest
+from techblog_cms.models import Article, Category, Tag
+
+
+class SuggestionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Python", description="Python articles")
+
+    def _article(self, title, published=True):
+        return Article.objects.create(
+            title=title,
+            content="body",
+            category=self.category,
+            published=published,
+        )
+
+    def _labels(self, query, limit=None):
+        return [(s['type'], s['label']) for s in suggest(query, limit)]
+
+    def test_matches_titles_categories_and_tags_by_word_prefix(self):
+        article = self._article("Profiling Django REST framework")
+        Tag.objects.create(name="Django")
+
+        self.assertEqual(
+            self._labels("dja"),
+            [('tag', 'Django'), ('article', 'Profiling Django REST framework')],
+        )
+        self.assertEqual(self._labels("rest fr"), [('article', 'Profiling Django REST framework')])
+        self.assertEqual(self._labels("pyt"), [('category', 'Python')])
+        self.assertEqual(suggest("profiling")[0]['url'], article.get_absolute_url())
+
+    def test_japanese_titles_match_from_any_character(self):
+        self._article("非同期処理の基本")
+
+        self.assertEqual(self._labels("処理"), [('article', '非同期処理の基本')])
+
+    def test_full_width_input_is_normalized(self):
+        self._article("Django tips")
+
+        self.assertEqual(self._labels("ＤＪＡＮ"), [('article', 'Django tips')])
+
+    def test_label_start_matches_rank_first(self):
+        self._article("Notes on caching")
+        self._article("Caching with redis")
+
+        self.assertEqual(
+            [label for _, label in self._labels("cach")],
+            ["Caching with redis", "Notes on caching"],
+        )
+
+    def test_drafts_are_not_suggested(self):
+        self._article("Draft about flask", published=False)
+
+        self.assertEqual(self._labels("flask"), [])
+
+    def test_new_articles_appear_after_invalidation(self):
+        self._article("Async views")
+        self.assertEqual(len(suggest("async")), 1)
+
+        self._article("Async ORM")
+
+        self.assertEqual(len(suggest("async")), 2)
+
+    def test_body_edits_keep_the_suggestion_index(self):
+        article = self._article("Async views")
+        generation = cache.get(autocomplete.GENERATION_KEY)
+
+        article.content = "Edited body"
+        article.save()
+        self.assertEqual(cache.get(autocomplete.GENERATION_KEY), generation)
+
+        article.title = "Async views in Django"
+        article.save()
+        self.assertNotEqual(cache.get(autocomplete.GENERATION_KEY), generation)
+        self.assertEqual(self._labels("async"), [('article', "Async views in Django")])
+
+    def test_limit(self):
+        for n in range(5):
+            self._article(f"Benchmark {n}")
+
+        self.assertEqual(len(suggest("ben", limit=3)), 3)
+        self.assertEqual(len(suggest("bench", limit=3)), 3)
+
+    def test_cached_prefix_is_served_without_building_the_index(self):
+        self._article("Gunicorn tuning")
+        expected = suggest("gun")
+
+        autocomplete._index = autocomplete._index_generation = None
+        with self.assertNumQueries(0):
+            self.assertEqual(suggest("gun"), expected)
+
+    def test_long_queries_are_checked_against_the_whole_label(self):
+        title = "Understanding connection pooling in production deployments"
+        self._article(title)
+
+        self.assertEqual(self._labels("connection pooling in production"), [('article', title)])
+        self.assertEqual(self._labels("connection pooling in staging"), [])
+
+    def test_endpoint(self):
+        self._article("Django tips")
+
+        response = self.client.get(reverse('search_suggest'), {'q': 'dj'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['suggestions'][0]['label'], "Django tips")
+        self.assertIn('max-age=60', response['Cache-Control'])
+        self.assertEqual(self.client.get(reverse('search_suggest')).json(), {'suggestions': []})
+
+
+class SuggestionIndexTests(TestCase):
+    def test_short_and_long_prefixes_agree(self):
+        entries = [(f"word{n} topic", 'article', f"slug-{n}") for n in range(50)]
+        index = SuggestionIndex(entries)
+
+        self.assertEqual(index.lookup("wor", 5), [0, 1, 2, 3, 4])
+        self.assertEqual(index.lookup("word", 5), [0, 1, 2, 3, 4])
+        self.assertEqual(index.lookup("topi", 2), [0, 1])
@@ -0,0 +1,115 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from techblog_cms.models import Article, Category, Tag
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Python", description="Python articles")
+        self.tag = Tag.objects.create(name="Django")
+        self.article = Article.objects.create(
+            title="Conditional",
+            content="# Body",
+            category=self.category,
+            published=True,
+        )
+        self.article.tags.add(self.tag)
+        self.detail_url = reverse('article_detail', args=[self.article.slug])
+
+    def test_detail_sends_validators(self):
+        response = self.client.get(self.detail_url)
+
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        self.assertIn('Last-Modified', response)
+
+    def test_matching_etag_returns_304_without_rendering(self):
+        etag = self.client.get(self.detail_url)['ETag']
+
+        with mock.patch('techblog_cms.models.render_markdown') as render_markdown:
+            with self.assertNumQueries(0):
+                response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        render_markdown.assert_not_called()
+
+    def test_if_modified_since_returns_304(self):
+        last_modified = self.client.get(self.detail_url)['Last-Modified']
+
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_rerender_command_changes_etag(self):
+        etag = self.client.get(self.detail_url)['ETag']
+
+        call_command('rerender_articles', '--force', stdout=StringIO())
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(PAGE_CACHE_TIMEOUT=0)
+    def test_validators_expire_with_the_page_cache(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        # A write that sends no signals
+        Article.objects.filter(pk=self.article.pk).update(title="Renamed", updated_at=timezone.now())
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Renamed")
+
+    def test_editing_article_changes_etag(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        self.article.content = "# Edited"
+        self.article.save()
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_renaming_category_changes_etag(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        self.category.name = "Python 3"
+        self.category.save()
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_listing_etag_changes_when_article_published(self):
+        urls = [reverse('home'), reverse('article_list'), reverse('tag', args=[self.tag.slug])]
+        etags = {url: self.client.get(url)['ETag'] for url in urls}
+        for url in urls:
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etags[url]).status_code, 304)
+
+        new_article = Article.objects.create(
+            title="New", content="Body", category=self.category, published=True
+        )
+        new_article.tags.add(self.tag)
+
+        for url in urls:
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etags[url]).status_code, 200)
+
+    def test_missing_article_still_404s(self):
+        response = self.client.get(reverse('article_detail', args=['missing']))
+
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response)
+
+    def test_authenticated_users_are_not_validated(self):
+        User.objects.create_user(username="editor", password="pass1234")
+        self.client.login(username="editor", password="pass1234")
+
+        response = self.client.get(self.detail_url)
+
+        self.assertNotIn('ETag', response)
@@ -0,0 +1,104 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from techblog_cms.models import Article, Category, Tag
+
+
+class FeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.python = Category.objects.create(name="Python", description="Python articles")
+        self.ops = Category.objects.create(name="Ops")
+        self.tag = Tag.objects.create(name="Django")
+        self.article = Article.objects.create(
+            title="Feed article",
+            content="# Heading\n\nBody text",
+            excerpt="Short summary",
+            category=self.python,
+            published=True,
+        )
+        self.article.tags.add(self.tag)
+        Article.objects.create(title="Ops article", content="ops", category=self.ops, published=True)
+        Article.objects.create(title="Draft article", content="x", category=self.python, published=False)
+
+    def test_site_feeds_list_published_articles(self):
+        rss = self.client.get(reverse('feed_rss'))
+        atom = self.client.get(reverse('feed_atom'))
+
+        self.assertEqual(rss['Content-Type'], 'application/rss+xml; charset=utf-8')
+        self.assertEqual(atom['Content-Type'], 'application/atom+xml; charset=utf-8')
+        for response in (rss, atom):
+            self.assertContains(response, "Feed article")
+            self.assertContains(response, "Ops article")
+            self.assertNotContains(response, "Draft article")
+
+    def test_entries_use_stored_html_without_rendering(self):
+        with mock.patch('techblog_cms.models.render_markdown') as render:
+            atom = self.client.get(reverse('feed_atom'))
+            rss = self.client.get(reverse('feed_rss'))
+
+        render.assert_not_called()
+        self.assertContains(atom, '<summary type="html">Short summary</summary>')
+        self.assertContains(atom, '<content type="html">')
+        self.assertContains(atom, '&lt;h1')
+        self.assertContains(rss, '&lt;h1')
+        self.assertContains(rss, '<category>Django</category>')
+
+    def test_category_and_tag_feeds(self):
+        response = self.client.get(reverse('category_feed_atom', args=[self.ops.slug]))
+        self.assertContains(response, "Ops article")
+        self.assertNotContains(response, "Feed article")
+
+        response = self.client.get(reverse('tag_feed_rss', args=[self.tag.slug]))
+        self.assertContains(response, "Feed article")
+        self.assertNotContains(response, "Ops article")
+
+        self.assertEqual(self.client.get(reverse('tag_feed_rss', args=['missing'])).status_code, 404)
+
+    def test_conditional_get(self):
+        url = reverse('feed_atom')
+        etag = self.client.get(url)['ETag']
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.article.title = "Edited"
+        self.article.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    @override_settings(PAGE_CACHE_ENABLED=True)
+    def test_cached_feeds_are_invalidated_by_member_articles(self):
+        urls = [
+            reverse('feed_rss'),
+            reverse('category_feed_atom', args=[self.python.slug]),
+            reverse('tag_feed_atom', args=[self.tag.slug]),
+        ]
+        for url in urls:
+            self.client.get(url)
+            self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        self.article.title = "Edited title"
+        self.article.save()
+
+        for url in urls:
+            response = self.client.get(url)
+            self.assertEqual(response['X-Cache'], 'MISS')
+            self.assertContains(response, "Edited title")
+
+    @override_settings(PAGE_CACHE_ENABLED=True)
+    def test_tagging_invalidates_tag_feed(self):
+        url = reverse('tag_feed_rss', args=[self.tag.slug])
+        self.client.get(url)
+        ops_article = Article.objects.get(title="Ops article")
+
+        ops_article.tags.add(self.tag)
+
+        self.assertContains(self.client.get(url), "Ops article")
+
+    def test_pages_advertise_feeds(self):
+        response = self.client.get(reverse('category', args=[self.python.slug]))
+
+        self.assertContains(response, reverse('feed_atom'))
+        self.assertContains(response, reverse('category_feed_atom', args=[self.python.slug]))
@@ -0,0 +1,56 @@
+import os
+import runpy
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+PRODUCTION_CONFIG = Path(settings.BASE_DIR) / 'gunicorn.production.conf.py'
+
+
+def load_config(**env):
+    with mock.patch.dict(os.environ, env):
+        return runpy.run_path(str(PRODUCTION_CONFIG))
+
+
+class ProductionGunicornConfigTests(SimpleTestCase):
+    def test_defaults(self):
+        config = load_config(GUNICORN_MAX_REQUESTS='', GUNICORN_WORKER_CLASS='')
+
+        self.assertTrue(config['preload_app'])
+        self.assertFalse(config['reload'])
+        self.assertEqual(config['worker_class'], 'gthread')
+        self.assertEqual(config['wsgi_app'], 'techblog_cms.wsgi:application')
+        self.assertEqual(config['max_requests'], 1000)
+        self.assertEqual(config['max_requests_jitter'], 100)
+        self.assertEqual(config['worker_tmp_dir'], '/dev/shm')
+        self.assertGreaterEqual(config['workers'], 3)
+
+    def test_sizing_from_environment(self):
+        config = load_config(
+            GUNICORN_WORKERS='2',
+            GUNICORN_THREADS='8',
+            GUNICORN_MAX_REQUESTS='500',
+            GUNICORN_WORKER_CLASS='uvicorn.workers.UvicornWorker',
+        )
+
+        self.assertEqual((config['workers'], config['threads']), (2, 8))
+        self.assertEqual(config['max_requests_jitter'], 50)
+        self.assertEqual(config['wsgi_app'], 'techblog_cms.asgi:application')
+
+    def test_request_hooks_log_per_worker_stats(self):
+        config = load_config(GUNICORN_STATS_INTERVAL='0')
+        worker = SimpleNamespace(pid=1234, log=mock.Mock())
+        config['post_worker_init'](worker)
+
+        for status in ('200 OK', '503 Service Unavailable'):
+            req = SimpleNamespace()
+            config['pre_request'](worker, req)
+            config['post_request'](worker, req, {}, SimpleNamespace(status=status))
+
+        message = worker.log.info.call_args[0][0]
+        self.assertIn("worker 1234: 2 requests", message)
+        self.assertIn("1 5xx", message)
+        self.assertIn("p95", message)
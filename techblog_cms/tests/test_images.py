@@ -0,0 +1,202 @@
+import io
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from techblog_cms.images import optimize_upload
+from techblog_cms.jobs import work
+from techblog_cms.models import Article, Category, Job
+
+
+@override_settings(ARTICLE_IMAGE_WIDTHS=(100, 200, 400))
+class ImageDerivativeTests(TestCase):
+    def setUp(self):
+        self.media_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_dir)
+        media_override = override_settings(MEDIA_ROOT=self.media_dir)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        self.category = Category.objects.create(name="General", description="General articles")
+
+    def _upload(self, format="PNG", size=(300, 150)):
+        buffer = io.BytesIO()
+        Image.new('RGB', size, (0, 128, 255)).save(buffer, format=format)
+        return SimpleUploadedFile(f"cover.{format.lower()}", buffer.getvalue())
+
+    def _create_article(self, **kwargs):
+        article = Article.objects.create(
+            title="With image",
+            content="Body",
+            category=self.category,
+            published=True,
+            **kwargs,
+        )
+        # Derivatives are written by the (eager in tests) background job
+        article.refresh_from_db()
+        return article
+
+    def test_upload_generates_narrower_variants_only(self):
+        article = self._create_article(image=self._upload())
+
+        variants = article.image_variants['variants']
+        self.assertEqual([v['width'] for v in variants], [100, 200])
+        self.assertEqual(variants[0]['height'], 50)
+        for variant in variants:
+            self.assertTrue(variant['webp'].endswith('.webp'))
+            self.assertTrue(variant['fallback'].endswith('.png'))
+            self.assertTrue(default_storage.exists(variant['webp']))
+            self.assertTrue(default_storage.exists(variant['fallback']))
+        with default_storage.open(variants[1]['webp']) as handle, Image.open(handle) as image:
+            self.assertEqual(image.format, 'WEBP')
+            self.assertEqual(image.size, (200, 100))
+
+    def test_replacing_image_deletes_old_variants(self):
+        article = self._create_article(image=self._upload())
+        old_variants = article.image_variants['variants']
+
+        article.image = self._upload(format="JPEG")
+        article.save()
+        article.refresh_from_db()
+
+        new_variants = article.image_variants['variants']
+        self.assertTrue(new_variants[0]['fallback'].endswith('.jpg'))
+        for variant in old_variants:
+            self.assertFalse(default_storage.exists(variant['fallback']))
+        for variant in new_variants:
+            self.assertTrue(default_storage.exists(variant['webp']))
+            self.assertTrue(default_storage.exists(variant['fallback']))
+
+    def test_replacing_image_with_same_base_name_keeps_new_variants(self):
+        article = self._create_article(image=self._upload())
+        old_webp = [v['webp'] for v in article.image_variants['variants']]
+
+        article.image = self._upload(format="JPEG")
+        article.save()
+        article.refresh_from_db()
+
+        # cover.png -> cover.jpg: the WebP derivatives are rewritten under the same names
+        new_webp = [v['webp'] for v in article.image_variants['variants']]
+        self.assertEqual(new_webp, old_webp)
+        for name in new_webp:
+            self.assertTrue(default_storage.exists(name))
+            with default_storage.open(name) as handle, Image.open(handle) as image:
+                self.assertEqual(image.format, 'WEBP')
+
+    @override_settings(JOB_QUEUE_EAGER=False, PAGE_CACHE_ENABLED=True)
+    def test_finished_variants_invalidate_cached_pages(self):
+        cache.clear()
+        article = self._create_article(image=self._upload())
+        url = reverse('article_detail', args=[article.slug])
+        first = self.client.get(url)
+        self.assertNotContains(first, 'srcset')
+
+        work(burst=True)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertContains(response, '-100w.webp 100w')
+
+    def test_detail_page_emits_srcset(self):
+        article = self._create_article(image=self._upload())
+
+        response = self.client.get(reverse('article_detail', args=[article.slug]))
+
+        self.assertContains(response, 'type="image/webp"')
+        self.assertContains(response, '-100w.webp 100w')
+        self.assertContains(response, f'{article.image.url} 300w')
+        self.assertContains(response, 'width="300" height="150"')
+
+    def test_older_uploads_fall_back_to_the_original_until_backfilled(self):
+        article = self._create_article(image=self._upload())
+        Article.objects.filter(pk=article.pk).update(image_variants={})
+        Job.objects.all().delete()
+
+        response = self.client.get(reverse('article_detail', args=[article.slug]))
+
+        # Rendering offers only the original and queues nothing
+        self.assertNotContains(response, 'srcset')
+        self.assertContains(response, article.image.url)
+        self.assertFalse(Job.objects.exists())
+
+        out = io.StringIO()
+        call_command('generate_image_variants', stdout=out)
+
+        self.assertIn("Queued derivatives for 1 of 1 article images", out.getvalue())
+        response = self.client.get(reverse('article_detail', args=[article.slug]))
+        self.assertContains(response, '-200w.webp 200w')
+
+
+class UploadOptimizationTests(TestCase):
+    def _photo(self, format, size=(400, 300), **save_options):
+        buffer = io.BytesIO()
+        Image.merge('RGB', [Image.effect_noise(size, 40) for _ in range(3)]).save(buffer, format=format, **save_options)
+        return SimpleUploadedFile(f"photo.{format.lower()}", buffer.getvalue())
+
+    def test_exif_is_stripped_and_orientation_applied(self):
+        exif = Image.Exif()
+        exif[0x0112] = 6  # rotated 90 degrees clockwise
+        exif[0x010F] = "Camera maker"
+        upload = self._photo('JPEG', exif=exif.tobytes(), quality=95)
+
+        optimized, report = optimize_upload(upload)
+
+        with Image.open(optimized) as image:
+            self.assertNotIn('exif', image.info)
+            self.assertEqual(image.size, (300, 400))
+        self.assertEqual(report['format'], 'JPEG')
+        self.assertEqual(report['bytes'], optimized.size)
+        self.assertEqual(report['saved_bytes'], report['original_bytes'] - report['bytes'])
+
+    def test_png_photo_is_converted_when_smaller(self):
+        upload = self._photo('PNG')
+
+        optimized, report = optimize_upload(upload)
+
+        self.assertIn(report['format'], ('JPEG', 'WEBP'))
+        self.assertFalse(optimized.name.endswith('.png'))
+        self.assertLess(report['bytes'], report['original_bytes'])
+
+    @override_settings(ARTICLE_IMAGE_PHOTO_FORMATS=('JPEG',), ARTICLE_IMAGE_BYTE_BUDGET=20 * 1024)
+    def test_byte_budget_is_enforced(self):
+        upload = self._photo('JPEG', size=(1200, 900), quality=95)
+
+        optimized, report = optimize_upload(upload)
+
+        self.assertLessEqual(report['bytes'], 20 * 1024)
+        self.assertTrue(report['resized'])
+        self.assertFalse(report['over_budget'])
+        with Image.open(optimized) as image:
+            self.assertEqual(image.size, (report['width'], report['height']))
+
+    @override_settings(ARTICLE_IMAGE_BYTE_BUDGET=20 * 1024)
+    def test_lossless_image_over_budget_is_not_resized(self):
+        # Transparency keeps this PNG lossless rather than converting it as a photo
+        buffer = io.BytesIO()
+        Image.merge('RGBA', [Image.effect_noise((400, 300), 40) for _ in range(4)]).save(buffer, 'PNG')
+        upload = SimpleUploadedFile("diagram.png", buffer.getvalue())
+
+        optimized, report = optimize_upload(upload)
+
+        self.assertEqual(report['format'], 'PNG')
+        self.assertEqual((report['width'], report['height']), (400, 300))
+        self.assertFalse(report['resized'])
+        self.assertTrue(report['over_budget'])
+        self.assertGreater(report['bytes'], 20 * 1024)
+
+    def test_small_image_without_metadata_is_kept(self):
+        buffer = io.BytesIO()
+        Image.new('P', (8, 8)).save(buffer, 'GIF')
+        upload = SimpleUploadedFile("dot.gif", buffer.getvalue())
+
+        optimized, report = optimize_upload(upload)
+
+        self.assertIs(optimized, upload)
+        self.assertEqual(report['saved_bytes'], 0)
@@ -0,0 +1,41 @@
+from django.db import connection
+from django.test import TestCase
+
+from techblog_cms.models import Article, Category, Tag
+
+
+class PublicQueryIndexUsageTests(TestCase):
+    """EXPLAIN each public listing query and check it is served by its index"""
+
+    def setUp(self):
+        self.category = Category.objects.create(name="Python", description="Python articles")
+        self.tag = Tag.objects.create(name="Django")
+        for index in range(20):
+            article = Article.objects.create(
+                title=f"Article {index}",
+                content=f"Body {index}",
+                category=self.category,
+                published=index % 3 != 0,
+            )
+            if index % 2:
+                article.tags.add(self.tag)
+        if connection.vendor == 'postgresql':
+            # Tiny test tables would otherwise always be sequentially scanned
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_published_feed_uses_partial_index(self):
+        queryset = Article.objects.published().for_listing()[:10]
+        self.assertUsesIndex(queryset, 'article_published_feed_idx')
+
+    def test_category_feed_uses_composite_index(self):
+        queryset = self.category.article_set.published().for_listing()
+        self.assertUsesIndex(queryset, 'article_category_feed_idx')
+
+    def test_tag_feed_uses_through_table_index(self):
+        queryset = self.tag.article_set.published().for_listing()
+        self.assertUsesIndex(queryset, 'article_tags_tag_article_idx')
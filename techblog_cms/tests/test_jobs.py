@@ -0,0 +1,129 @@
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from techblog_cms import jobs
+from techblog_cms.models import Article, Category, Job
+
+
+@override_settings(JOB_QUEUE_EAGER=False, ARTICLE_IMAGE_WIDTHS=(100,))
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.media_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_dir)
+        media_override = override_settings(MEDIA_ROOT=self.media_dir)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        self.category = Category.objects.create(name="General", description="General articles")
+        self.calls = []
+
+        def flaky(**payload):
+            self.calls.append(payload)
+            raise OSError("storage unavailable")
+
+        jobs.HANDLERS['test.flaky'] = flaky
+        self.addCleanup(jobs.HANDLERS.pop, 'test.flaky')
+
+    def _upload(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (300, 150), (0, 128, 255)).save(buffer, format='PNG')
+        return SimpleUploadedFile("cover.png", buffer.getvalue())
+
+    def test_image_upload_is_processed_by_the_worker(self):
+        article = Article.objects.create(
+            title="With image", content="Body", category=self.category,
+            published=True, image=self._upload(),
+        )
+
+        article.refresh_from_db()
+        self.assertFalse(article.has_current_image_variants())
+        queued = Job.objects.get(name='article.image_variants')
+        self.assertEqual(queued.status, Job.QUEUED)
+
+        self.assertEqual(jobs.work(burst=True), 1)
+
+        article.refresh_from_db()
+        self.assertTrue(article.has_current_image_variants())
+        self.assertEqual(article.image_variants['variants'][0]['width'], 100)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Job.DONE)
+        self.assertEqual(queued.attempts, 1)
+
+    def test_pending_jobs_are_deduplicated(self):
+        first = jobs.enqueue('test.flaky', {'n': 1}, dedupe_key='flaky')
+        second = jobs.enqueue('test.flaky', {'n': 2}, dedupe_key='flaky')
+
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_unknown_job_is_rejected(self):
+        with self.assertRaises(ValueError):
+            jobs.enqueue('test.missing')
+
+    @override_settings(JOB_MAX_ATTEMPTS=2, JOB_RETRY_BACKOFF=30)
+    def test_failures_are_retried_with_backoff_then_marked_failed(self):
+        queued = jobs.enqueue('test.flaky', {'n': 1})
+
+        self.assertEqual(jobs.work(burst=True), 1)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Job.QUEUED)
+        self.assertEqual(queued.attempts, 1)
+        self.assertIn("storage unavailable", queued.last_error)
+        self.assertGreater(queued.run_at, timezone.now() + timedelta(seconds=25))
+
+        # Not due yet
+        self.assertEqual(jobs.work(burst=True), 0)
+
+        Job.objects.filter(pk=queued.pk).update(run_at=timezone.now())
+        self.assertEqual(jobs.work(burst=True), 1)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Job.FAILED)
+        self.assertEqual(queued.attempts, 2)
+        self.assertIsNotNone(queued.finished_at)
+        self.assertEqual(self.calls, [{'n': 1}, {'n': 1}])
+
+    def test_retry_delay_doubles_up_to_the_cap(self):
+        with self.settings(JOB_RETRY_BACKOFF=10, JOB_RETRY_BACKOFF_MAX=60):
+            self.assertEqual([jobs.retry_delay(n) for n in range(1, 6)], [10, 20, 40, 60, 60])
+
+    def test_jobs_with_an_expired_lease_are_reclaimed(self):
+        queued = jobs.enqueue('test.flaky')
+        stale = timezone.now() - timedelta(hours=1)
+        Job.objects.filter(pk=queued.pk).update(status=Job.RUNNING, locked_at=stale, attempts=1)
+
+        claimed = jobs.claim()
+
+        self.assertEqual(claimed.pk, queued.pk)
+        self.assertEqual(claimed.attempts, 2)
+        self.assertIsNone(jobs.claim())
+
+    def test_worker_command_processes_due_jobs(self):
+        call_command('rerender_articles', '--background', stdout=io.StringIO())
+        self.assertEqual(Job.objects.get().name, 'articles.rerender')
+
+        out = io.StringIO()
+        call_command('worker', '--burst', stdout=out)
+
+        self.assertIn("Processed 1 jobs", out.getvalue())
+        self.assertEqual(Job.objects.get().status, Job.DONE)
+
+    def test_dashboard_shows_job_status(self):
+        User.objects.create_user(username="editor", password="pass1234")
+        self.client.login(username="editor", password="pass1234")
+        jobs.enqueue('test.flaky')
+        jobs.work(burst=True)
+
+        response = self.client.get(reverse('dashboard'))
+
+        self.assertEqual(response.context['job_summary']['queued'], 1)
+        self.assertContains(response, 'test.flaky')
+        self.assertContains(response, 'OSError: storage unavailable')
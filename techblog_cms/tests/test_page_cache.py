@@ -0,0 +1,106 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from techblog_cms.models import Article, Category, Tag
+
+
+@override_settings(PAGE_CACHE_ENABLED=True)
+class AnonymousPageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Python", description="Python articles")
+        self.other_category = Category.objects.create(name="Go", description="Go articles")
+        self.tag = Tag.objects.create(name="Django")
+        self.article = Article.objects.create(
+            title="Cached Article",
+            content="Original body",
+            category=self.category,
+            published=True,
+        )
+        self.article.tags.add(self.tag)
+        self.other = Article.objects.create(
+            title="Other Article",
+            content="Other body",
+            category=self.other_category,
+            published=True,
+        )
+
+    def test_second_anonymous_request_is_a_hit(self):
+        first = self.client.get(reverse('home'))
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('home'))
+
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.content, second.content)
+
+    def test_query_string_is_part_of_the_key(self):
+        self.client.get(reverse('article_list'))
+        response = self.client.get(reverse('article_list'), {'page': 2})
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+    def test_authenticated_users_bypass_cache(self):
+        User.objects.create_user(username="editor", password="pass1234")
+        self.client.get(reverse('home'))
+        self.client.login(username="editor", password="pass1234")
+
+        response = self.client.get(reverse('home'))
+
+        self.assertEqual(response['X-Cache'], 'BYPASS')
+
+    def test_editing_article_invalidates_only_affected_pages(self):
+        detail_url = reverse('article_detail', args=[self.article.slug])
+        other_url = reverse('article_detail', args=[self.other.slug])
+        tag_url = reverse('tag', args=[self.tag.slug])
+        for url in (detail_url, other_url, tag_url, reverse('article_list')):
+            self.client.get(url)
+
+        self.article.content = "Edited body"
+        self.article.save()
+
+        response = self.client.get(detail_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertContains(response, "Edited body")
+        self.assertEqual(self.client.get(tag_url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(reverse('article_list'))['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(other_url)['X-Cache'], 'HIT')
+
+    def test_unpublishing_invalidates_every_page(self):
+        other_url = reverse('article_detail', args=[self.other.slug])
+        self.client.get(other_url)
+
+        self.article.published = False
+        self.article.save()
+
+        self.assertEqual(self.client.get(other_url)['X-Cache'], 'MISS')
+
+    def test_renaming_category_invalidates_every_page(self):
+        other_url = reverse('article_detail', args=[self.other.slug])
+        self.client.get(other_url)
+
+        self.category.name = "Python 3"
+        self.category.save()
+
+        response = self.client.get(other_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertContains(response, "Python 3")
+
+    def test_tagging_article_invalidates_tag_page(self):
+        new_tag = Tag.objects.create(name="ORM")
+        tag_url = reverse('tag', args=[new_tag.slug])
+        self.client.get(tag_url)
+
+        self.article.tags.add(new_tag)
+
+        response = self.client.get(tag_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertContains(response, "Cached Article")
+
+    @override_settings(PAGE_CACHE_ENABLED=False)
+    def test_disabled_by_default_setting(self):
+        response = self.client.get(reverse('home'))
+
+        self.assertNotIn('X-Cache', response)
@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from techblog_cms.models import Article, Category, Tag
+from techblog_cms.pagination import decode_cursor, encode_cursor
+
+
+@override_settings(ARTICLE_PAGE_SIZE=3)
+class ArticleListPaginationTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name="General", description="General articles")
+        self.tag = Tag.objects.create(name="Django")
+        now = timezone.now()
+        self.articles = []
+        for index in range(7):
+            article = Article.objects.create(
+                title=f"Article {index}",
+                content=f"Body {index}",
+                category=self.category,
+                published=True,
+            )
+            article.tags.add(self.tag)
+            self.articles.append(article)
+        # Two articles share a timestamp so the id tie-breaker is exercised
+        for index, article in enumerate(self.articles):
+            created_at = now - timedelta(minutes=index if index != 4 else 3)
+            Article.objects.filter(pk=article.pk).update(created_at=created_at)
+        self.ordered = list(Article.objects.published().for_listing())
+
+    def _slugs(self, response):
+        return [article.slug for article in response.context['articles']]
+
+    def test_first_page_is_limited_to_page_size(self):
+        response = self.client.get(reverse('article_list'))
+
+        self.assertEqual(self._slugs(response), [a.slug for a in self.ordered[:3]])
+        self.assertEqual(response.context['pagination'], [1, 2, 3])
+        self.assertContains(response, 'rel="next"')
+
+    def test_page_number_mode(self):
+        response = self.client.get(reverse('article_list'), {'page': 3})
+
+        self.assertEqual(self._slugs(response), [self.ordered[6].slug])
+        self.assertIsNone(response.context['next_url'])
+
+    def test_cursor_mode_walks_every_article_once(self):
+        seen = []
+        response = self.client.get(reverse('article_list'))
+        seen.extend(self._slugs(response))
+        while response.context['next_url']:
+            response = self.client.get(response.context['next_url'])
+            seen.extend(self._slugs(response))
+
+        self.assertEqual(seen, [a.slug for a in self.ordered])
+
+    def test_cursor_mode_skips_count_query(self):
+        cursor = encode_cursor(self.ordered[2])
+        self.client.get(reverse('article_list'), {'after': cursor})
+        # page rows only
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('article_list'), {'after': cursor})
+        self.assertEqual(self._slugs(response), [a.slug for a in self.ordered[3:6]])
+
+    def test_malformed_cursor_falls_back_to_first_page(self):
+        response = self.client.get(reverse('article_list'), {'after': 'not-a-cursor'})
+
+        self.assertEqual(self._slugs(response), [a.slug for a in self.ordered[:3]])
+
+    def test_out_of_range_cursor_falls_back_to_first_page(self):
+        cursor = '2020-13-45T00:00:00,5'
+        self.assertIsNone(decode_cursor(cursor))
+        for url in (reverse('article_list'), reverse('tag', args=[self.tag.slug])):
+            response = self.client.get(url, {'after': cursor})
+            self.assertEqual(self._slugs(response), [a.slug for a in self.ordered[:3]])
+
+        response = self.client.get(reverse('article_api'), {'after': cursor})
+        self.assertEqual(response.status_code, 400)
+
+    def test_tag_page_is_paginated(self):
+        response = self.client.get(reverse('tag', args=[self.tag.slug]))
+
+        self.assertEqual(len(response.context['articles']), 3)
+        self.assertContains(response, "7 件の記事")
+
+    def test_tag_page_keeps_its_count_on_cursor_pages(self):
+        response = self.client.get(reverse('tag', args=[self.tag.slug]))
+        response = self.client.get(response.context['next_url'])
+
+        self.assertIsNone(response.context['page_obj'])
+        self.assertContains(response, "7 件の記事")
@@ -0,0 +1,113 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from django.core.cache import cache
+
+from techblog_cms.models import Article, Category, Tag
+
+
+class PublicPageQueryCountTests(TestCase):
+    """Public pages must run a constant number of queries however many articles they list"""
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Python", description="Python articles")
+        self.tag = Tag.objects.create(name="Django")
+
+    def _create_articles(self, count):
+        for index in range(count):
+            category = Category.objects.create(name=f"Category {index}-{Article.objects.count()}")
+            article = Article.objects.create(
+                title=f"Article {index}",
+                content=f"Body {index}",
+                category=category if index % 2 else self.category,
+                published=True,
+            )
+            article.tags.add(self.tag)
+
+    def _assert_constant_queries(self, url, expected):
+        # Each measured request follows a warm-up request, so the sidebar and
+        # conditional GET validators come from the cache and only page queries count
+        self._create_articles(2)
+        self.client.get(url)
+        with self.assertNumQueries(expected):
+            self.client.get(url)
+        self._create_articles(5)
+        self.client.get(url)
+        with self.assertNumQueries(expected):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_home(self):
+        # articles (sidebar comes from the warm navigation cache)
+        self._assert_constant_queries(reverse('home'), 1)
+
+    def test_article_list(self):
+        # paginator count, page rows
+        self._assert_constant_queries(reverse('article_list'), 2)
+
+    def test_category_detail(self):
+        # category, paginator count, page rows
+        self._assert_constant_queries(reverse('category', args=[self.category.slug]), 3)
+
+    def test_tag_detail(self):
+        self._assert_constant_queries(reverse('tag', args=[self.tag.slug]), 3)
+
+    def test_category_list(self):
+        # one annotated query for the categories and their article counts
+        self._assert_constant_queries(reverse('categories'), 1)
+
+    def test_category_list_counts_only_published_articles_for_readers(self):
+        Article.objects.create(title="Draft", content="Body", category=self.category)
+        Article.objects.create(title="Live", content="Body", category=self.category, published=True)
+
+        response = self.client.get(reverse('categories'))
+
+        counts = {c.slug: c.num_articles for c in response.context['categories']}
+        self.assertEqual(counts[self.category.slug], 1)
+        self.assertContains(response, "1 article\n")
+
+    def test_article_detail(self):
+        article = Article.objects.create(
+            title="Detail", content="Body", category=self.category, published=True
+        )
+        article.tags.add(self.tag, Tag.objects.create(name="ORM"))
+        self.client.get(reverse('article_detail', args=[article.slug]))
+        # article + category join, prefetched tags
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('article_detail', args=[article.slug]))
+        self.assertContains(response, "#ORM")
+
+
+class SidebarNavigationCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Category.objects.create(name="Python")
+        Tag.objects.create(name="Django")
+
+    def test_cold_sidebar_costs_two_queries_then_none(self):
+        # articles, validators, sidebar categories, sidebar tags
+        with self.assertNumQueries(4):
+            self.client.get(reverse('home'))
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('home'))
+        self.assertContains(response, "Python")
+        self.assertContains(response, "Django")
+
+    def test_saving_a_category_or_tag_invalidates_sidebar(self):
+        self.client.get(reverse('home'))
+        Category.objects.create(name="Rust")
+        Tag.objects.create(name="Tokio")
+
+        response = self.client.get(reverse('home'))
+
+        self.assertContains(response, "Rust")
+        self.assertContains(response, "Tokio")
+
+    def test_deleting_a_tag_invalidates_sidebar(self):
+        self.client.get(reverse('home'))
+        Tag.objects.filter(name="Django").get().delete()
+
+        response = self.client.get(reverse('home'))
+
+        self.assertNotContains(response, "Django")
@@ -0,0 +1,126 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from techblog_cms.models import Article, Category
+from techblog_cms.search import ArticleSearch, fts5_match_expression
+
+
+class ArticleSearchTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name="Python", description="Python articles")
+
+    def _article(self, title, content, published=True, **kwargs):
+        return Article.objects.create(
+            title=title,
+            content=content,
+            category=self.category,
+            published=published,
+            **kwargs,
+        )
+
+    def test_title_matches_rank_above_body_matches(self):
+        body = self._article("Weekly notes", "Some thoughts about django and other things")
+        title = self._article("Django tips", "Assorted advice")
+
+        results = ArticleSearch("django")[0:10]
+
+        self.assertEqual([a.pk for a in results], [title.pk, body.pk])
+        self.assertGreater(results[0].search_rank, results[1].search_rank)
+
+    def test_drafts_are_not_found(self):
+        self._article("Draft about django", "Unfinished", published=False)
+
+        self.assertEqual(ArticleSearch("django").count(), 0)
+
+    def test_all_terms_must_match(self):
+        both = self._article("Caching", "django with redis")
+        self._article("Other", "django only")
+
+        self.assertEqual([a.pk for a in ArticleSearch("redis django")[0:10]], [both.pk])
+
+    def test_index_follows_edits_and_deletes(self):
+        article = self._article("Intro", "About flask")
+        self.assertEqual(ArticleSearch("flask").count(), 1)
+
+        article.content = "About django"
+        article.excerpt = ""
+        article.save()
+        self.assertEqual(ArticleSearch("flask").count(), 0)
+        self.assertEqual(ArticleSearch("django").count(), 1)
+
+        article.delete()
+        self.assertEqual(ArticleSearch("django").count(), 0)
+
+    def test_snippet_highlights_matches_and_escapes_html(self):
+        self._article("Markup", "Use <script>alert(1)</script> carefully with django templates")
+
+        snippet = ArticleSearch("django")[0:1][0].search_snippet
+
+        self.assertIn("<mark>django</mark>", snippet)
+        self.assertIn("&lt;script&gt;", snippet)
+        self.assertNotIn("<script>", snippet)
+
+    def test_query_syntax_is_treated_as_text(self):
+        self._article("Operators", "NEAR AND OR title:x")
+
+        self.assertEqual(fts5_match_expression('say "hi" OR'), '"say" """hi""" "OR"')
+        # Would be a column filter / syntax error if passed to MATCH verbatim
+        self.assertEqual(ArticleSearch('title:x OR (').count(), 1)
+        self.assertEqual(ArticleSearch('NEAR OR').count(), 1)
+
+    def test_query_of_only_quotes_finds_nothing(self):
+        self._article("Quotes", "He said \"hi\"")
+
+        self.assertEqual(fts5_match_expression('" ""'), '')
+        self.assertEqual(ArticleSearch('" ""').count(), 0)
+        self.assertEqual(ArticleSearch('"')[0:10], [])
+
+
+@override_settings(ARTICLE_PAGE_SIZE=2)
+class SearchViewTests(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name="Python", description="Python articles")
+        for n in range(5):
+            Article.objects.create(
+                title=f"Django part {n}",
+                content="Body",
+                category=category,
+                published=True,
+            )
+
+    def test_search_page_is_paginated_and_keeps_the_query(self):
+        response = self.client.get(reverse('search'), {'q': 'django', 'page': 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['articles']), 2)
+        self.assertContains(response, "5 results")
+        self.assertContains(response, 'href="?q=django&amp;page=3"')
+        self.assertEqual(response.context['next_url'], '/search/?q=django&page=3')
+        self.assertEqual(response.context['previous_url'], '/search/?q=django&page=1')
+
+    def test_empty_query_renders_the_form_only(self):
+        response = self.client.get(reverse('search'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['articles'], [])
+
+    def test_quote_only_query_returns_no_results(self):
+        response = self.client.get(reverse('search'), {'q': '"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['articles'], [])
+
+        response = self.client.get(reverse('search_api'), {'q': '"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 0)
+
+    def test_json_api(self):
+        response = self.client.get(reverse('search_api'), {'q': 'django'})
+
+        data = response.json()
+        self.assertEqual(data['count'], 5)
+        self.assertEqual(data['num_pages'], 3)
+        self.assertEqual(data['next'], '/api/search/?q=django&page=2')
+        self.assertEqual(len(data['results']), 2)
+        result = data['results'][0]
+        self.assertEqual(result['url'], reverse('article_detail', args=[result['slug']]))
+        self.assertIn('<mark>Django</mark>', result['snippet'])
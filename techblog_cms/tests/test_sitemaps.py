@@ -0,0 +1,149 @@
+from datetime import timedelta
+from xml.etree import ElementTree
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from techblog_cms.models import Article, Category, Tag
+from techblog_cms.sitemaps import article_chunk, article_chunk_boundaries, sitemap_paths, term_chunk
+
+NS = {'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
+
+
+def locations(response):
+    root = ElementTree.fromstring(response.content)
+    return [loc.text for loc in root.iterfind('.//sm:loc', NS)]
+
+
+@override_settings(SITEMAP_LIMIT=2)
+class SitemapTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Python", description="Python articles")
+        Category.objects.create(name="Empty")
+        self.tag = Tag.objects.create(name="Django")
+        now = timezone.now()
+        self.articles = []
+        for n in range(5):
+            article = Article.objects.create(
+                title=f"Article {n}",
+                content="Body",
+                category=self.category,
+                published=True,
+            )
+            Article.objects.filter(pk=article.pk).update(created_at=now - timedelta(days=5 - n))
+            article.refresh_from_db()
+            self.articles.append(article)
+        self.articles[0].tags.add(self.tag)
+        Article.objects.create(title="Draft", content="x", category=self.category, published=False)
+
+    def test_index_lists_every_chunk(self):
+        response = self.client.get(reverse('sitemap_index'))
+
+        self.assertEqual(response['Content-Type'], 'application/xml')
+        self.assertEqual(locations(response), [
+            f"http://testserver{reverse('sitemap_section', args=['articles', page])}"
+            for page in (1, 2, 3)
+        ] + [
+            f"http://testserver{reverse('sitemap_section', args=['categories', 1])}",
+            f"http://testserver{reverse('sitemap_section', args=['tags', 1])}",
+        ])
+        self.assertContains(response, '<lastmod>')
+
+    def test_articles_are_chunked_oldest_first(self):
+        pages = [
+            locations(self.client.get(reverse('sitemap_section', args=['articles', page])))
+            for page in (1, 2, 3)
+        ]
+
+        expected = [f"http://testserver{a.get_absolute_url()}" for a in self.articles]
+        self.assertEqual(pages, [expected[0:2], expected[2:4], expected[4:5]])
+        self.assertEqual(self.client.get(reverse('sitemap_section', args=['articles', 4])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('sitemap_section', args=['drafts', 1])).status_code, 404)
+
+    def test_lastmod_comes_from_updated_at(self):
+        article = self.articles[0]
+        response = self.client.get(reverse('sitemap_section', args=['articles', 1]))
+
+        self.assertContains(response, f"<lastmod>{article.updated_at:%Y-%m-%d}</lastmod>")
+
+    def test_taxonomy_sections_skip_empty_terms(self):
+        categories = locations(self.client.get(reverse('sitemap_section', args=['categories', 1])))
+        tags = locations(self.client.get(reverse('sitemap_section', args=['tags', 1])))
+
+        self.assertEqual(categories, [f"http://testserver{self.category.get_absolute_url()}"])
+        self.assertEqual(tags, [f"http://testserver{self.tag.get_absolute_url()}"])
+
+    @override_settings(PAGE_CACHE_ENABLED=True)
+    def test_editing_an_article_only_invalidates_its_chunk(self):
+        chunks = [reverse('sitemap_section', args=['articles', page]) for page in (1, 2, 3)]
+        index = reverse('sitemap_index')
+        for url in [index, *chunks]:
+            self.client.get(url)
+
+        article = self.articles[2]
+        article.slug = "renamed-article"
+        article.save()
+
+        self.assertEqual(self.client.get(chunks[0])['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get(chunks[2])['X-Cache'], 'HIT')
+        response = self.client.get(chunks[1])
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertContains(response, "renamed-article")
+        self.assertEqual(self.client.get(index)['X-Cache'], 'MISS')
+
+    @override_settings(PAGE_CACHE_ENABLED=True)
+    def test_editing_an_article_invalidates_its_terms_chunks(self):
+        categories = reverse('sitemap_section', args=['categories', 1])
+        tags = reverse('sitemap_section', args=['tags', 1])
+        for url in (categories, tags):
+            self.client.get(url)
+
+        self.articles[2].save()
+        self.assertEqual(self.client.get(categories)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(tags)['X-Cache'], 'HIT')
+
+        self.articles[0].save()
+        self.assertEqual(self.client.get(tags)['X-Cache'], 'MISS')
+
+    def test_articles_are_located_from_cached_chunk_boundaries(self):
+        self.assertEqual([article_chunk(article) for article in self.articles], [1, 1, 2, 2, 3])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(article_chunk(self.articles[4]), 3)
+
+        # Publishing replaces the site generation, and with it the boundaries
+        newest = Article.objects.create(title="Newest", content="x", category=self.category, published=True)
+        self.assertEqual(article_chunk(newest), 3)
+        self.assertEqual(len(article_chunk_boundaries()), 2)
+        Article.objects.create(title="Newer", content="x", category=self.category, published=True)
+        self.assertEqual(len(article_chunk_boundaries()), 3)
+
+    def test_invalidation_does_not_count_sections(self):
+        article = self.articles[0]
+        article_chunk(article)
+        with self.assertNumQueries(0):
+            paths = sitemap_paths(article, categories=[Category(pk=1)], tags=[Tag(pk=2)])
+        self.assertIn(reverse('sitemap_section', args=['categories', 1]), paths)
+        self.assertIn(reverse('sitemap_section', args=['tags', 1]), paths)
+
+    def test_term_chunk_beyond_the_first_page(self):
+        for pk in (998, 999):
+            category = Category.objects.create(pk=pk, name=f"Category {pk}")
+            Article.objects.create(title=f"In {pk}", content="x", category=category, published=True)
+
+        self.assertEqual(term_chunk('categories', category), 2)
+        response = self.client.get(reverse('sitemap_section', args=['categories', 2]))
+        self.assertContains(response, category.get_absolute_url())
+
+    def test_conditional_get(self):
+        url = reverse('sitemap_section', args=['articles', 1])
+        etag = self.client.get(url)['ETag']
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.articles[0].title = "Edited"
+        self.articles[0].save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
@@ -0,0 +1,132 @@
+import json
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from techblog_cms.models import Article, Category, Tag
+
+
+class StaticExportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.output = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.output, ignore_errors=True)
+        self.category = Category.objects.create(name="Python", description="Python articles")
+        self.tag = Tag.objects.create(name="Django")
+        self.first = Article.objects.create(
+            title="First", content="First body", category=self.category, published=True
+        )
+        self.first.tags.add(self.tag)
+        self.second = Article.objects.create(
+            title="Second", content="Second body", category=self.category, published=True
+        )
+        self.draft = Article.objects.create(
+            title="Draft", content="Draft body", category=self.category, published=False
+        )
+
+    def export(self, *args):
+        out = StringIO()
+        call_command('export_static_site', '--output', str(self.output), '--jobs', '1', '-v', '2', *args, stdout=out)
+        return out.getvalue()
+
+    def page(self, path):
+        return self.output.joinpath(*[part for part in path.split('/') if part], 'index.html')
+
+    def test_exports_every_public_page(self):
+        self.export()
+
+        for path in ('/', '/articles/', '/categories/', '/tags/', self.category.get_absolute_url(),
+                     self.tag.get_absolute_url(), self.first.get_absolute_url(), self.second.get_absolute_url()):
+            self.assertTrue(self.page(path).exists(), path)
+        self.assertFalse(self.page(self.draft.get_absolute_url()).exists())
+        self.assertIn("First body", self.page(self.first.get_absolute_url()).read_text())
+
+    def test_second_run_renders_nothing(self):
+        self.export()
+        with mock.patch('techblog_cms.views.render') as render:
+            output = self.export()
+
+        render.assert_not_called()
+        self.assertIn("8 unchanged", output)
+
+    def test_edit_rerenders_only_affected_pages(self):
+        self.export()
+        self.second.content = "Edited body"
+        self.second.save()
+
+        output = self.export()
+
+        written = {line.split(': ', 1)[1] for line in output.splitlines() if line.startswith('written: ')}
+        self.assertIn(self.second.get_absolute_url(), written)
+        self.assertIn('/articles/', written)
+        self.assertIn(self.category.get_absolute_url(), written)
+        self.assertNotIn(self.first.get_absolute_url(), written)
+        self.assertIn("Edited body", self.page(self.second.get_absolute_url()).read_text())
+
+    def test_unpublished_articles_are_removed(self):
+        self.export()
+        self.second.published = False
+        self.second.save()
+
+        output = self.export()
+
+        self.assertFalse(self.page(self.second.get_absolute_url()).exists())
+        self.assertFalse(self.page(self.second.get_absolute_url()).parent.exists())
+        self.assertIn("1 removed", output)
+        manifest = json.loads((self.output / '.export-manifest.json').read_text())
+        self.assertNotIn(self.second.get_absolute_url(), manifest['pages'])
+
+    def test_failed_pages_keep_their_previous_copy(self):
+        self.export()
+        path = self.first.get_absolute_url()
+        manifest_before = json.loads((self.output / '.export-manifest.json').read_text())
+
+        with mock.patch('techblog_cms.views.render', side_effect=RuntimeError("template error")):
+            with self.assertRaisesMessage(CommandError, "8 pages failed to render"):
+                self.export('--full')
+
+        self.assertIn("First body", self.page(path).read_text())
+        manifest = json.loads((self.output / '.export-manifest.json').read_text())
+        self.assertEqual(manifest['pages'], manifest_before['pages'])
+
+    def test_missing_static_manifest_aborts_before_rendering(self):
+        static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static_root, ignore_errors=True)
+
+        with override_settings(STATIC_PIPELINE_ENABLED=True, STATIC_ROOT=static_root):
+            with self.assertRaisesMessage(CommandError, "run collectstatic first"):
+                self.export()
+
+        self.assertFalse(self.page('/').exists())
+
+    def test_template_changes_force_a_full_export(self):
+        self.export()
+        with mock.patch(
+            'techblog_cms.management.commands.export_static_site.build_fingerprint',
+            return_value='changed',
+        ):
+            output = self.export()
+
+        self.assertIn("8 written", output)
+
+    def test_content_changes_queue_an_export_when_enabled(self):
+        with override_settings(STATIC_EXPORT_ENABLED=True, STATIC_EXPORT_ROOT=str(self.output), STATIC_EXPORT_JOBS=1):
+            self.first.title = "Renamed"
+            self.first.save()
+
+        self.assertIn("Renamed", self.page(self.first.get_absolute_url()).read_text())
+
+    def test_rerendered_articles_queue_an_export_when_enabled(self):
+        self.export()
+
+        with override_settings(STATIC_EXPORT_ENABLED=True, STATIC_EXPORT_ROOT=str(self.output), STATIC_EXPORT_JOBS=1):
+            with mock.patch('techblog_cms.models.render_markdown', return_value="<p>New renderer</p>"):
+                call_command('rerender_articles', '--force', stdout=StringIO())
+
+        self.assertIn("New renderer", self.page(self.first.get_absolute_url()).read_text())
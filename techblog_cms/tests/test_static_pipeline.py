@@ -0,0 +1,50 @@
+import gzip
+import os
+import re
+import shutil
+import tempfile
+
+import brotli
+from django.core.management import call_command
+from django.templatetags.static import static
+from django.test import TestCase, override_settings
+
+PIPELINE_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+}
+
+
+class StaticPipelineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.static_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.static_root)
+        pipeline = override_settings(STATIC_ROOT=cls.static_root, STORAGES=PIPELINE_STORAGES)
+        pipeline.enable()
+        cls.addClassCleanup(pipeline.disable)
+        super().setUpClass()
+        # Collecting (and compressing) the admin assets is slow; do it once
+        call_command('collectstatic', '--noinput', verbosity=0)
+
+    def test_templates_reference_hashed_names(self):
+        url = static('css/style.css')
+
+        self.assertRegex(url, r'/static/css/style\.[0-9a-f]{12}\.css$')
+        self.assertTrue(os.path.exists(os.path.join(self.static_root, url[len('/static/'):])))
+
+    def test_compressed_siblings_match_the_hashed_file(self):
+        hashed = os.path.join(self.static_root, static('js/main.js')[len('/static/'):])
+        with open(hashed, 'rb') as handle:
+            original = handle.read()
+
+        with gzip.open(hashed + '.gz') as handle:
+            self.assertEqual(handle.read(), original)
+        with open(hashed + '.br', 'rb') as handle:
+            self.assertEqual(brotli.decompress(handle.read()), original)
+
+    def test_pages_link_hashed_assets(self):
+        response = self.client.get('/')
+
+        self.assertRegex(response.content.decode(), r'css/style\.[0-9a-f]{12}\.css')
+        self.assertNotRegex(response.content.decode(), re.escape('css/style.css"'))
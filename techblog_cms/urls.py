@@ -3,17 +3,29 @@ from django.urls import path, re_path
 from django.views.generic import TemplateView
 from django.conf import settings
 from django.conf.urls.static import static
-from . import views
+from . import async_views, feeds, sitemaps, views
 from .health import HealthCheckView, ReadinessCheckView
 
+# Public read views: async variants when served over ASGI (see asgi.py)
+read_views = async_views if getattr(settings, 'ASYNC_READ_VIEWS', False) else views
+
 urlpatterns = [
-    path('', views.home_view, name='home'),
-    path('articles/', views.article_list_view, name='article_list'),
-    re_path(r'^articles/(?P<slug>[\w\-]+)/$', views.article_detail_view, name='article_detail'),
-    path('categories/', views.categories_view, name='categories'),
-    path('categories/<slug:slug>/', views.category_view, name='category'),
-    path('tags/', views.tags_view, name='tags'),
-    path('tags/<slug:slug>/', views.tag_view, name='tag'),
+    path('', read_views.home_view, name='home'),
+    path('articles/', read_views.article_list_view, name='article_list'),
+    re_path(r'^articles/(?P<slug>[\w\-]+)/$', read_views.article_detail_view, name='article_detail'),
+    path('categories/', read_views.categories_view, name='categories'),
+    path('categories/<slug:slug>/', read_views.category_view, name='category'),
+    path('tags/', read_views.tags_view, name='tags'),
+    path('tags/<slug:slug>/', read_views.tag_view, name='tag'),
+    path('search/', views.search_view, name='search'),
+    path('sitemap.xml', sitemaps.sitemap_index, name='sitemap_index'),
+    path('sitemap-<slug:section>-<int:page>.xml', sitemaps.sitemap_section, name='sitemap_section'),
+    path('feed/', feeds.site_rss, name='feed_rss'),
+    path('feed/atom/', feeds.site_atom, name='feed_atom'),
+    path('categories/<slug:slug>/feed/', feeds.category_rss, name='category_feed_rss'),
+    path('categories/<slug:slug>/feed/atom/', feeds.category_atom, name='category_feed_atom'),
+    path('tags/<slug:slug>/feed/', feeds.tag_rss, name='tag_feed_rss'),
+    path('tags/<slug:slug>/feed/atom/', feeds.tag_atom, name='tag_feed_atom'),
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
     path('dashboard/', views.dashboard_view, name='dashboard'),
@@ -23,6 +35,9 @@ urlpatterns = [
     path('dashboard/articles/delete/success/', views.article_delete_success_view, name='article_delete_success'),
     path('api/health/', views.health_check, name='health_check'),
     path('api/preview_markdown/', views.preview_markdown_view, name='preview_markdown'),
+    path('api/articles/', views.article_api_view, name='article_api'),
+    path('api/search/', views.search_api_view, name='search_api'),
+    path('api/search/suggest/', views.search_suggest_view, name='search_suggest'),
     path('admin/', views.admin_guard, name='admin_guard'),
     # Health check endpoints (for container orchestration)
     path('health/', HealthCheckView.as_view(), name='health'),
@@ -1,127 +1,251 @@
+import logging
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.http import JsonResponse, HttpResponseForbidden
 from django.contrib.auth import authenticate, login, logout
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.cache import cache_control
 from django.core.paginator import Paginator
+from django.urls import reverse
+from urllib.parse import urlencode
+from django.template.defaultfilters import filesizeformat
+from django.utils.cache import patch_cache_control
 from PIL import Image, UnidentifiedImageError
-from .models import Article, Category, Tag
-from techblog_cms.templatetags.markdown_filter import markdown_to_html
+from .models import Article, Category, Job, Tag
+from .conditional import (
+    article_validators,
+    category_listing_validators,
+    conditional_page,
+    published_listing_validators,
+    tag_listing_validators,
+    taxonomy_validators,
+)
+from .api import MAX_LIMIT, article_queryset, parse_fields, serialize_article
+from .autocomplete import suggest
+from .jobs import status_summary
+from .page_cache import anonymous_page_cache
+from .pagination import after_cursor, decode_cursor, encode_cursor, paginate_articles, paginate_search
+from .search import ArticleSearch, normalize_query
+from techblog_cms.markdown_renderer import render_markdown
 from django.conf import settings
 from django.http import HttpResponseNotFound
 
+logger = logging.getLogger(__name__)
+
 def health_check(request):
     return JsonResponse({"status": "ok"})
 
 def index(request):
     return render(request, 'index.html')
 
+@conditional_page(published_listing_validators)
+@anonymous_page_cache
 def home_view(request):
-    articles = Article.objects.filter(published=True).order_by('-created_at')[:10]
-    categories = Category.objects.all()
-    tags = Tag.objects.all()
+    articles = Article.objects.published().for_listing()[:10]
     return render(
         request,
         'home.html',
         {
             'articles': articles,
-            'categories': categories,
-            'tags': tags,
         },
     )
 
+@conditional_page(published_listing_validators)
+@anonymous_page_cache
 def article_list_view(request):
-    articles = Article.objects.filter(published=True).order_by('-created_at')
-    categories = Category.objects.all()
-    tags = Tag.objects.all()
+    articles = Article.objects.published().for_listing()
+    context = paginate_articles(request, articles)
+    # articles.js continues from the last article shown through the JSON API
+    if context['next_url']:
+        context['api_next_url'] = _article_api_url(after=encode_cursor(context['articles'][-1]))
     return render(
         request,
         'article_list.html',
-        {
-            'articles': articles,
-            'categories': categories,
-            'tags': tags,
-        },
+        context,
     )
 
+
+def _article_api_url(**params):
+    params = {name: value for name, value in params.items() if value}
+    url = reverse('article_api')
+    return f"{url}?{urlencode(params)}" if params else url
+
+
+@cache_control(public=True, max_age=getattr(settings, 'ARTICLE_API_MAX_AGE', 60))
+@conditional_page(published_listing_validators)
+@anonymous_page_cache
+def article_api_view(request):
+    """
+    Published articles as JSON, newest first, for incremental loading.
+
+    ?after=<cursor> continues from a previous page's ``next``, ?limit= sets
+    the page size (up to MAX_LIMIT) and ?fields= a comma-separated subset of
+    api.ARTICLE_FIELDS.
+    """
+    try:
+        fields = parse_fields(request.GET.get('fields'))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    try:
+        limit = min(max(int(request.GET.get('limit', '')), 1), MAX_LIMIT)
+    except ValueError:
+        limit = getattr(settings, 'ARTICLE_PAGE_SIZE', 10)
+
+    articles = article_queryset(fields)
+    after = request.GET.get('after')
+    if after:
+        cursor = decode_cursor(after)
+        if cursor is None:
+            return JsonResponse({'error': "Invalid cursor"}, status=400)
+        articles = after_cursor(articles, cursor)
+
+    rows = list(articles[:limit + 1])
+    next_url = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_url = _article_api_url(
+            after=encode_cursor(rows[-1]),
+            limit=request.GET.get('limit'),
+            fields=request.GET.get('fields'),
+        )
+    return JsonResponse({
+        'results': [serialize_article(article, fields) for article in rows],
+        'next': next_url,
+    })
+
+@conditional_page(taxonomy_validators)
+@anonymous_page_cache
 def categories_view(request):
-    categories = Category.objects.all()
-    tags = Tag.objects.all()
+    # ログインしている場合は下書き記事も件数に含める
+    categories = Category.objects.with_article_counts(
+        published_only=not request.user.is_authenticated
+    ).order_by('name')
     return render(
         request,
         'category_list.html',
         {
             'categories': categories,
-            'tags': tags,
         },
     )
 
+@conditional_page(category_listing_validators)
+@anonymous_page_cache
 def category_view(request, slug):
     category = get_object_or_404(Category, slug=slug)
-    articles = category.article_set.filter(published=True).order_by('-created_at')
-    categories = Category.objects.all()
-    tags = Tag.objects.all()
+    articles = category.article_set.published().for_listing()
     return render(
         request,
         'category_detail.html',
         {
             'category': category,
-            'articles': articles,
-            'categories': categories,
-            'tags': tags,
+            **paginate_articles(request, articles),
         },
     )
 
+@conditional_page(taxonomy_validators)
+@anonymous_page_cache
 def tags_view(request):
     tags = Tag.objects.all()
-    categories = Category.objects.all()
     return render(
         request,
         'tag_list.html',
         {
             'tags': tags,
-            'categories': categories,
         },
     )
 
+@conditional_page(tag_listing_validators)
+@anonymous_page_cache
 def tag_view(request, slug):
     tag = get_object_or_404(Tag, slug=slug)
     if request.user.is_authenticated:
-        articles = tag.article_set.order_by('-created_at')
+        articles = tag.article_set.for_listing()
     else:
-        articles = tag.article_set.filter(published=True).order_by('-created_at')
+        articles = tag.article_set.published().for_listing()
 
-    categories = Category.objects.all()
-    tags = Tag.objects.all()
     return render(
         request,
         'tag_detail.html',
         {
             'tag': tag,
-            'articles': articles,
-            'categories': categories,
-            'tags': tags,
+            **paginate_articles(request, articles, with_count=True),
         },
     )
 
+@conditional_page(article_validators)
+@anonymous_page_cache
 def article_detail_view(request, slug):
     # ログインしている場合は下書き記事も表示可能
+    articles = Article.objects.select_related('category').prefetch_related('tags')
     if request.user.is_authenticated:
-        article = get_object_or_404(Article, slug=slug)
+        article = get_object_or_404(articles, slug=slug)
     else:
-        article = get_object_or_404(Article, slug=slug, published=True)
-    categories = Category.objects.all()
-    tags = Tag.objects.all()
+        article = get_object_or_404(articles, slug=slug, published=True)
     return render(
         request,
         'article_detail.html',
         {
             'article': article,
-            'categories': categories,
-            'tags': tags,
         },
     )
+
+
+@anonymous_page_cache
+def search_view(request):
+    query = normalize_query(request.GET.get('q'))
+    return render(
+        request,
+        'search.html',
+        {
+            'query': query,
+            **paginate_search(request, ArticleSearch(query)),
+        },
+    )
+
+
+@anonymous_page_cache
+def search_api_view(request):
+    """Ranked search results as JSON; snippets are HTML with matches in <mark>"""
+    query = normalize_query(request.GET.get('q'))
+    context = paginate_search(request, ArticleSearch(query))
+    page_obj = context['page_obj']
+    return JsonResponse({
+        'query': query,
+        'count': page_obj.paginator.count,
+        'page': page_obj.number,
+        'num_pages': page_obj.paginator.num_pages,
+        'next': context['next_url'],
+        'previous': context['previous_url'],
+        'results': [
+            {
+                'title': article.title,
+                'slug': article.slug,
+                'url': article.get_absolute_url(),
+                'category': article.category.name,
+                'created_at': article.created_at.isoformat(),
+                'rank': article.search_rank,
+                'snippet': article.search_snippet,
+            }
+            for article in context['articles']
+        ],
+    })
+
+
+def search_suggest_view(request):
+    """Search-as-you-type suggestions (titles, categories, tags) for the header search box"""
+    try:
+        limit = int(request.GET.get('limit', ''))
+    except ValueError:
+        limit = None
+    response = JsonResponse({'suggestions': suggest(request.GET.get('q', ''), limit)})
+    # Only published data is listed, so browsers and proxies may share it
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'AUTOCOMPLETE_CACHE_TIMEOUT', 60))
+    return response
+
+
 def admin_guard(request):
     """Direct /admin/ access guard. Show 404 if HIDE_ADMIN_URL is True."""
     if getattr(settings, 'HIDE_ADMIN_URL', False):
@@ -131,10 +255,20 @@ def admin_guard(request):
 # Create your views here.
 
 
+def _rewind(uploaded_file):
+    try:
+        uploaded_file.seek(0)
+    except (AttributeError, OSError):
+        pass
+
+
 def validate_article_image(uploaded_file):
     """
     Validate uploaded article image and rewind the file ready for storage.
 
+    The file is opened once: Pillow parses only the header on open, so format
+    and dimensions are checked before verify() reads the rest of the data.
+
     Returns:
         tuple(UploadedFile|None, str|None): (clean_file, error_message)
     """
@@ -146,64 +280,30 @@ def validate_article_image(uploaded_file):
     max_pixels = getattr(settings, 'ARTICLE_IMAGE_MAX_PIXELS', None)
 
     if max_bytes and uploaded_file.size and uploaded_file.size > max_bytes:
-        try:
-            uploaded_file.seek(0)
-        except (AttributeError, OSError):
-            pass
         return None, f"Image exceeds the maximum allowed size of {max_bytes} bytes."
 
-    try:
-        uploaded_file.seek(0)
-    except (AttributeError, OSError):
-        pass
-
+    _rewind(uploaded_file)
     try:
-        with Image.open(uploaded_file) as image:
-            image.verify()
-
-        uploaded_file.seek(0)
         with Image.open(uploaded_file) as image:
             detected_format = (image.format or '').upper()
             width, height = image.size
+
+            if max_pixels and width * height > max_pixels:
+                return None, f"Image exceeds the maximum allowed pixel count of {max_pixels}."
+
+            if allowed_formats and detected_format not in allowed_formats:
+                allowed_display = ", ".join(allowed_formats)
+                return None, f"Unsupported image format. Allowed formats: {allowed_display}."
+
+            image.verify()
     except Image.DecompressionBombError:
-        try:
-            uploaded_file.seek(0)
-        except (AttributeError, OSError):
-            pass
         return None, "Image exceeds the maximum allowed pixel count."
     except UnidentifiedImageError:
-        try:
-            uploaded_file.seek(0)
-        except (AttributeError, OSError):
-            pass
         return None, "Uploaded file is not a valid image."
     except OSError:
-        try:
-            uploaded_file.seek(0)
-        except (AttributeError, OSError):
-            pass
         return None, "Uploaded file could not be processed as an image."
-
-    total_pixels = width * height
-    if max_pixels and total_pixels > max_pixels:
-        try:
-            uploaded_file.seek(0)
-        except (AttributeError, OSError):
-            pass
-        return None, f"Image exceeds the maximum allowed pixel count of {max_pixels}."
-
-    if allowed_formats and detected_format not in allowed_formats:
-        try:
-            uploaded_file.seek(0)
-        except (AttributeError, OSError):
-            pass
-        allowed_display = ", ".join(allowed_formats)
-        return None, f"Unsupported image format. Allowed formats: {allowed_display}."
-
-    try:
-        uploaded_file.seek(0)
-    except (AttributeError, OSError):
-        pass
+    finally:
+        _rewind(uploaded_file)
 
     return uploaded_file, None
 
@@ -263,6 +363,9 @@ def dashboard_view(request):
         'has_previous': page_obj.has_previous(),
         'next_page': page_obj.next_page_number() if page_obj.has_next() else None,
         'previous_page': page_obj.previous_page_number() if page_obj.has_previous() else None,
+        # バックグラウンドジョブ（画像処理・再レンダリング）の状況
+        'job_summary': status_summary(),
+        'recent_jobs': Job.objects.order_by('-created_at', '-id')[:10],
     }
     
     return render(request, 'dashboard.html', context)
@@ -323,6 +426,8 @@ def article_editor_view(request, slug=None):
             return render_editor(title, content, error="タイトルと本文は必須です。")
 
         published = action == 'publish'
+        # Re-encoding runs in the article.optimize_image job, not in this request
+        image_optimization = {'pending': True} if getattr(settings, 'ARTICLE_IMAGE_OPTIMIZE', True) else {}
 
         if article:
             article.title = title
@@ -331,6 +436,7 @@ def article_editor_view(request, slug=None):
                 article.published = True
             if cleaned_image:
                 article.image = cleaned_image
+                article.image_optimization = image_optimization
             article.save()
         else:
             category, _ = Category.objects.get_or_create(
@@ -345,8 +451,30 @@ def article_editor_view(request, slug=None):
             )
             if cleaned_image:
                 article.image = cleaned_image
+                article.image_optimization = image_optimization
             article.save()
 
+        if cleaned_image and image_optimization:
+            # The job has already run when the queue is eager
+            article.refresh_from_db(fields=['image_optimization'])
+            report = article.image_optimization
+            if report.get('pending'):
+                messages.info(request, "画像を最適化しています。結果はダッシュボードに表示されます。")
+            elif 'bytes' in report:
+                messages.success(
+                    request,
+                    f"画像を最適化しました: {filesizeformat(report['original_bytes'])} → "
+                    f"{filesizeformat(report['bytes'])}"
+                    f"（{filesizeformat(max(0, report['saved_bytes']))} 削減）"
+                    + (f"。{report['width']}×{report['height']} に縮小しました" if report['resized'] else ""),
+                )
+                if report['over_budget']:
+                    messages.warning(
+                        request,
+                        f"画像が {filesizeformat(report['bytes'])} のままで、上限 "
+                        f"{filesizeformat(settings.ARTICLE_IMAGE_BYTE_BUDGET)} を超えています。"
+                        "PNG/GIF やアニメーション画像は劣化を避けるため縮小しません。",
+                    )
         return redirect('dashboard')
 
     title_value = getattr(article, 'title', '')
@@ -365,5 +493,5 @@ def preview_markdown_view(request):
     - Returns JSON: { html: "<rendered>" }
     """
     text = request.POST.get('text', '') or ''
-    html = markdown_to_html(text)
-    return JsonResponse({"html": str(html)})
+    html = render_markdown(text)
+    return JsonResponse({"html": html})